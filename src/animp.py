@@ -0,0 +1,186 @@
+# Python 2/3 with NumPy and Matplotlib, outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Animating script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+from multiprocessing import Pool, cpu_count
+import numpy as np
+import subprocess
+import shutil
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import BoundaryNorm
+
+from archp import compactOpen
+from rendp import sectionPolygons, cutPosition, contourIntervals, viewWidth, viewHeight, viewOffset
+
+###################################################################################################
+###################################################################################################
+#Directory
+sourceDirN = ".\\compact\\" # directory of the compact files written by odbp.py with frameEvery > 0
+
+#Animation control
+animationFormat = 'gif' # 'gif' - GIF | 'mp4' - MP4, encoded by ffmpeg
+framesPerSecond = 10 # frame rate of the animation
+keepFrames = 0 # 1 - keep the rendered frames as <compact name>_frames\NNNN.png | 0 - delete them once encoded
+numberOfProcesses = 0 # 0 - all cores
+ffmpegPath = "ffmpeg" # encoder of MP4 files, and of GIF files when found, otherwise Pillow
+imageSize = [12.0, 4.0] # image width and height in inches, contour on the left and curve on the right
+imageDpi = 100 # image resolution
+
+###################################################################################################
+###################################################################################################
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def contourLevels(fileName):
+
+    "Contour levels shared by all frames of a compact file, streaming one frame at a time."
+
+    d_header, d_arrays = compactOpen(fileName)
+
+    low, high = np.inf, -np.inf
+    for d_frame in d_header['frames']:
+        alive = d_arrays[d_frame['key']+'/status'] > 0.0
+        if alive.any():
+            mises = d_arrays[d_frame['key']+'/mises'][alive]
+            low, high = min(low, float(mises.min())), max(high, float(mises.max()))
+
+    if not np.isfinite(low):
+        low, high = 0.0, 1.0
+
+    return np.linspace(low, max(high, low+1.0e-6), contourIntervals+1)
+
+def frameRender(args):
+
+    "Render a frame of a compact file, the Mises contour of the view cut beside the load versus deformation curve up to the frame."
+
+    fileName, k, levels, imageName = args
+
+    d_header, d_arrays = compactOpen(fileName)
+    d_frame = d_header['frames'][k]
+
+    #Deformed mesh of the frame, eroded elements are not displayed
+    coordinates = d_arrays['coordinates']+d_arrays[d_frame['key']+'/U']
+    alive = d_arrays[d_frame['key']+'/status'] > 0.0
+    polygons, values = sectionPolygons(coordinates, np.asarray(d_arrays['connectivity'])[alive], np.asarray(d_arrays[d_frame['key']+'/mises'])[alive], cutPosition)
+
+    fig = plt.figure(figsize=imageSize, dpi=imageDpi)
+
+    ax = fig.add_axes([0.01, 0.05, 0.5, 0.9])
+    if len(polygons) > 0:
+        collection = PolyCollection(polygons, cmap=plt.get_cmap('jet', contourIntervals), norm=BoundaryNorm(levels, contourIntervals), edgecolors='face', linewidths=0.1)
+        collection.set_array(values)
+        ax.add_collection(collection)
+
+        colorbar = fig.colorbar(collection, ax=ax, fraction=0.05, pad=0.02, ticks=levels, format='%+.3e')
+        colorbar.ax.set_title('S, Mises', fontsize=8, family='serif')
+        colorbar.ax.tick_params(labelsize=7)
+
+    ax.set_xlim(viewOffset[0]-viewWidth/2.0, viewOffset[0]+viewWidth/2.0)
+    ax.set_ylim(viewOffset[1]-viewHeight/2.0, viewOffset[1]+viewHeight/2.0)
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+    #Curve of all frames, traced up to this one, against the time for compact files without deformations
+    ax = fig.add_axes([0.64, 0.15, 0.33, 0.75])
+    xKey = 'deformation' if 'deformation' in d_frame else 'time'
+    x = np.array([d[xKey] for d in d_header['frames']])
+    y = np.array([d['load'] for d in d_header['frames']])/1000.0
+
+    ax.plot(x, y, color='0.8', linewidth=1.0)
+    ax.plot(x[:k+1], y[:k+1], color='b', linewidth=1.5)
+    ax.plot(x[k], y[k], 'ro', markersize=5)
+    ax.set_xlim(0.0, max(x.max(), 1.0e-6)*1.05)
+    ax.set_ylim(0.0, max(y.max(), 1.0e-6)*1.1)
+    ax.set_xlabel('Deformation (mm)' if xKey == 'deformation' else 'Time (s)', family='serif')
+    ax.set_ylabel('Load (kN)', family='serif')
+    ax.set_title('%s, t = %.4f s' % (d_header['odb'], d_frame['time']), fontsize=9, family='serif')
+
+    fig.savefig(imageName, dpi=imageDpi)
+    plt.close(fig)
+
+    return imageName
+
+def animationEncode(frameDir, animationName):
+
+    "Encode the numbered frames of a folder as a GIF or MP4 file, streaming them from disk."
+
+    frameNames = sorted([f for f in os.listdir(frameDir) if f.endswith('.png')])
+
+    command = [ffmpegPath, '-y', '-loglevel', 'error', '-framerate', '%d' % framesPerSecond, '-i', os.path.join(frameDir, '%04d.png')]
+    if animationFormat == 'gif':
+        command = command+['-vf', 'split[a][b];[a]palettegen[p];[b][p]paletteuse']
+    else:
+        command = command+['-vcodec', 'libx264', '-pix_fmt', 'yuv420p', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2']
+
+    try:
+        if subprocess.call(command+[animationName]) == 0:
+            return animationName
+    except OSError:
+        pass
+
+    if animationFormat != 'gif':
+        raise RuntimeError('%s not found for encoding %s' % (ffmpegPath, animationName))
+
+    #GIF by Pillow, decoding one frame at a time
+    from PIL import Image
+
+    def images():
+        for f in frameNames[1:]:
+            yield Image.open(os.path.join(frameDir, f)).convert('P', palette=Image.ADAPTIVE)
+
+    first = Image.open(os.path.join(frameDir, frameNames[0])).convert('P', palette=Image.ADAPTIVE)
+    first.save(animationName, save_all=True, append_images=images(), duration=int(1000/framesPerSecond), loop=0)
+
+    return animationName
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Animating
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    #Compact files whose animation is missing or older than them
+    fileNames = []
+    for f in sorted(os.listdir(sourceDirN)):
+        if f.endswith('.json'):
+            fileName = os.path.join(sourceDirN, f[:-len('.json')])
+            animationName = fileName+'.'+animationFormat
+            if not os.path.exists(animationName) or os.path.getmtime(animationName) < os.path.getmtime(fileName+'.json'):
+                fileNames.append(fileName)
+
+    pool = Pool(processes=numberOfProcesses or cpu_count())
+
+    #Frames of every model rendered in parallel, each frame read from the memory-mapped compact file by its worker
+    for fileName in fileNames:
+
+        frameDir = fileName+'_frames'
+        if not os.path.exists(frameDir):
+            os.makedirs(frameDir)
+
+        d_header, d_arrays = compactOpen(fileName)
+        levels = contourLevels(fileName)
+
+        tasks = [(fileName, k, levels, os.path.join(frameDir, '%04d.png' % k)) for k in range(len(d_header['frames']))]
+        pool.map(frameRender, tasks, chunksize=max(1, len(tasks)//(4*(numberOfProcesses or cpu_count()))))
+
+        animationEncode(frameDir, fileName+'.'+animationFormat)
+
+        if keepFrames != 1:
+            shutil.rmtree(frameDir)
+
+        print('%s.%s: %d frames' % (fileName, animationFormat, len(tasks)))
+
+    pool.close()
+    pool.join()
@@ -0,0 +1,241 @@
+# Python 2/3 with NumPy, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Archiving script for results of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import numpy as np
+import json
+import os
+
+from curvep import readCurve, decodeName
+
+###################################################################################################
+###################################################################################################
+#Change processing mode
+switchMode = 1 # 1 - Archive the curves of a directory | 2 - Query the archive
+
+#Directories
+sourceDirA = ".\\" # directory of the .rpt files to be archived
+archDirA = "..\\archive\\" # directory of the archive
+manifestFileA = "manifest.jsonl" # manifest written by prepp.py, with the arguments of SCS() of every model indexed beside the parameters decoded from its name, "" - not used
+
+#Query, used when switchMode = 2
+queryA = {'kind': 'U2-RF2', 'tAdj': 0.8, 'dn': 4.8} # any field of the index, e.g. tAdj, tNonadj, dn, arrangement, screwGD_L
+
+###################################################################################################
+###################################################################################################
+
+#Curve kinds, namely the suffixes of .rpt files written by postp.py
+curveKinds = ['U2-RF2', 'ALLKE-ALLIE']
+
+#Arguments of SCS() recorded in the manifest
+rowKeys = ['mdbNumber', 'sheetP_Adj', 'sheetP_Nonadj', 'sheetL', 'sheetW', 'screwP', 'screwA_T1', 'screwA_T2', 'screwGD_L', 'screwGD_T', 'screwED']
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def archiveAppend(archDir, name, kind, curve, d_params={}):
+
+    "Append a curve to the archive."
+
+    if not os.path.exists(archDir):
+        os.makedirs(archDir)
+
+    #Data, little-endian float64 pairs of (x, y)
+    f = open(os.path.join(archDir, 'curves.bin'), 'ab')
+    f.seek(0, 2)
+    offset = f.tell()//8
+    np.ascontiguousarray(curve, dtype='<f8').tofile(f)
+    f.close()
+
+    #Index, one record per curve
+    d_record = {}
+    d_record.update(d_params)
+    d_record['name'] = name
+    d_record['kind'] = kind
+    d_record['offset'] = offset
+    d_record['length'] = len(curve)
+
+    f = open(os.path.join(archDir, 'index.jsonl'), 'a')
+    f.write(json.dumps(d_record, sort_keys=True)+'\n')
+    f.close()
+
+    return d_record
+
+def archiveOpen(archDir):
+
+    "Open the archive, returning the memory-mapped data and the index as columns."
+
+    dataFile = os.path.join(archDir, 'curves.bin')
+
+    if os.path.isfile(dataFile) and os.path.getsize(dataFile) > 0:
+        data = np.memmap(dataFile, dtype='<f8', mode='r')
+    else:
+        data = np.zeros(0)
+
+    records = []
+    if os.path.isfile(os.path.join(archDir, 'index.jsonl')):
+        for line in open(os.path.join(archDir, 'index.jsonl'), 'r'):
+            if line.strip():
+                records.append(json.loads(line))
+
+    #A curve appended again supersedes the earlier one
+    d_last = {}
+    for i in range(len(records)):
+        d_last[(records[i]['name'], records[i]['kind'])] = i
+    records = [records[i] for i in sorted(d_last.values())]
+
+    keys = set()
+    for d_record in records:
+        keys.update(d_record.keys())
+
+    #Numeric columns stay float, curves without a field, e.g. of undecodable names, given NaN
+    d_index = {}
+    for key in keys:
+        values = [d_record.get(key) for d_record in records]
+        if all([value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)) for value in values]):
+            d_index[key] = np.array([np.nan if value is None else value for value in values], dtype=float)
+        else:
+            d_index[key] = np.array(['' if value is None else str(value) for value in values], dtype=object)
+
+    return data, d_index
+
+def archiveQuery(d_index, d_query):
+
+    "Select the curves of the index matching every field of a query."
+
+    if len(d_index) == 0:
+        return np.zeros(0, dtype=bool)
+
+    mask = np.ones(len(d_index['name']), dtype=bool)
+
+    for key in d_query.keys():
+
+        if key not in d_index:
+            return np.zeros(len(d_index['name']), dtype=bool)
+
+        if d_index[key].dtype == object:
+            mask = mask & (d_index[key] == str(d_query[key]))
+        else:
+            mask = mask & np.isclose(d_index[key], d_query[key])
+
+    return mask
+
+def archiveCurves(data, d_index, mask):
+
+    "Views of the selected curves on the memory-mapped data, without copying."
+
+    curves = []
+
+    for i in np.nonzero(mask)[0]:
+        offset = int(d_index['offset'][i])
+        length = int(d_index['length'][i])
+        curves.append(data[offset:offset+2*length].reshape(length, 2))
+
+    return curves
+
+def manifestRows(fileName):
+
+    "Arguments of SCS() of the models generated without error, by model and job name, from a manifest of prepp.py."
+
+    d_rows = {}
+
+    if fileName != "" and os.path.isfile(fileName):
+        for line in open(fileName, 'r'):
+            if line.strip():
+                d_record = json.loads(line)
+                if 'modelName' in d_record and 'error' not in d_record:
+                    d_row = dict([(key, d_record[key]) for key in rowKeys if key in d_record])
+                    d_rows[d_record['modelName']] = d_row
+                    d_rows[d_record.get('jobName', 'J'+d_record['modelName'])] = d_row
+
+    return d_rows
+
+def archiveDirectory(sourceDir, archDir, manifestFile=""):
+
+    "Archive the .rpt files of a directory that are not archived yet."
+
+    data, d_index = archiveOpen(archDir)
+    d_rows = manifestRows(manifestFile)
+
+    archived = set()
+    if len(d_index) > 0:
+        archived = set(zip(d_index['name'], d_index['kind']))
+
+    number = 0
+
+    for f in sorted(os.listdir(sourceDir)):
+
+        for kind in curveKinds:
+
+            if f.endswith('_'+kind+'.rpt'):
+
+                name = f[:-len('_'+kind+'.rpt')]
+
+                if (name, kind) not in archived:
+
+                    d_params = decodeName(name) or {}
+                    d_params.update(d_rows.get(name, {}))
+                    archiveAppend(archDir, name, kind, readCurve(os.path.join(sourceDir, f)), d_params)
+                    number = number + 1
+
+    return number
+
+def compactAppend(f, d_header, key, array):
+
+    "Append an array to an open compact file and record it in the header."
+
+    array = np.ascontiguousarray(array)
+
+    d_header['arrays'][key] = [f.tell(), array.dtype.str, list(array.shape)]
+    array.tofile(f)
+
+def compactWrite(fileName, d_header):
+
+    "Write the header of a compact file."
+
+    f = open(fileName+'.json', 'w')
+    json.dump(d_header, f, indent=1, sort_keys=True)
+    f.close()
+
+def compactOpen(fileName):
+
+    "Open a compact file, returning its header and memory-mapped arrays by key."
+
+    d_header = json.load(open(fileName+'.json', 'r'))
+
+    d_arrays = {}
+    for key in d_header['arrays'].keys():
+        offset, dtype, shape = d_header['arrays'][key]
+        if int(np.prod(shape)) == 0:
+            d_arrays[key] = np.zeros(shape, dtype=dtype)
+        else:
+            d_arrays[key] = np.memmap(fileName+'.bin', dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+
+    return d_header, d_arrays
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Computation and Analysis
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    if switchMode == 1:
+
+        number = archiveDirectory(sourceDir=sourceDirA, archDir=archDirA, manifestFile=manifestFileA)
+        print('%d curves archived in %s' % (number, archDirA))
+
+    if switchMode == 2:
+
+        data, d_index = archiveOpen(archDirA)
+        mask = archiveQuery(d_index, queryA)
+
+        for i in np.nonzero(mask)[0]:
+            print('%s %s, %d points' % (d_index['name'][i], d_index['kind'][i], d_index['length'][i]))
+
+        print('%d of %d curves match %s' % (mask.sum(), len(mask), queryA))
@@ -0,0 +1,147 @@
+# built-in Python 2 in Abaqus
+# -*- coding: utf-8 -*-
+#
+# Benchmark script for the verification specimens of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+from abaqusConstants import *
+from abaqus import *
+
+from multiprocessing import cpu_count
+import numpy as np
+import datetime
+import json
+import time
+import sys
+import os
+
+###################################################################################################
+###################################################################################################
+#Specimens to be benchmarked
+benchGroup = [ 1,  2,  3,  4,  5,  6,  7,  8,  9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19] # specimen numbers in shearT of prepp.py
+
+#Solve or not
+solveOrNot = 1 # 1 - generate, solve and export | 0 - generate only
+
+#Experimental curves
+expDirB = "..\\bench\\exp\\" # directory of experimental curves, named as <label>.csv
+
+#Result file
+resultFileB = "bench_results.json" # machine-readable benchmark results
+
+###################################################################################################
+###################################################################################################
+
+currentPath = os.path.abspath("bench.py")
+benchDir = os.path.abspath(os.path.dirname(currentPath) + os.path.sep + ".")
+pathSplit = benchDir.split('\\')
+caeNameB = pathSplit[-1]+".cae"
+
+#Import pre- and post-processing scripts from the same folder
+sys.path.insert(0, benchDir)
+
+import prepp
+import postp
+from curvep import readCurve, compareCurves
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def elementCount(modelName):
+
+    "Count the elements of all instances in a model."
+
+    number = 0
+
+    for instanceName in mdb.models[modelName].rootAssembly.instances.keys():
+        number = number + len(mdb.models[modelName].rootAssembly.instances[instanceName].elements)
+
+    return number
+
+def resultWrite(records, fileName):
+
+    "Write benchmark records."
+
+    d_results = {}
+    d_results['date'] = datetime.datetime.now().isoformat()
+    d_results['numberOfCores'] = cpu_count()
+    d_results['solveOrNot'] = solveOrNot
+    d_results['specimens'] = records
+
+    f = open(fileName, 'w')
+    json.dump(d_results, f, indent=1, sort_keys=True)
+    f.close()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Benchmark
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    mdb.saveAs(pathName=benchDir+"\\"+caeNameB)
+
+    records = []
+
+    for i in benchGroup:
+
+        d_record = {}
+        d_record['number'] = i
+        d_record['label'] = prepp.shearT['label'][i-1]
+
+        #Generate model
+        t0 = time.time()
+        modelName = prepp.SCS(mdbNumber     =  prepp.shearT['mdbNumber'][i-1],
+                              sheetP_Adj    =  prepp.shearT['sheetP_Adj'][i-1],
+                              sheetP_Nonadj =  prepp.shearT['sheetP_Nonadj'][i-1],
+                              sheetL        =  250.0,
+                              sheetW        =  50.0,
+                              screwP        =  prepp.shearT['screwP'][i-1],
+                              screwA_T1     =  prepp.shearT['screwA_T1'][i-1],
+                              screwA_T2     =  prepp.shearT['screwA_T2'][i-1],
+                              screwGD_L     =  prepp.shearT['screwGD_L'][i-1],
+                              screwGD_T     =  prepp.shearT['screwGD_T'][i-1],
+                              screwED       =  30.0)
+        d_record['generationTime'] = time.time()-t0
+
+        jobName = 'J'+modelName
+        d_record['jobName'] = jobName
+        d_record['elements'] = elementCount(modelName)
+
+        #Write input file
+        t0 = time.time()
+        mdb.jobs[jobName].writeInput(consistencyChecking=OFF)
+        d_record['inputTime'] = time.time()-t0
+
+        if solveOrNot == 1:
+
+            #Submit job
+            t0 = time.time()
+            postp.jobSubmit(jobName=jobName, numberOfUsedCores=cpu_count()-1)
+            d_record['solveTime'] = time.time()-t0
+
+            #Export results
+            t0 = time.time()
+            postp.resultExport(odbName=jobName)
+            d_record['exportTime'] = time.time()-t0
+
+            #Compare curves
+            curveFE = readCurve(jobName+'_U2-RF2.rpt')
+            d_record['peakLoad'] = float(curveFE[:, 1].max())
+            d_record['deformationAtPeak'] = float(curveFE[np.argmax(curveFE[:, 1]), 0])
+
+            expFile = os.path.join(expDirB, d_record['label']+'.csv')
+            if os.path.isfile(expFile):
+                d_metrics = compareCurves(curvesFE=[curveFE], curvesExp=[readCurve(expFile)])
+                for key in ['peakLoadExp', 'peakLoadRatio', 'stiffnessRatio', 'energyError', 'curveRMSE']:
+                    d_record[key] = float(d_metrics[key][0])
+
+        records.append(d_record)
+
+        #Write results after every specimen, so that an interrupted benchmark keeps its records
+        resultWrite(records, resultFileB)
+
+    mdb.save()
@@ -0,0 +1,191 @@
+# Python 2/3, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Caching script of solved results of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import hashlib
+import shutil
+import json
+import time
+import os
+
+###################################################################################################
+###################################################################################################
+#Directories
+cacheDirC = "E:\\cache\\" # cache shared across campaigns, the same as cacheDirM in postp.py
+sourceDirC = ".\\" # folder of .inp files to be looked up in the cache
+
+###################################################################################################
+###################################################################################################
+
+#Resulting files of a job, by suffix of the job name
+cacheSuffixes = ['_ALLKE-ALLIE.rpt', '_U2-RF2.rpt', '_Mises.png', '.odb']
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def physicalKey(inputFile):
+
+    "Hash of the physical inputs of an .inp file, namely its keywords and data without comments and heading, so that the job and model names do not matter."
+
+    h = hashlib.sha1()
+    heading = False
+
+    for line in open(inputFile, 'rb'):
+
+        line = line.rstrip()
+
+        if line.startswith(b'**') or len(line) == 0:
+            continue
+
+        #The heading only names the job and the model
+        if line.startswith(b'*'):
+            heading = line.lower().replace(b' ', b'').startswith(b'*heading')
+            if heading:
+                continue
+        elif heading:
+            continue
+
+        h.update(line+b'\n')
+
+    return h.hexdigest()
+
+def cacheLookup(inputFile, cacheDir):
+
+    "Entry of the cache with the same physical inputs as an .inp file, or None."
+
+    key = physicalKey(inputFile)
+    entryFile = os.path.join(cacheDir, key, 'entry.json')
+
+    if os.path.isfile(entryFile):
+        return json.load(open(entryFile, 'r'))
+
+    return None
+
+def cacheStore(jobName, sourceDir, cacheDir, suffixes=cacheSuffixes):
+
+    "Store the resulting files of a job in the cache, under the hash of its .inp file, adding them to an existing entry."
+
+    key = physicalKey(os.path.join(sourceDir, jobName+'.inp'))
+    entryDir = os.path.join(cacheDir, key)
+
+    d_entry = cacheLookup(os.path.join(sourceDir, jobName+'.inp'), cacheDir)
+
+    if d_entry is None:
+
+        files = [suffix for suffix in suffixes if os.path.isfile(os.path.join(sourceDir, jobName+suffix))]
+
+        if len(files) == 0:
+            return None
+
+        #Copied to a temporary folder first, so that a campaign never reads a partial entry
+        tmpDir = entryDir+'.%d.tmp' % os.getpid()
+        if os.path.exists(tmpDir):
+            shutil.rmtree(tmpDir)
+        os.makedirs(tmpDir)
+
+        for suffix in files:
+            shutil.copyfile(os.path.join(sourceDir, jobName+suffix), os.path.join(tmpDir, jobName+suffix))
+
+        d_entry = {}
+        d_entry['key'] = key
+        d_entry['jobName'] = jobName
+        d_entry['date'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        d_entry['files'] = files
+
+        f = open(os.path.join(tmpDir, 'entry.json'), 'w')
+        json.dump(d_entry, f, indent=1, sort_keys=True)
+        f.close()
+
+        #Another campaign may have stored the same entry meanwhile
+        try:
+            os.rename(tmpDir, entryDir)
+        except OSError:
+            shutil.rmtree(tmpDir)
+
+        return d_entry
+
+    #Files exported after the entry was stored, e.g. by switchMode = 2 after switchMode = 1, under the cached job name
+    files = [suffix for suffix in suffixes if suffix not in d_entry['files'] and os.path.isfile(os.path.join(sourceDir, jobName+suffix))]
+
+    if len(files) == 0:
+        return d_entry
+
+    for suffix in files:
+        shutil.copyfile(os.path.join(sourceDir, jobName+suffix), os.path.join(entryDir, d_entry['jobName']+suffix))
+
+    d_entry['files'] = d_entry['files']+files
+
+    f = open(os.path.join(entryDir, 'entry.json.%d.tmp' % os.getpid()), 'w')
+    json.dump(d_entry, f, indent=1, sort_keys=True)
+    f.close()
+    if os.path.exists(os.path.join(entryDir, 'entry.json')):
+        os.remove(os.path.join(entryDir, 'entry.json'))
+    os.rename(os.path.join(entryDir, 'entry.json.%d.tmp' % os.getpid()), os.path.join(entryDir, 'entry.json'))
+
+    return d_entry
+
+def cacheRestore(d_entry, jobName, targetDir, cacheDir, suffixes=None):
+
+    "Copy the cached files of an entry to the resulting files of a job, renaming the job in the reports."
+
+    entryDir = os.path.join(cacheDir, d_entry['key'])
+    restored = []
+
+    #The .odb file first, so that the restored reports are never older than it
+    for suffix in sorted(d_entry['files'], key=lambda suffix: suffix != '.odb'):
+
+        if suffixes is not None and suffix not in suffixes:
+            continue
+
+        sourceF = os.path.join(entryDir, d_entry['jobName']+suffix)
+        targetF = os.path.join(targetDir, jobName+suffix)
+
+        if suffix.endswith('.rpt'):
+            data = open(sourceF, 'rb').read().replace(d_entry['jobName'].upper().encode('utf-8'), jobName.upper().encode('utf-8')).replace(d_entry['jobName'].encode('utf-8'), jobName.encode('utf-8'))
+            open(targetF, 'wb').write(data)
+        else:
+            shutil.copyfile(sourceF, targetF)
+
+        restored.append(suffix)
+
+    return restored
+
+def cacheIndex(cacheDir):
+
+    "Entries of the cache."
+
+    entries = []
+
+    if os.path.isdir(cacheDir):
+        for key in sorted(os.listdir(cacheDir)):
+            entryFile = os.path.join(cacheDir, key, 'entry.json')
+            if os.path.isfile(entryFile):
+                entries.append(json.load(open(entryFile, 'r')))
+
+    return entries
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Lookup
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    entries = cacheIndex(cacheDirC)
+    print('%d entries in %s' % (len(entries), cacheDirC))
+
+    #The .inp files of a new campaign already solved under another name
+    hits = 0
+    for f in sorted(os.listdir(sourceDirC)):
+        if f.endswith('.inp'):
+            d_entry = cacheLookup(os.path.join(sourceDirC, f), cacheDirC)
+            if d_entry is not None:
+                hits = hits + 1
+                print('%s: cached as %s, %s' % (f[:-len('.inp')], d_entry['jobName'], ' '.join(d_entry['files'])))
+
+    print('%d .inp files found in the cache' % hits)
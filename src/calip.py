@@ -0,0 +1,202 @@
+# Python 2/3 with NumPy, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Loading-calibration script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import numpy as np
+import sys
+import os
+
+from curvep import readCurve, decodeName
+
+###################################################################################################
+###################################################################################################
+#Files
+featureFileL = "curve_features.csv" # table of curve features of past results, written by curvep.py with switchMode = 2
+energyDirL = ".\\" # directory of the *_ALLKE-ALLIE.rpt files of past results, "" - not used
+sweepFileL = "" # CSV file of sweep rows, the same as sweepFile in prepp.py, "" - sweepFile of prepp.py
+calibrationFileL = "loading_calibration.csv" # loading of every configuration, read by prepp.py with calibrationFile
+
+#Calibration control
+failureMargin = 0.3 # displacement applied beyond the predicted deformation at failure, as a fraction of it
+velocityMax = 200.0 # velocity of the loading point at which past results stay quasi-static, mm/s
+rampTime = 0.02 # time of the smooth step up to the velocity, s
+energyRatioMax = 0.05 # limit of ALLKE/ALLIE after the ramp, past results above it lower the velocity
+velocityPast = 200.0 # velocity of the loading point of the past results, mm/s
+
+#Default loading, used when nothing is known of a configuration
+timePeriodDefault = 0.06 # step time period, s
+
+###################################################################################################
+###################################################################################################
+
+#Fields of the sweep rows identifying a configuration
+calibrationKeys = ['sheetP_Adj', 'sheetP_Nonadj', 'screwP', 'screwA_T1', 'screwA_T2', 'screwGD_L', 'screwGD_T']
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def featureRead(fileName):
+
+    "Read a table of curve features, as a column per field."
+
+    d_table = {}
+
+    if not os.path.isfile(fileName):
+        return d_table
+
+    lines = [line.strip() for line in open(fileName, 'r') if line.strip()]
+    keys = lines[0].split(',')
+
+    for key in keys:
+        d_table[key] = []
+
+    for line in lines[1:]:
+        for key, value in zip(keys, line.split(',')):
+            try:
+                d_table[key].append(float(value))
+            except ValueError:
+                d_table[key].append(value)
+
+    return d_table
+
+def failureSurrogate(d_features):
+
+    "Fit the deformation at failure as a power law of the sheet thicknesses and the screw diameter, returning the exponents, or None."
+
+    if len(d_features.get('name', [])) < 4:
+        return None
+
+    tAdj = np.array(d_features['tAdj'], dtype=float)
+    tNonadj = np.array(d_features['tNonadj'], dtype=float)
+    dn = np.array(d_features['dn'], dtype=float)
+    deformation = np.array(d_features['deformationUltimate'], dtype=float)
+
+    valid = np.isfinite(tAdj) & np.isfinite(tNonadj) & np.isfinite(dn) & (deformation > 0.0)
+
+    if valid.sum() < 4:
+        return None
+
+    A = np.column_stack([np.ones(valid.sum()), np.log(tAdj[valid]), np.log(tNonadj[valid]), np.log(dn[valid])])
+    coefficients = np.linalg.lstsq(A, np.log(deformation[valid]), rcond=-1)[0]
+
+    return coefficients
+
+def failurePredict(d_config, d_features, coefficients):
+
+    "Deformation at failure of a configuration, observed in the past results of the same configuration or predicted by the surrogate, with its source."
+
+    if len(d_features.get('name', [])) > 0:
+
+        same = [i for i in range(len(d_features['name'])) if d_features['tAdj'][i] == d_config['tAdj'] and d_features['tNonadj'][i] == d_config['tNonadj'] and d_features['dn'][i] == d_config['dn'] and d_features['arrangement'][i] == d_config['arrangement'] and d_features['arrangementIndex'][i] == d_config['arrangementIndex'] and d_features['screwGD_L'][i] == d_config['screwGD_L'] and d_features['screwGD_T'][i] == d_config['screwGD_T']]
+
+        if len(same) > 0:
+            return max([d_features['deformationUltimate'][i] for i in same]), 'feature'
+
+    if coefficients is not None:
+        return float(np.exp(coefficients[0]+coefficients[1]*np.log(d_config['tAdj'])+coefficients[2]*np.log(d_config['tNonadj'])+coefficients[3]*np.log(d_config['dn']))), 'surrogate'
+
+    return None, 'default'
+
+def energyRatio(fileName):
+
+    "Largest ratio of kinetic to internal energy after the ramp of a past result."
+
+    curve = readCurve(fileName)
+    curve = curve[curve[:, 0] > rampTime]
+
+    if len(curve) == 0:
+        return None
+
+    return float(np.abs(curve[:, 1]).max())
+
+def loadingCalibrate(deformationFailure, ratioPast=None):
+
+    "Velocity and step time period reaching the deformation at failure plus the margin as fast as staying quasi-static allows."
+
+    velocity = velocityMax
+
+    #Kinetic energy scales with the square of the velocity
+    if ratioPast is not None and ratioPast > energyRatioMax:
+        velocity = min(velocity, velocityPast*np.sqrt(energyRatioMax/ratioPast))
+
+    if deformationFailure is None:
+        return velocity, timePeriodDefault
+
+    #The smooth step displaces the loading point by half the velocity times the ramp time
+    targetDisplacement = deformationFailure*(1.0+failureMargin)
+    timePeriod = max(targetDisplacement/velocity+rampTime/2.0, rampTime)
+
+    return velocity, timePeriod
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Calibration
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    #Parameter database of prepp.py, imported against the stand-in of Abaqus/CAE
+    caliDir = os.path.dirname(os.path.abspath("calip.py"))
+    sys.path.insert(0, caliDir)
+
+    from dryp import standInInstall
+    standInInstall(caliDir)
+    import prepp
+
+    d_features = featureRead(featureFileL)
+    coefficients = failureSurrogate(d_features)
+
+    if coefficients is not None:
+        print('Surrogate: deformation at failure = %.3g * tAdj^%.3f * tNonadj^%.3f * dn^%.3f' % (np.exp(coefficients[0]), coefficients[1], coefficients[2], coefficients[3]))
+
+    #Energy ratios of the past results, by configuration in the model name
+    d_ratios = {}
+    if energyDirL != "" and os.path.isdir(energyDirL):
+        for f in sorted(os.listdir(energyDirL)):
+            if f.endswith('_ALLKE-ALLIE.rpt'):
+                name = f[:-len('_ALLKE-ALLIE.rpt')]
+                if decodeName(name) is not None:
+                    ratio = energyRatio(os.path.join(energyDirL, f))
+                    if ratio is not None:
+                        d_ratios[name.split('-', 1)[1]] = max(d_ratios.get(name.split('-', 1)[1], 0.0), ratio)
+
+    rows = prepp.sweepRows(sweepFileL or prepp.sweepFile)
+
+    f = open(calibrationFileL, 'w')
+    f.write(','.join(calibrationKeys+['deformationFailure', 'targetDisplacement', 'velocity', 'rampTime', 'timePeriod', 'source'])+'\n')
+
+    d_done = {}
+    for d_row in rows:
+
+        key = tuple([d_row[k] for k in calibrationKeys])
+        if key in d_done:
+            continue
+
+        d_config = {}
+        d_config['tAdj'] = prepp.sheetC['t'][d_row['sheetP_Adj']]
+        d_config['tNonadj'] = prepp.sheetC['t'][d_row['sheetP_Nonadj']]
+        d_config['dn'] = prepp.screwC['dn'][d_row['screwP']]
+        d_config['arrangement'] = prepp.screwA['type'][d_row['screwA_T1']]
+        d_config['arrangementIndex'] = d_row['screwA_T2']
+        d_config['screwGD_L'] = d_row['screwGD_L']
+        d_config['screwGD_T'] = d_row['screwGD_T']
+
+        #Model names without the number, e.g. 06-10-48-O0_4_4
+        configName = '%02d-%02d-%02d-%s%d_%d_%d' % (int(d_config['tAdj']*10.0), int(d_config['tNonadj']*10.0), int(d_config['dn']*10.0), d_config['arrangement'], d_config['arrangementIndex'], d_config['screwGD_L'], d_config['screwGD_T'])
+
+        deformationFailure, source = failurePredict(d_config, d_features, coefficients)
+        velocity, timePeriod = loadingCalibrate(deformationFailure, d_ratios.get(configName))
+        d_done[key] = timePeriod
+
+        f.write(','.join(['%d' % value for value in key]+['%.6g' % (deformationFailure or 0.0), '%.6g' % ((deformationFailure or 0.0)*(1.0+failureMargin)), '%.6g' % velocity, '%.6g' % rampTime, '%.6g' % timePeriod, source])+'\n')
+
+        print('%s: %-9s failure %s mm, %.1f mm/s over %.4f s' % (configName, source, '-' if deformationFailure is None else '%.2f' % deformationFailure, velocity, timePeriod))
+
+    f.close()
+
+    print('%d configurations, step time %.4f s in total against %.4f s by default' % (len(d_done), sum(d_done.values()), timePeriodDefault*len(d_done)))
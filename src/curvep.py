@@ -0,0 +1,352 @@
+# Python 2/3 with NumPy, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Curve-processing script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+from multiprocessing import Pool, cpu_count
+import numpy as np
+import json
+import re
+import os
+
+###################################################################################################
+###################################################################################################
+#Change processing mode
+switchMode = 1 # 1 - Compare simulated and experimental curves | 2 - Extract curve features
+
+#Directories and files
+feDirC = ".\\" # directory of the *_U2-RF2.rpt files
+expDirC = "..\\bench\\exp\\" # directory of experimental curves, named as <label>.csv or <job name>.csv
+labelFileC = "bench_results.json" # pairs job names with specimen labels, written by bench.py
+resultFileC = "curve_comparison.csv" # table of error metrics
+featureFileC = "curve_features.csv" # table of curve features
+
+#Comparison control
+gridPoints = 200 # number of points of the common deformation grid
+stiffnessRange = [0.1, 0.4] # initial stiffness is the secant between these fractions of the peak load
+
+#Feature extraction control
+smoothMethod = 'savgol' # 'savgol' - Savitzky-Golay filter | 'gaussian' - Gaussian low-pass filter | '' - no smoothing
+smoothWindow = 11 # filter window in samples, odd; the Gaussian filter uses a standard deviation of smoothWindow/6
+smoothOrder = 3 # polynomial order of the Savitzky-Golay filter
+failureDrop = 0.8 # ultimate deformation is reached when the load drops to this fraction of the peak load after the peak
+chunkSize = 200 # number of curves per task of the process pool
+numberOfProcesses = 0 # 0 - all cores
+
+###################################################################################################
+###################################################################################################
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def readCurve(fileName):
+
+    "Read a load versus deformation curve from an .rpt or .csv file."
+
+    data = []
+
+    for line in open(fileName, 'r'):
+
+        lineSplit = line.replace(',', ' ').split()
+
+        #Keep the rows consisting of two numbers only
+        if len(lineSplit) == 2:
+            try:
+                data.append((float(lineSplit[0]), float(lineSplit[1])))
+            except ValueError:
+                pass
+
+    curve = np.array(data, dtype=float).reshape(-1, 2)
+
+    #Load positive
+    if len(curve) > 0 and curve[np.argmax(np.abs(curve[:, 1])), 1] < 0.0:
+        curve[:, 1] = -curve[:, 1]
+
+    return curve
+
+def curvePairs(feDir, expDir, labelFile=''):
+
+    "Pair the simulated curves with the experimental ones."
+
+    #Job name - specimen label
+    d_labels = {}
+    if labelFile and os.path.isfile(labelFile):
+        for d_record in json.load(open(labelFile, 'r'))['specimens']:
+            d_labels[d_record['jobName']] = d_record['label']
+
+    pairs = []
+
+    for f in sorted(os.listdir(feDir)):
+
+        if f.endswith('_U2-RF2.rpt'):
+
+            jobName = f[:-len('_U2-RF2.rpt')]
+            label = d_labels.get(jobName, jobName)
+            expFile = os.path.join(expDir, label+'.csv')
+
+            if os.path.isfile(expFile):
+                pairs.append((jobName, label, os.path.join(feDir, f), expFile))
+
+    return pairs
+
+def decodeName(name):
+
+    "Decode the parameters of SCS() from a model or job name, e.g. JM01-06-10-48-O0_4_4."
+
+    match = re.match(r'^J?M(\d+)-(\d+)-(\d+)-(\d+)-([OIV]+)(\d+)_(\d+)_(\d+)', name)
+
+    if match is None:
+        return None
+
+    d_name = {}
+    d_name['mdbNumber'] = int(match.group(1))
+    d_name['tAdj'] = int(match.group(2))/10.0 # thickness of the sheet adjunct to screw head
+    d_name['tNonadj'] = int(match.group(3))/10.0 # thickness of the sheet not adjunct to screw head
+    d_name['dn'] = int(match.group(4))/10.0 # screw nominal diameter
+    d_name['arrangement'] = match.group(5) # screw arrangement type1
+    d_name['arrangementIndex'] = int(match.group(6)) # screw arrangement type2
+    d_name['screwGD_L'] = int(match.group(7)) # screw longitudinal spacing distance, multiply by dn
+    d_name['screwGD_T'] = int(match.group(8)) # screw transversal spacing distance, multiply by dn
+
+    return d_name
+
+def smoothCurve(curve, method='savgol', window=11, order=3):
+
+    "Smooth the load of a curve sampled at constant time intervals."
+
+    if method == '' or len(curve) < window:
+        return curve
+
+    half = window//2
+
+    if method == 'savgol':
+        #Least-squares polynomial fitted over the window, evaluated at its centre
+        A = np.vander(np.arange(-half, half+1, dtype=float), order+1)[:, ::-1]
+        kernel = np.linalg.pinv(A)[0]
+    elif method == 'gaussian':
+        sigma = window/6.0
+        kernel = np.exp(-0.5*(np.arange(-half, half+1)/sigma)**2)
+        kernel = kernel/kernel.sum()
+    else:
+        raise ValueError('Unknown smoothing method: %s' % method)
+
+    smoothed = curve.copy()
+    smoothed[:, 1] = np.convolve(np.pad(curve[:, 1], half, mode='reflect'), kernel[::-1], mode='valid')
+
+    return smoothed
+
+def curveFeatures(curves, stiffnessRange=[0.1, 0.4], failureDrop=0.8):
+
+    "Extract features of curves in a vectorized pass."
+
+    X, Y = curveStack(curves)
+    lengths = np.array([len(curve) for curve in curves])
+    rows = np.arange(len(curves))
+    index = np.arange(X.shape[1])[None, :]
+
+    d_features = {}
+
+    ##Peak load and deformation at peak
+    iPeak = np.argmax(Y, axis=1)
+    d_features['peakLoad'] = Y[rows, iPeak]
+    d_features['deformationAtPeak'] = X[rows, iPeak]
+
+    ##Initial stiffness
+    d_features['stiffness'] = secantStiffness(X, Y, d_features['peakLoad'], stiffnessRange)
+
+    ##Ultimate deformation, where the load drops below failureDrop of the peak load after the peak, or the last point
+    drop = (index > iPeak[:, None]) & (index < lengths[:, None]) & (Y < failureDrop*d_features['peakLoad'][:, None])
+    iUltimate = np.where(drop.any(axis=1), np.argmax(drop, axis=1), lengths-1)
+    d_features['deformationUltimate'] = X[rows, iUltimate]
+
+    ##Ductility, ultimate deformation over the yield deformation of the bilinear idealisation
+    d_features['ductility'] = d_features['deformationUltimate']/(d_features['peakLoad']/d_features['stiffness'])
+
+    ##Absorbed energy up to the ultimate deformation
+    segment = 0.5*(Y[:, 1:]+Y[:, :-1])*np.diff(X, axis=1)
+    d_features['energy'] = np.where(index[:, 1:] <= iUltimate[:, None], segment, 0.0).sum(axis=1)
+
+    return d_features
+
+def featureChunk(args):
+
+    "Read, smooth and extract features of a chunk of .rpt files."
+
+    fileNames, smoothMethod, smoothWindow, smoothOrder, stiffnessRange, failureDrop = args
+
+    curves = [smoothCurve(readCurve(fileName), smoothMethod, smoothWindow, smoothOrder) for fileName in fileNames]
+
+    return curveFeatures(curves, stiffnessRange, failureDrop)
+
+def curveStack(curves):
+
+    "Stack curves of different lengths into padded arrays with non-decreasing deformation."
+
+    length = max([len(curve) for curve in curves])
+
+    X = np.zeros((len(curves), length))
+    Y = np.zeros((len(curves), length))
+
+    for i in range(len(curves)):
+        n = len(curves[i])
+        X[i, :n] = curves[i][:, 0]
+        Y[i, :n] = curves[i][:, 1]
+        X[i, n:] = curves[i][-1, 0]
+        Y[i, n:] = curves[i][-1, 1]
+
+    #Dynamic noise may move the deformation slightly backwards
+    X = np.maximum.accumulate(X, axis=1)
+
+    return X, Y
+
+def interpStack(X, Y, Q):
+
+    "Linear interpolation of every row of (X, Y) at the row of Q in one pass."
+
+    m, length = X.shape
+
+    #Shift each row onto its own interval, so that a single sorted search covers all rows
+    span = max(X.max()-X.min(), Q.max()-Q.min())+1.0
+    shift = (np.arange(m)*span*2.0)[:, None]
+    XFlat = (X-X[:, :1]+shift).ravel()
+    QFlat = (np.clip(Q, X[:, :1], X[:, -1:])-X[:, :1]+shift).ravel()
+
+    index = np.searchsorted(XFlat, QFlat, side='right').reshape(Q.shape)
+    index = np.clip(index, (np.arange(m)*length+1)[:, None], (np.arange(m)*length+length-1)[:, None])
+
+    x0 = XFlat[index-1].reshape(Q.shape)
+    x1 = XFlat[index].reshape(Q.shape)
+    y0 = Y.ravel()[index-1]
+    y1 = Y.ravel()[index]
+    qShift = QFlat.reshape(Q.shape)
+
+    dx = x1-x0
+    weight = np.where(dx > 0.0, (qShift-x0)/np.where(dx > 0.0, dx, 1.0), 1.0)
+
+    return y0+weight*(y1-y0)
+
+def secantStiffness(U, R, peak, fractions):
+
+    "Secant stiffness between two fractions of the peak load of gridded curves."
+
+    rows = np.arange(U.shape[0])
+
+    i1 = np.argmax(R >= fractions[0]*peak[:, None], axis=1)
+    i2 = np.argmax(R >= fractions[1]*peak[:, None], axis=1)
+
+    du = U[rows, i2]-U[rows, i1]
+
+    return np.where(du > 0.0, (R[rows, i2]-R[rows, i1])/np.where(du > 0.0, du, 1.0), np.nan)
+
+def compareCurves(curvesFE, curvesExp, gridPoints=200, stiffnessRange=[0.1, 0.4]):
+
+    "Compare simulated curves with experimental ones in a vectorized pass."
+
+    XFE, YFE = curveStack(curvesFE)
+    XExp, YExp = curveStack(curvesExp)
+
+    #Common deformation grids, from zero to the smaller maximum deformation of each pair
+    uMax = np.minimum(XFE[:, -1], XExp[:, -1])
+    U = uMax[:, None]*np.linspace(0.0, 1.0, gridPoints)[None, :]
+
+    RFE = interpStack(XFE, YFE, U)
+    RExp = interpStack(XExp, YExp, U)
+
+    d_metrics = {}
+
+    ##Peak load over the whole curves
+    d_metrics['peakLoadFE'] = YFE.max(axis=1)
+    d_metrics['peakLoadExp'] = YExp.max(axis=1)
+    d_metrics['peakLoadRatio'] = d_metrics['peakLoadFE']/d_metrics['peakLoadExp']
+
+    ##Initial stiffness on the common grids
+    d_metrics['stiffnessFE'] = secantStiffness(U, RFE, d_metrics['peakLoadFE'], stiffnessRange)
+    d_metrics['stiffnessExp'] = secantStiffness(U, RExp, d_metrics['peakLoadExp'], stiffnessRange)
+    d_metrics['stiffnessRatio'] = d_metrics['stiffnessFE']/d_metrics['stiffnessExp']
+
+    ##Absorbed energy on the common grids
+    dU = np.diff(U, axis=1)
+    d_metrics['energyFE'] = (0.5*(RFE[:, 1:]+RFE[:, :-1])*dU).sum(axis=1)
+    d_metrics['energyExp'] = (0.5*(RExp[:, 1:]+RExp[:, :-1])*dU).sum(axis=1)
+    d_metrics['energyError'] = (d_metrics['energyFE']-d_metrics['energyExp'])/d_metrics['energyExp']
+
+    ##Root mean square error normalised by the experimental peak load
+    d_metrics['curveRMSE'] = np.sqrt(((RFE-RExp)**2).mean(axis=1))/d_metrics['peakLoadExp']
+
+    d_metrics['deformationRange'] = uMax
+
+    return d_metrics
+
+def tableWrite(names, d_table, fileName, keys=None):
+
+    "Write a table of per-curve values as a .csv file."
+
+    if keys is None:
+        keys = sorted(d_table.keys())
+
+    f = open(fileName, 'w')
+    f.write(','.join(['name']+keys)+'\n')
+
+    for i in range(len(names)):
+        values = [d_table[key][i] for key in keys]
+        f.write(','.join([names[i]]+[value if isinstance(value, str) else '%.6g' % value for value in values])+'\n')
+
+    f.close()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Computation and Analysis
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    if switchMode == 1:
+
+        pairs = curvePairs(feDir=feDirC, expDir=expDirC, labelFile=os.path.join(feDirC, labelFileC))
+
+        if len(pairs) == 0:
+            print('No simulated curve has a matching experimental curve.')
+
+        else:
+            d_metrics = compareCurves(curvesFE=[readCurve(pair[2]) for pair in pairs], curvesExp=[readCurve(pair[3]) for pair in pairs], gridPoints=gridPoints, stiffnessRange=stiffnessRange)
+
+            tableWrite(names=[pair[1] for pair in pairs], d_table=d_metrics, fileName=resultFileC, keys=['peakLoadRatio', 'stiffnessRatio', 'energyError', 'curveRMSE', 'peakLoadFE', 'peakLoadExp', 'stiffnessFE', 'stiffnessExp', 'energyFE', 'energyExp', 'deformationRange'])
+
+            for i in range(len(pairs)):
+                print('%-10s peak %.3f  stiffness %.3f  energy %+.3f  RMSE %.3f' % (pairs[i][1], d_metrics['peakLoadRatio'][i], d_metrics['stiffnessRatio'][i], d_metrics['energyError'][i], d_metrics['curveRMSE'][i]))
+
+    if switchMode == 2:
+
+        fileNames = [os.path.join(feDirC, f) for f in sorted(os.listdir(feDirC)) if f.endswith('_U2-RF2.rpt')]
+        names = [os.path.basename(fileName)[:-len('_U2-RF2.rpt')] for fileName in fileNames]
+
+        #Extract features in a process pool
+        tasks = []
+        for i in range(0, len(fileNames), chunkSize):
+            tasks.append((fileNames[i:i+chunkSize], smoothMethod, smoothWindow, smoothOrder, stiffnessRange, failureDrop))
+
+        pool = Pool(processes=numberOfProcesses or cpu_count())
+        chunks = pool.map(featureChunk, tasks)
+        pool.close()
+        pool.join()
+
+        d_features = {}
+        for key in ['peakLoad', 'deformationAtPeak', 'stiffness', 'deformationUltimate', 'ductility', 'energy']:
+            d_features[key] = np.concatenate([chunk[key] for chunk in chunks]) if chunks else np.zeros(0)
+
+        #Key the features by the fields of the model name
+        nameKeys = ['mdbNumber', 'tAdj', 'tNonadj', 'dn', 'arrangement', 'arrangementIndex', 'screwGD_L', 'screwGD_T']
+        for key in nameKeys:
+            d_features[key] = []
+        for name in names:
+            d_name = decodeName(name)
+            for key in nameKeys:
+                d_features[key].append(d_name[key] if d_name is not None else float('nan'))
+
+        tableWrite(names=names, d_table=d_features, fileName=featureFileC, keys=nameKeys+['peakLoad', 'deformationAtPeak', 'stiffness', 'deformationUltimate', 'ductility', 'energy'])
+
+        print('%d curves, features written to %s' % (len(names), featureFileC))
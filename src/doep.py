@@ -0,0 +1,298 @@
+# Python 2/3 with NumPy, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Design-of-experiments script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import numpy as np
+import sys
+import os
+
+from curvep import decodeName
+from calip import featureRead
+
+###################################################################################################
+###################################################################################################
+#Files
+featureFileD = "curve_features.csv" # table of curve features of finished jobs, written by curvep.py with switchMode = 2
+candidateFileD = "" # CSV file of candidate sweep rows, "" - full factorial of the levels below
+sweepFileD = "sweep_next.csv" # next batch of sweep rows, read by prepp.py as sweepFile
+
+#Levels of the full factorial, [] - all entries of the parameter database of prepp.py
+mdbNumberD = 1 # mdbNumber of the candidate rows
+sheetLevels = [] # indices of sheetC, for both sheets
+screwLevels = [] # indices of screwC
+arrangementLevels = [] # indices of screwA['type']
+spacingLevels = [3, 4, 5, 6] # screwGD_L and screwGD_T, multiply by dn
+
+#Sampling control
+batchSize = 20 # rows per batch
+targets = ['peakLoad', 'stiffness'] # curve features modeled over the parameter space
+gradientWeight = 0.5 # weight of the gradient of the predicted features against their uncertainty in choosing rows
+stopStd = 0.05 # no further batch once the largest predicted standard deviation of every log feature is below it
+
+###################################################################################################
+###################################################################################################
+
+#Columns of the sweep rows, in the order of sweepRows() in prepp.py
+sweepKeys = ['mdbNumber', 'sheetP_Adj', 'sheetP_Nonadj', 'screwP', 'screwA_T1', 'screwA_T2', 'screwGD_L', 'screwGD_T', 'sheetL', 'sheetW', 'screwED']
+
+#Length scales of the Gaussian process tried, as fractions of the spread of every parameter
+lengthFactors = [0.25, 0.5, 1.0, 2.0, 4.0]
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def configName(tAdj, tNonadj, dn, arrangement, arrangementIndex, screwGD_L, screwGD_T):
+
+    "Model name without the number, e.g. 06-10-48-O0_4_4."
+
+    return '%02d-%02d-%02d-%s%d_%d_%d' % (int(round(tAdj*10.0)), int(round(tNonadj*10.0)), int(round(dn*10.0)), arrangement, arrangementIndex, screwGD_L, screwGD_T)
+
+def factorialRows(sheetC, screwC, screwA):
+
+    "Sweep rows of the full factorial of the levels."
+
+    rows = []
+
+    for sheetP_Adj in (sheetLevels or range(len(sheetC['t']))):
+        for sheetP_Nonadj in (sheetLevels or range(len(sheetC['t']))):
+            for screwP in (screwLevels or range(len(screwC['dn']))):
+                for screwA_T1 in (arrangementLevels or range(len(screwA['type']))):
+                    for screwA_T2 in range(len(screwA[screwA['type'][screwA_T1]])):
+                        for screwGD_L in spacingLevels:
+                            for screwGD_T in spacingLevels:
+
+                                ##A single row has no longitudinal spacing, and a single column no transversal one, except the zigzag of type VI
+                                arr = screwA[screwA['type'][screwA_T1]][screwA_T2]
+                                if len(arr) == 1 and screwGD_L != spacingLevels[0]:
+                                    continue
+                                if screwA_T1 < 6 and max(arr) == 1 and screwGD_T != spacingLevels[0]:
+                                    continue
+
+                                d_row = {}
+                                d_row['mdbNumber'] = mdbNumberD
+                                d_row['sheetP_Adj'] = sheetP_Adj
+                                d_row['sheetP_Nonadj'] = sheetP_Nonadj
+                                d_row['screwP'] = screwP
+                                d_row['screwA_T1'] = screwA_T1
+                                d_row['screwA_T2'] = screwA_T2
+                                d_row['screwGD_L'] = screwGD_L
+                                d_row['screwGD_T'] = screwGD_T
+                                d_row['sheetL'] = 250.0
+                                d_row['sheetW'] = 50.0
+                                d_row['screwED'] = 30.0
+                                rows.append(d_row)
+
+    return rows
+
+def designPoints(tAdj, tNonadj, dn, T1, holes, screwGD_L, screwGD_T, typeNumber):
+
+    "Coordinates of configurations in the parameter space: log thicknesses and diameter, spacings, number of screws, and the arrangement family one-hot."
+
+    X = np.column_stack([np.log(tAdj), np.log(tNonadj), np.log(dn), np.asarray(screwGD_L, dtype=float), np.asarray(screwGD_T, dtype=float), np.log(holes)])
+    family = (np.asarray(T1)[:, None] == np.arange(typeNumber)[None, :]).astype(float)
+
+    return np.hstack([X, family])
+
+def kernel(A, B, lengths):
+
+    "Squared exponential covariance between two sets of points."
+
+    As = A/lengths[None, :]
+    Bs = B/lengths[None, :]
+
+    #Expanded square distances, without arrays of all pairs by all parameters
+    d2 = (As**2).sum(axis=1)[:, None]+(Bs**2).sum(axis=1)[None, :]-2.0*np.dot(As, Bs.T)
+
+    return np.exp(-0.5*np.maximum(d2, 0.0))
+
+def processFit(X, y, lengthsBase, noise=1e-4):
+
+    "Fit a Gaussian process to standardized observations, choosing the length scale of largest marginal likelihood."
+
+    mean, std = y.mean(), y.std() or 1.0
+    z = (y-mean)/std
+
+    d_best = None
+    for factor in lengthFactors:
+
+        lengths = lengthsBase*factor
+        L = np.linalg.cholesky(kernel(X, X, lengths)+noise*np.eye(len(X)))
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+        likelihood = -0.5*np.dot(z, alpha)-np.log(np.diag(L)).sum()
+
+        if d_best is None or likelihood > d_best['likelihood']:
+            d_best = {'likelihood': likelihood, 'lengths': lengths, 'L': L, 'alpha': alpha}
+
+    d_best['X'] = X
+    d_best['mean'] = mean
+    d_best['std'] = std
+    d_best['noise'] = noise
+
+    return d_best
+
+def processPredict(d_process, Xc):
+
+    "Mean, standard deviation and gradient norm of the fitted Gaussian process at candidate points."
+
+    Kc = kernel(Xc, d_process['X'], d_process['lengths'])
+    v = np.linalg.solve(d_process['L'], Kc.T)
+
+    mean = d_process['mean']+d_process['std']*np.dot(Kc, d_process['alpha'])
+    std = d_process['std']*np.sqrt(np.maximum(1.0-(v**2).sum(axis=0), 0.0))
+
+    #Gradient of the mean in units of the length scales
+    W = Kc*d_process['alpha'][None, :]
+    gradient = -d_process['std']*(Xc*W.sum(axis=1)[:, None]-np.dot(W, d_process['X']))/d_process['lengths'][None, :]
+
+    return mean, std, np.sqrt((gradient**2).sum(axis=1))
+
+def processStd(X, Xc, lengths, noise):
+
+    "Standard deviation at candidate points of a unit Gaussian process conditioned on points, independent of the observed values."
+
+    L = np.linalg.cholesky(kernel(X, X, lengths)+noise*np.eye(len(X)))
+    v = np.linalg.solve(L, kernel(Xc, X, lengths).T)
+
+    return np.sqrt(np.maximum(1.0-(v**2).sum(axis=0), 0.0))
+
+def spaceFilling(Xc, lengthsBase, number):
+
+    "Choose candidates far from each other, starting from the centre of the parameter space."
+
+    Xs = Xc/lengthsBase[None, :]
+
+    picked = [int(np.argmin(((Xs-Xs.mean(axis=0))**2).sum(axis=1)))]
+    distance = np.sqrt(((Xs-Xs[picked[0]])**2).sum(axis=1))
+
+    while len(picked) < number and distance.max() > 0.0:
+        i = int(np.argmax(distance))
+        picked.append(i)
+        distance = np.minimum(distance, np.sqrt(((Xs-Xs[i])**2).sum(axis=1)))
+
+    return picked
+
+def batchSelect(Xo, d_observed, Xc, lengthsBase, number):
+
+    "Choose the candidates of largest uncertainty and gradient of the predicted features, lowering the uncertainty around every row chosen before the next."
+
+    d_processes = {}
+    d_score = {}
+
+    for target in targets:
+        d_processes[target] = processFit(Xo, np.log(d_observed[target]), lengthsBase)
+        mean, std, gradient = processPredict(d_processes[target], Xc)
+        d_score[target] = (std, gradient)
+
+    stdMax = max([d_score[target][0].max() for target in targets])
+
+    #Gradients stay fixed within a batch, uncertainties are recomputed as if the chosen rows were solved
+    picked = []
+    X = Xo
+    for k in range(number):
+
+        score = np.zeros(len(Xc))
+        for target in targets:
+            std = d_score[target][0] if k == 0 else d_processes[target]['std']*processStd(X, Xc, d_processes[target]['lengths'], d_processes[target]['noise'])
+            gradient = d_score[target][1]
+            score = score+std/(std.max() or 1.0)+gradientWeight*gradient/(gradient.max() or 1.0)*(std > 0.0)
+
+        score[picked] = -np.inf
+        i = int(np.argmax(score))
+        picked.append(i)
+        X = np.vstack([X, Xc[i:i+1]])
+
+    return picked, stdMax
+
+def sweepWrite(rows, fileName):
+
+    "Write sweep rows as read by sweepRows() in prepp.py."
+
+    f = open(fileName, 'w')
+    f.write(','.join(sweepKeys)+'\n')
+    for d_row in rows:
+        f.write(','.join([('%g' % d_row[key]) if key in ['sheetL', 'sheetW', 'screwED'] else ('%d' % d_row[key]) for key in sweepKeys])+'\n')
+    f.close()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Sampling
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    #Parameter database of prepp.py, imported against the stand-in of Abaqus/CAE
+    doeDir = os.path.dirname(os.path.abspath("doep.py"))
+    sys.path.insert(0, doeDir)
+
+    from dryp import standInInstall
+    standInInstall(doeDir)
+    import prepp
+    from layp import layoutCheck, arrangementTemplates
+
+    sheetC, screwC, screwA = prepp.sheetC, prepp.screwC, prepp.screwA
+
+    #Candidate rows with feasible layouts
+    rows = prepp.sweepRows(candidateFileD) if candidateFileD != "" else factorialRows(sheetC, screwC, screwA)
+    rows = [rows[i] for i in np.nonzero(layoutCheck(rows, screwC, screwA, prepp.layoutClearance)['feasible'])[0]]
+
+    index, I, J, N, valid = arrangementTemplates(screwA)
+    holes = valid.sum(axis=1)
+
+    names = [configName(sheetC['t'][r['sheetP_Adj']], sheetC['t'][r['sheetP_Nonadj']], screwC['dn'][r['screwP']], screwA['type'][r['screwA_T1']], r['screwA_T2'], r['screwGD_L'], r['screwGD_T']) for r in rows]
+    Xc = designPoints([sheetC['t'][r['sheetP_Adj']] for r in rows], [sheetC['t'][r['sheetP_Nonadj']] for r in rows], [screwC['dn'][r['screwP']] for r in rows], [r['screwA_T1'] for r in rows], [holes[index[r['screwA_T1'], r['screwA_T2']]] for r in rows], [r['screwGD_L'] for r in rows], [r['screwGD_T'] for r in rows], len(screwA['type']))
+
+    #Spread of every parameter, the one-hot families count as one
+    lengthsBase = np.maximum(Xc.std(axis=0), 0.5)
+    lengthsBase[6:] = 1.0
+
+    #Finished configurations, the mean feature of repeated ones
+    d_features = featureRead(featureFileD)
+    d_finished = {}
+    for i in range(len(d_features.get('name', []))):
+        d_name = decodeName(d_features['name'][i])
+        if d_name is None or d_name['arrangement'] not in screwA['type'] or min([d_features[target][i] for target in targets]) <= 0.0:
+            continue
+        name = d_features['name'][i].lstrip('J').split('-', 1)[1]
+        T1 = screwA['type'].index(d_name['arrangement'])
+        d_finished.setdefault(name, {'point': (d_name['tAdj'], d_name['tNonadj'], d_name['dn'], T1, holes[index[T1, d_name['arrangementIndex']]], d_name['screwGD_L'], d_name['screwGD_T']), 'values': []})
+        d_finished[name]['values'].append([d_features[target][i] for target in targets])
+
+    remaining = [i for i in range(len(rows)) if names[i] not in d_finished]
+
+    print('%d feasible candidates, %d finished, %d remaining' % (len(rows), len(d_finished), len(remaining)))
+
+    if len(d_finished) < max(batchSize, 2):
+
+        ##Too few results to fit the features, spread the first batch over the parameter space
+        picked = spaceFilling(Xc[remaining], lengthsBase, batchSize)
+        stdMax = None
+
+    else:
+
+        points = [d_finished[name]['point'] for name in sorted(d_finished.keys())]
+        Xo = designPoints(*([[p[k] for p in points] for k in range(7)]+[len(screwA['type'])]))
+
+        d_observed = {}
+        for k in range(len(targets)):
+            d_observed[targets[k]] = np.array([np.mean([v[k] for v in d_finished[name]['values']]) for name in sorted(d_finished.keys())])
+
+        picked, stdMax = batchSelect(Xo, d_observed, Xc[remaining], lengthsBase, min(batchSize, len(remaining)))
+
+        print('Largest predicted standard deviation of the log features: %.4f' % stdMax)
+
+        if stdMax < stopStd:
+            print('Below %.4f, the design chart needs no further batch' % stopStd)
+            picked = []
+
+    batch = [rows[remaining[i]] for i in picked]
+    sweepWrite(batch, sweepFileD)
+
+    for i in picked:
+        print('Next: %s' % names[remaining[i]])
+
+    print('%d rows written to %s' % (len(batch), sweepFileD))
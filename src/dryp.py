@@ -0,0 +1,242 @@
+# Python 2/3, outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Dry-run script of pre- and post-processing of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import types
+import json
+import time
+import sys
+import re
+import os
+
+from profp import profileStart, profileMark
+
+###################################################################################################
+###################################################################################################
+#Models to be dry-run
+dryGroup = [] # specimen numbers in shearT of prepp.py, [] - the sweep rows of prepp.py
+dryPostp = 1 # 1 - also dry-run jobSubmit() and resultExport() of postp.py for every model | 0 - prepp.py only
+
+#Files
+resultFileD = "dry_results.json" # operation counts per model and per phase
+callLogD = "" # log of every recorded call with its arguments, "" - no call log
+baselineFileD = "" # earlier dry_results.json, any model or phase with more operations is reported as a regression, "" - no comparison
+
+###################################################################################################
+###################################################################################################
+
+#Modules of Abaqus/CAE replaced by the stand-in
+standInModules = ['abaqus', 'abaqusConstants', 'odbAccess', 'visualization', 'mesh', 'regionToolset']
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Recorder(object):
+
+    "Stand-in for any object of Abaqus/CAE, recording every call made through it."
+
+    counts = {} # calls by name, indices dropped, e.g. mdb.models[].parts[].generateMesh
+    total = [0]
+    log = []
+
+    def __init__(self, name):
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, key):
+        if key.startswith('__'):
+            raise AttributeError(key)
+        return Recorder(self._name+'.'+key)
+
+    def __setattr__(self, key, value):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        Recorder.counts[self._name] = Recorder.counts.get(self._name, 0)+1
+        Recorder.total[0] += 1
+        if callLogD != "":
+            Recorder.log.append((self._name, repr(args), repr(sorted(kwargs.items()))))
+        return Recorder(self._name+'()')
+
+    def __getitem__(self, key):
+        return Recorder(self._name+'[]')
+
+    def __setitem__(self, key, value):
+        pass
+
+    def __delitem__(self, key):
+        Recorder.counts[self._name+'.__delitem__'] = Recorder.counts.get(self._name+'.__delitem__', 0)+1
+        Recorder.total[0] += 1
+
+    #Empty repositories, and a recorded object is never false
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter([])
+
+    def __contains__(self, key):
+        return False
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    #Arithmetic on recorded objects, e.g. operations on xyData
+    def __add__(self, other):
+        return Recorder(self._name)
+
+    __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = __truediv__ = __rtruediv__ = __div__ = __rdiv__ = __pow__ = __add__
+
+    def __neg__(self):
+        return Recorder(self._name)
+
+def constantNames(sourceDir):
+
+    "Symbolic constants used by the scripts of a directory, namely their names in capitals."
+
+    names = set()
+
+    for f in os.listdir(sourceDir):
+        if f.endswith('.py'):
+            names.update(re.findall(r'\b[A-Z][A-Z0-9_]+\b', open(os.path.join(sourceDir, f), 'r').read()))
+
+    return sorted(names)
+
+def standInInstall(sourceDir):
+
+    "Install the stand-in modules of Abaqus/CAE, so that prepp.py and postp.py import without a licence."
+
+    d_modules = {}
+    d_modules['abaqus'] = {'mdb': Recorder('mdb'), 'session': Recorder('session'), 'backwardCompatibility': Recorder('backwardCompatibility')}
+    d_modules['abaqusConstants'] = dict([(name, name) for name in constantNames(sourceDir)])
+    d_modules['odbAccess'] = {'openOdb': Recorder('openOdb')}
+    d_modules['visualization'] = {'combine': Recorder('combine')}
+    d_modules['mesh'] = {'ElemType': Recorder('mesh.ElemType')}
+    d_modules['regionToolset'] = {'Region': Recorder('regionToolset.Region')}
+
+    for moduleName in standInModules:
+        module = types.ModuleType(moduleName)
+        module.__dict__.update(d_modules[moduleName])
+        module.__all__ = list(d_modules[moduleName].keys())
+        sys.modules[moduleName] = module
+
+def operationMark(d_profile, phaseName, t0=None):
+
+    "Mark a phase of a profile, also recording the number of operations since the last mark."
+
+    profileMark(d_profile, phaseName, t0)
+
+    if d_profile is not None:
+        d_profile['operations'][phaseName] = d_profile['operations'].get(phaseName, 0)+Recorder.total[0]-d_profile['count']
+        d_profile['count'] = Recorder.total[0]
+
+def operationStart(kind):
+
+    "Start a profile counting the operations of its phases."
+
+    d_profile = profileStart(kind)
+    d_profile['operations'] = {}
+    d_profile['count'] = Recorder.total[0]
+
+    return d_profile
+
+def dryRecord(d_profile, counts):
+
+    "Operation counts and Python-side times of a profile, with the calls made since the counts given."
+
+    d_record = {}
+    d_record['operations'] = sum(d_profile['operations'].values())
+    d_record['phases'] = d_profile['operations']
+    d_record['times'] = d_profile['phases']
+    d_record['calls'] = dict([(name, Recorder.counts[name]-counts.get(name, 0)) for name in Recorder.counts.keys() if Recorder.counts[name] > counts.get(name, 0)])
+
+    return d_record
+
+def regressionCheck(d_results, d_baseline):
+
+    "Models and phases with more operations than the baseline."
+
+    regressions = []
+
+    for name in sorted(d_results['models'].keys()):
+        if name in d_baseline['models']:
+            for kind in d_results['models'][name].keys():
+                if kind in d_baseline['models'][name]:
+                    current = d_results['models'][name][kind]['phases']
+                    baseline = d_baseline['models'][name][kind]['phases']
+                    for phaseName in sorted(current.keys()):
+                        if current[phaseName] > baseline.get(phaseName, 0):
+                            regressions.append((name, kind, phaseName, baseline.get(phaseName, 0), current[phaseName]))
+
+    return regressions
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Dry run
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    dryDir = os.path.dirname(os.path.abspath("dryp.py"))
+    sys.path.insert(0, dryDir)
+
+    standInInstall(dryDir)
+
+    import prepp
+    import postp
+
+    #Count the operations at every phase mark of the scripts
+    prepp.profileMark = operationMark
+    postp.profileMark = operationMark
+
+    if len(dryGroup) == 0:
+        rows = prepp.sweepRows(prepp.sweepFile)
+    else:
+        rows = prepp.sweepRows('', dryGroup)
+
+    d_results = {}
+    d_results['date'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    d_results['models'] = {}
+
+    for d_row in rows:
+
+        counts = dict(Recorder.counts)
+        d_profile = operationStart('prepp')
+        modelName = prepp.SCS(d_profile=d_profile, **d_row)
+        jobName = 'J'+modelName
+
+        d_results['models'][jobName] = {}
+        d_results['models'][jobName]['prepp'] = dryRecord(d_profile, counts)
+
+        if dryPostp == 1:
+            counts = dict(Recorder.counts)
+            d_profile = operationStart('postp')
+            postp.jobSubmit(jobName=jobName, numberOfUsedCores=1, d_profile=d_profile)
+            postp.resultExport(odbName=jobName, d_profile=d_profile)
+            d_results['models'][jobName]['postp'] = dryRecord(d_profile, counts)
+
+        print('%s %s' % (jobName, '  '.join(['%s %d operations' % (kind, d_results['models'][jobName][kind]['operations']) for kind in sorted(d_results['models'][jobName].keys())])))
+
+    f = open(resultFileD, 'w')
+    json.dump(d_results, f, indent=1, sort_keys=True)
+    f.close()
+
+    if callLogD != "":
+        f = open(callLogD, 'w')
+        for name, args, kwargs in Recorder.log:
+            f.write('%s %s %s\n' % (name, args, kwargs))
+        f.close()
+
+    #Regressions against the baseline fail the run, e.g. in CI
+    if baselineFileD != "":
+        regressions = regressionCheck(d_results, json.load(open(baselineFileD, 'r')))
+        for name, kind, phaseName, baseline, current in regressions:
+            print('Regression: %s %s %s, %d -> %d operations' % (name, kind, phaseName, baseline, current))
+        if len(regressions) > 0:
+            sys.exit(1)
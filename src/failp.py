@@ -0,0 +1,225 @@
+# Python 2/3 with NumPy, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Failure-classifying script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import numpy as np
+import os
+
+from archp import compactOpen
+from curvep import decodeName, tableWrite
+from calip import featureRead
+
+###################################################################################################
+###################################################################################################
+#Files
+compactDirF = ".\\compact\\" # directory of the compact files written by odbp.py, with the final frame and instanceSelection = [] for the screws
+resultFileF = "failure_modes.csv" # failure mode, confidence and scores of every model
+featureFileF = "curve_features.csv" # table of curve features written by curvep.py, given the failure mode and confidence too, "" - not used
+
+#Classification control, to be calibrated against failure modes judged from contours
+bearingRadius = 1.0 # eroded sheet elements within this distance from the hole edge, multiply by dn, count as bearing
+bearingElongation = 0.5 # hole elongation of full bearing score, multiply by dn
+tiltingAngle = 15.0 # screw rotation of full tilting score, degree
+pullOutSlip = 1.0 # axial slip of full pull-out score between the screw and the sheet not adjunct to the screw head, multiply by its thickness
+
+###################################################################################################
+###################################################################################################
+
+#Failure modes, in the order of the scores
+failureModes = ['bearing', 'tilting', 'pullOut', 'netSection', 'endTearOut']
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def finalFrame(d_header):
+
+    "Frame of a compact file to be classified, the final one if exported."
+
+    frames = [d_frame for d_frame in d_header['frames'] if d_frame['kind'] == 'final']
+
+    return frames[0] if len(frames) > 0 else d_header['frames'][-1]
+
+def instanceArrays(d_header, d_arrays, instanceName, d_frame):
+
+    "Undeformed node coordinates, final displacements, element centroids and status of an instance."
+
+    k = d_header['instances'].index(instanceName)
+
+    connectivity = np.asarray(d_arrays['connectivity'])[np.asarray(d_arrays['elementInstance']) == k]
+    nodes = np.unique(connectivity[connectivity >= 0])
+
+    coordinates = np.asarray(d_arrays['coordinates'], dtype=float)
+    U = np.asarray(d_arrays[d_frame['key']+'/U'], dtype=float)
+
+    valid = connectivity >= 0
+    centroids = np.where(valid[:, :, None], coordinates[np.maximum(connectivity, 0)], 0.0).sum(axis=1)/valid.sum(axis=1)[:, None]
+    status = np.asarray(d_arrays[d_frame['key']+'/status'])[np.asarray(d_arrays['elementInstance']) == k]
+
+    return coordinates[nodes], U[nodes], centroids, status
+
+def sheetScores(coordinates, U, centroids, status, centres, dn):
+
+    "Bearing, net-section and end tear-out scores of a sheet from its eroded elements and hole elongation."
+
+    #Nearest hole of every element and node
+    delta = centroids[:, None, :2]-centres[None, :, :]
+    nearest = np.argmin((delta**2).sum(axis=2), axis=1)
+    dxy = delta[np.arange(len(centroids)), nearest]
+    distance = np.sqrt((dxy**2).sum(axis=1))
+
+    eroded = status <= 0.0
+    width = coordinates[:, 0].max()-coordinates[:, 0].min()
+
+    ##Bearing, erosion at the hole edge, or the hole elongated along the loading direction
+    near = distance <= dn/2.0+bearingRadius*dn
+    erosionBearing = (eroded & near).sum()/float(max(eroded.sum(), 1))
+
+    nodeDistance = np.sqrt(((coordinates[:, None, :2]-centres[None, :, :])**2).sum(axis=2)).min(axis=1)
+    rim = nodeDistance <= dn
+    elongation = (U[rim, 1].max()-U[rim, 1].min())/dn if rim.sum() > 1 else 0.0
+
+    bearing = max(erosionBearing if eroded.any() else 0.0, min(elongation/bearingElongation, 1.0))
+
+    ##Net section, erosion across the width through the row of a hole
+    band = eroded & (np.abs(dxy[:, 1]) <= dn)
+    netSection = (centroids[band, 0].max()-centroids[band, 0].min())/width if band.sum() > 1 else 0.0
+
+    ##End tear-out, erosion along the loading direction from a hole towards the nearer sheet end
+    strip = eroded & (np.abs(dxy[:, 0]) <= dn)
+    endTearOut = 0.0
+    if strip.any():
+        yHole = centres[nearest[strip], 1]
+        yEnd = np.where(centroids[strip, 1] >= yHole, coordinates[:, 1].max(), coordinates[:, 1].min())
+        endTearOut = float(np.clip(np.abs(centroids[strip, 1]-yHole)/np.maximum(np.abs(yEnd-yHole), 1.0e-6), 0.0, 1.0).max())
+
+    return bearing, min(netSection, 1.0), endTearOut
+
+def screwScores(d_header, d_arrays, d_frame, centres, sheetNonadj, dn, tNonadj):
+
+    "Tilting and pull-out scores from the rotation and axial slip of the screws, or of the sheets around the holes without screws."
+
+    screws = [name for name in d_header['instances'] if name.startswith('SCREWPART')]
+    angles, slips = [], []
+
+    for name in screws:
+
+        coordinates, U, centroids, status = instanceArrays(d_header, d_arrays, name, d_frame)
+
+        #Rotation about x, the slope of the displacement along the loading direction over the height
+        z = coordinates[:, 2]-coordinates[:, 2].mean()
+        angles.append(np.degrees(np.arctan(abs((z*U[:, 1]).sum()/max((z**2).sum(), 1.0e-12)))))
+
+        #Axial slip against the sheet not adjunct to the screw head around this screw
+        if sheetNonadj is not None:
+            near = np.sqrt(((sheetNonadj[0][:, :2]-coordinates[:, :2].mean(axis=0))**2).sum(axis=1)) <= dn
+            if near.any():
+                slips.append(abs(U[:, 2].mean()-sheetNonadj[1][near, 2].mean()))
+
+    if len(screws) == 0 and sheetNonadj is not None:
+
+        ##Rotation of the sheet around each hole, and its separation from the hole plane
+        coordinates, U = sheetNonadj[0], sheetNonadj[1]
+        for centre in centres:
+            near = np.sqrt(((coordinates[:, :2]-centre)**2).sum(axis=1)) <= 2.0*dn
+            if near.sum() > 2:
+                dy = coordinates[near, 1]-coordinates[near, 1].mean()
+                angles.append(np.degrees(np.arctan(abs((dy*U[near, 2]).sum()/max((dy**2).sum(), 1.0e-12)))))
+
+    tilting = min(max(angles)/tiltingAngle, 1.0) if len(angles) > 0 else 0.0
+    pullOut = min(max(slips)/(pullOutSlip*tNonadj), 1.0) if len(slips) > 0 else 0.0
+
+    return tilting, pullOut
+
+def failureClassify(fileName):
+
+    "Failure mode of a model from the final frame of its compact file, with a confidence and the score of every mode."
+
+    d_header, d_arrays = compactOpen(fileName)
+    d_frame = finalFrame(d_header)
+
+    d_name = decodeName(d_header['odb'])
+    dn = d_name['dn'] if d_name is not None else 4.8
+    tNonadj = d_name['tNonadj'] if d_name is not None else 1.0
+
+    centres = np.asarray(d_arrays['holeCentres'], dtype=float).reshape(-1, 2)
+
+    d_scores = {}
+    for mode in failureModes:
+        d_scores[mode] = 0.0
+
+    sheetNonadj = None
+    for name in d_header['instances']:
+
+        if not name.startswith('SHEET') or len(centres) == 0:
+            continue
+
+        coordinates, U, centroids, status = instanceArrays(d_header, d_arrays, name, d_frame)
+        bearing, netSection, endTearOut = sheetScores(coordinates, U, centroids, status, centres, dn)
+
+        ##The sheet failing first governs
+        d_scores['bearing'] = max(d_scores['bearing'], bearing)
+        d_scores['netSection'] = max(d_scores['netSection'], netSection)
+        d_scores['endTearOut'] = max(d_scores['endTearOut'], endTearOut)
+
+        if name.startswith('SHEETNONADJ'):
+            sheetNonadj = (coordinates, U)
+
+    d_scores['tilting'], d_scores['pullOut'] = screwScores(d_header, d_arrays, d_frame, centres, sheetNonadj, dn, tNonadj)
+
+    #Fracture of the sheet overrides the local modes around the hole
+    fracture = max(d_scores['netSection'], d_scores['endTearOut'])
+    d_scores['bearing'] = d_scores['bearing']*(1.0-fracture)
+    d_scores['tilting'] = d_scores['tilting']*(1.0-fracture)
+
+    scores = np.array([d_scores[mode] for mode in failureModes])
+
+    if scores.sum() == 0.0:
+        return 'none', 0.0, d_scores
+
+    return failureModes[int(np.argmax(scores))], float(scores.max()/scores.sum()), d_scores
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Classification
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    names = []
+    d_table = {'failureMode': [], 'failureConfidence': []}
+    for mode in failureModes:
+        d_table[mode] = []
+
+    for f in sorted(os.listdir(compactDirF)):
+
+        if f.endswith('.json'):
+
+            mode, confidence, d_scores = failureClassify(os.path.join(compactDirF, f[:-len('.json')]))
+
+            names.append(f[:-len('.json')])
+            d_table['failureMode'].append(mode)
+            d_table['failureConfidence'].append(confidence)
+            for key in failureModes:
+                d_table[key].append(d_scores[key])
+
+            print('%s: %s, %.2f' % (names[-1], mode, confidence))
+
+    tableWrite(names=names, d_table=d_table, fileName=resultFileF, keys=['failureMode', 'failureConfidence']+failureModes)
+
+    #Failure mode and confidence added to the curve features of the same models
+    if featureFileF != "" and os.path.isfile(featureFileF):
+
+        keys = [key for key in open(featureFileF, 'r').readline().strip().split(',')[1:] if key not in ['failureMode', 'failureConfidence']]
+        d_features = featureRead(featureFileF)
+        d_features['failureMode'] = [d_table['failureMode'][names.index(name)] if name in names else '' for name in d_features['name']]
+        d_features['failureConfidence'] = [d_table['failureConfidence'][names.index(name)] if name in names else float('nan') for name in d_features['name']]
+
+        tableWrite(names=d_features['name'], d_table=d_features, fileName=featureFileF, keys=keys+['failureMode', 'failureConfidence'])
+
+    for mode in failureModes+['none']:
+        print('%s: %d' % (mode, d_table['failureMode'].count(mode)))
@@ -0,0 +1,416 @@
+# Python 2/3, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Input-patching script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import ctypes
+import time
+import re
+import os
+
+###################################################################################################
+###################################################################################################
+#Files
+templateFileI = "JM01-06-10-48-O0_4_4.inp" # .inp file written by prepp.py, parsed once
+variantFileI = "variants.csv" # CSV file with a column jobName and a column per patch below, and a row per variant, an empty value keeps the template
+targetDirI = ".\\" # directory of the variant .inp files
+
+#Resource model of Abaqus/Explicit, rough defaults not fitted to measured jobs, to be set from the memory use observed on the node
+memoryBase = 300.0 # memory of the solver itself, MB
+memoryPerNode = 1.0e-3 # memory per node, MB
+memoryPerElement = {'c3d8r': 2.0e-3, 'c3d6': 1.5e-3, 'c3d4': 1.0e-3} # memory per element by type, MB, others take the largest
+memoryPerSurface = 5.0 # memory per contact surface, MB
+
+###################################################################################################
+###################################################################################################
+
+#Components of output variables, others take 1
+d_components = {'U': 3, 'V': 3, 'A': 3, 'RF': 3, 'COORD': 3, 'S': 6, 'LE': 6, 'PE': 6, 'E': 6}
+
+#Variables of output requests with variable=PRESELECT in Abaqus/Explicit
+preselectNodal = ['U', 'V', 'A', 'RF']
+preselectElement = ['S', 'LE', 'PE', 'PEEQ', 'STATUS']
+
+#Columns of the variant file, and the parts whose sections they patch
+d_materialColumns = {}
+d_materialColumns['sheetAdjMaterial'] = 'sheetAdjPart'
+d_materialColumns['sheetNonadjMaterial'] = 'sheetNonadjPart'
+d_materialColumns['screwMaterial'] = 'screwPart'
+d_materialColumns['threadMaterial'] = 'threadPart'
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def keywordParse(line):
+
+    "Keyword and parameters of a keyword line, in lower case."
+
+    if isinstance(line, bytes):
+        line = line.decode('latin-1')
+
+    lineSplit = line.lstrip('*').split(',')
+
+    d_params = {}
+    for param in lineSplit[1:]:
+        if '=' in param:
+            d_params[param.split('=')[0].strip().lower()] = param.split('=', 1)[1].strip()
+        elif param.strip():
+            d_params[param.strip().lower()] = ''
+
+    return lineSplit[0].strip().lower(), d_params
+
+def inputTree(data):
+
+    "Keyword tree of the bytes of an .inp file: every keyword block with its byte offsets, and the part, instance, step and material enclosing it."
+
+    blocks = []
+    d_context = {'part': None, 'instance': None, 'step': None, 'material': None}
+
+    #Keyword lines only, data lines are skipped over by searching for the next line starting with *, -1 once none is left
+    start = 0 if data.startswith(b'*') else data.find(b'\n*')+1 or -1
+
+    while start >= 0:
+
+        end = data.find(b'\n', start)+1 or len(data)
+
+        ##A keyword line ending with a comma continues on the next line
+        while data[start:end].rstrip().endswith(b',') and end < len(data) and data[end:end+1] != b'*':
+            end = data.find(b'\n', end)+1 or len(data)
+
+        nextStart = data.find(b'\n*', end-1)+1 or -1
+
+        if data[start:start+2] == b'**':
+            start = nextStart
+            continue
+
+        keyword, d_params = keywordParse(data[start:end].replace(b'\r', b'').replace(b'\n', b''))
+
+        ##Enclosing part, instance, step and material
+        if keyword in ['part', 'instance', 'step']:
+            d_context[keyword] = d_params.get('name', '')
+            d_context['material'] = None
+        elif keyword in ['end part', 'end instance', 'end step']:
+            d_context[keyword[4:]] = None
+            d_context['material'] = None
+        elif keyword == 'material':
+            d_context['material'] = d_params.get('name', '')
+
+        d_block = {}
+        d_block['keyword'] = keyword
+        d_block['params'] = d_params
+        d_block['start'] = start
+        d_block['dataStart'] = end
+        d_block['end'] = nextStart if nextStart > 0 else len(data)
+        for key in d_context.keys():
+            d_block[key] = d_context[key]
+        blocks.append(d_block)
+
+        start = nextStart
+
+    return blocks
+
+def paramReplace(data, d_block, param, value):
+
+    "Patch replacing the value of a parameter in a keyword line, keeping the rest of the line."
+
+    line = data[d_block['start']:d_block['dataStart']]
+    match = re.search(br'(,\s*' + re.escape(param.encode('latin-1')) + br'\s*=\s*)([^,\r\n]*)', line, re.IGNORECASE)
+
+    if match is None:
+        raise ValueError('No parameter %s in %s' % (param, line.strip()))
+
+    return (d_block['start']+match.start(2), d_block['start']+match.end(2), value.encode('latin-1'))
+
+def fieldReplace(data, d_block, index, value):
+
+    "Patch replacing a field of the first data line of a block."
+
+    lineEnd = data.find(b'\n', d_block['dataStart'])+1 or d_block['end']
+    line = data[d_block['dataStart']:lineEnd]
+    newline = line[len(line.rstrip(b'\r\n')):]
+    fields = line.rstrip(b'\r\n').split(b',')
+
+    while len(fields) <= index:
+        fields.append(b'')
+    fields[index] = (' %s' % value).encode('latin-1')
+
+    return (d_block['dataStart'], lineEnd, b','.join(fields)+newline)
+
+def materialPatches(data, blocks, d_materials):
+
+    "Patches assigning materials to the sections of parts, e.g. {'sheetAdjPart': 'T08_Q550'}."
+
+    materials = [d_block['params'].get('name', '').lower() for d_block in blocks if d_block['keyword'] == 'material']
+    patches = []
+
+    for partName in d_materials.keys():
+
+        if d_materials[partName].lower() not in materials:
+            raise ValueError('Material %s is not defined in the template' % d_materials[partName])
+
+        sections = [d_block for d_block in blocks if d_block['keyword'] == 'solid section' and (d_block['part'] or '').lower() == partName.lower()]
+
+        if len(sections) == 0:
+            raise ValueError('No section of part %s in the template' % partName)
+
+        for d_block in sections:
+            patches.append(paramReplace(data, d_block, 'material', d_materials[partName]))
+
+    return patches
+
+def stepPatches(data, blocks, timePeriod=None, velocity=None, rampTime=None, fieldIntervals=None, historyIntervals=None):
+
+    "Patches of the step time period, the velocity amplitude and the output intervals."
+
+    patches = []
+
+    for d_block in blocks:
+
+        if d_block['keyword'] == 'dynamic' and 'explicit' in d_block['params'] and timePeriod is not None:
+            patches.append(fieldReplace(data, d_block, 1, '%.10g' % timePeriod))
+
+        if d_block['keyword'] == 'amplitude' and d_block['params'].get('name', '').lower() == 'velocityamp' and (velocity is not None or rampTime is not None):
+
+            ##Smooth step of prepp.py: zero, then up to the velocity at the ramp time, then constant
+            values = [float(value) for value in data[d_block['dataStart']:d_block['end']].replace(b'\n', b',').split(b',') if value.strip()]
+            velocityT = values[3] if velocity is None else velocity
+            rampTimeT = values[2] if rampTime is None else rampTime
+            endTime = max(values[4], timePeriod or 0.0)
+
+            patches.append((d_block['dataStart'], d_block['end'], ('%16.10g,%16.10g,%16.10g,%16.10g,%16.10g,%16.10g\n' % (0.0, 0.0, rampTimeT, velocityT, endTime, velocityT)).encode('latin-1')))
+
+        if d_block['keyword'] == 'output' and 'number interval' in d_block['params']:
+            if 'field' in d_block['params'] and fieldIntervals is not None:
+                patches.append(paramReplace(data, d_block, 'number interval', '%d' % fieldIntervals))
+            if 'history' in d_block['params'] and historyIntervals is not None:
+                patches.append(paramReplace(data, d_block, 'number interval', '%d' % historyIntervals))
+
+    return patches
+
+def variantWrite(data, patches, fileName):
+
+    "Write the template with the patches applied, copying every other byte unchanged."
+
+    f = open(fileName, 'wb')
+
+    position = 0
+    for start, end, value in sorted(patches):
+        f.write(data[position:start])
+        f.write(value)
+        position = end
+    f.write(data[position:])
+
+    f.close()
+
+def variantRead(fileName):
+
+    "Read the variants, one dictionary of non-empty values per row."
+
+    variants = []
+
+    lines = [line.strip() for line in open(fileName, 'r') if line.strip() and not line.startswith('#')]
+    keys = [key.strip() for key in lines[0].split(',')]
+
+    for line in lines[1:]:
+        d_variant = {}
+        for key, value in zip(keys, line.split(',')):
+            if value.strip():
+                d_variant[key] = value.strip()
+        variants.append(d_variant)
+
+    return variants
+
+def variantPatches(data, blocks, d_variant):
+
+    "Patches of a variant."
+
+    d_materials = {}
+    for column in d_materialColumns.keys():
+        if column in d_variant:
+            d_materials[d_materialColumns[column]] = d_variant[column]
+
+    d_step = {}
+    for column in ['timePeriod', 'velocity', 'rampTime']:
+        if column in d_variant:
+            d_step[column] = float(d_variant[column])
+    for column in ['fieldIntervals', 'historyIntervals']:
+        if column in d_variant:
+            d_step[column] = int(d_variant[column])
+
+    return materialPatches(data, blocks, d_materials)+stepPatches(data, blocks, **d_step)
+
+def inputAnalyze(inputFile):
+
+    "Count the nodes, elements by type, contact surfaces and output requests of an .inp file, streaming it line by line."
+
+    d_counts = {}
+    d_counts['nodes'] = 0
+    d_counts['elements'] = {}
+    d_counts['surfaces'] = 0
+    d_counts['contactAssignments'] = 0
+    d_counts['restartIntervals'] = 0
+    d_counts['restartOverlay'] = False
+    d_counts['fieldFrames'] = 0 # sum of the frames of field output requests, weighted by the components per node or element
+    d_counts['fieldNodal'] = 0
+    d_counts['fieldElement'] = 0
+    d_counts['historyOutputs'] = 0
+
+    #Nodes and elements of parts, counted once per instance
+    d_partNodes = {}
+    d_partElements = {}
+    instanceParts = []
+
+    part = None
+    keyword = ''
+    elementType = ''
+    continued = False
+    fieldIntervals = 0
+    d_fieldRequests = []
+
+    for line in open(inputFile, 'r'):
+
+        if line.startswith('**'):
+            continue
+
+        if line.startswith('*'):
+
+            keyword, d_params = keywordParse(line.rstrip())
+
+            if keyword == 'part':
+                part = d_params.get('name')
+                d_partNodes[part] = 0
+                d_partElements[part] = {}
+            elif keyword == 'end part':
+                part = None
+            elif keyword == 'instance':
+                instanceParts.append(d_params.get('part'))
+            elif keyword == 'element':
+                elementType = d_params.get('type', '').lower()
+            elif keyword == 'surface':
+                d_counts['surfaces'] += 1
+            elif keyword == 'restart':
+                d_counts['restartIntervals'] = int(d_params.get('number interval', '1'))
+                d_counts['restartOverlay'] = 'overlay' in d_params
+            elif keyword == 'output':
+                fieldIntervals = int(d_params.get('number interval', '1')) if 'field' in d_params else 0
+                ##Preselected variables have no data lines
+                if fieldIntervals > 0 and d_params.get('variable', '').upper() == 'PRESELECT':
+                    d_fieldRequests.append((fieldIntervals, sum([d_components.get(v, 1) for v in preselectNodal]), sum([d_components.get(v, 1) for v in preselectElement])))
+
+            continued = False
+            continue
+
+        #Data lines, an element may continue on the next line
+        if keyword == 'node':
+            if part is None:
+                d_counts['nodes'] += 1
+            else:
+                d_partNodes[part] += 1
+        elif keyword == 'element' and not continued:
+            d_elements = d_counts['elements'] if part is None else d_partElements[part]
+            d_elements[elementType] = d_elements.get(elementType, 0)+1
+        elif keyword == 'contact property assignment':
+            d_counts['contactAssignments'] += 1
+        elif keyword in ['node output', 'element output'] and fieldIntervals > 0:
+            components = sum([d_components.get(v.strip().upper(), 1) for v in line.split(',') if v.strip()])
+            d_fieldRequests.append((fieldIntervals, components if keyword == 'node output' else 0, components if keyword == 'element output' else 0))
+        elif keyword in ['node output', 'element output', 'energy output']:
+            d_counts['historyOutputs'] += len([v for v in line.split(',') if v.strip()])
+
+        continued = line.rstrip().endswith(',')
+
+    for part in instanceParts:
+        d_counts['nodes'] += d_partNodes.get(part, 0)
+        for elementType in d_partElements.get(part, {}).keys():
+            d_counts['elements'][elementType] = d_counts['elements'].get(elementType, 0)+d_partElements[part][elementType]
+
+    #Values written to the .odb file over the step, per node and per element
+    for intervals, nodal, element in d_fieldRequests:
+        d_counts['fieldNodal'] += (intervals+1)*nodal
+        d_counts['fieldElement'] += (intervals+1)*element
+        d_counts['fieldFrames'] = max(d_counts['fieldFrames'], intervals+1)
+
+    return d_counts
+
+def resourceEstimate(d_counts):
+
+    "Predict the memory and scratch disk of a job from the counts of its .inp file, in MB."
+
+    elements = sum(d_counts['elements'].values())
+
+    memory = memoryBase+memoryPerNode*d_counts['nodes']+memoryPerSurface*d_counts['surfaces']
+    for elementType in d_counts['elements'].keys():
+        memory = memory+memoryPerElement.get(elementType, max(memoryPerElement.values()))*d_counts['elements'][elementType]
+
+    #Single precision field output, and restart data of the size of the model state per interval kept
+    odb = 4.0*(d_counts['nodes']*d_counts['fieldNodal']+elements*d_counts['fieldElement'])/1024.0**2
+    restart = 0.0
+    if d_counts['restartIntervals'] > 0:
+        restart = (memory-memoryBase)*(1 if d_counts['restartOverlay'] else d_counts['restartIntervals'])
+
+    d_estimate = {}
+    d_estimate['memory'] = memory
+    d_estimate['odb'] = odb
+    d_estimate['restart'] = restart
+    d_estimate['disk'] = odb+restart+(memory-memoryBase)
+
+    return d_estimate
+
+def resourceFree(dir):
+
+    "Free physical memory of the node and free disk space of a folder, in MB."
+
+    if os.name == 'nt':
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong), ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong), ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong), ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong), ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        memory = status.ullAvailPhys
+
+        diskFree = ctypes.c_ulonglong(0)
+        ctypes.windll.kernel32.GetDiskFreeSpaceExW(ctypes.c_wchar_p(os.path.abspath(dir)), None, None, ctypes.byref(diskFree))
+        disk = diskFree.value
+
+    else:
+
+        memory = 0
+        for line in open('/proc/meminfo', 'r'):
+            if line.startswith('MemAvailable:'):
+                memory = int(line.split()[1])*1024
+
+        stat = os.statvfs(dir)
+        disk = stat.f_bavail*stat.f_frsize
+
+    return memory/1024.0**2, disk/1024.0**2
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Patching
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    t0 = time.time()
+
+    data = open(templateFileI, 'rb').read()
+    blocks = inputTree(data)
+
+    print('%s: %d keyword blocks, parsed in %.2f s' % (templateFileI, len(blocks), time.time()-t0))
+
+    d_estimate = resourceEstimate(inputAnalyze(templateFileI))
+    print('%s: %.0f MB of memory and %.0f MB of disk predicted' % (templateFileI, d_estimate['memory'], d_estimate['disk']))
+
+    variants = variantRead(variantFileI)
+
+    for d_variant in variants:
+        patches = variantPatches(data, blocks, d_variant)
+        variantWrite(data, patches, os.path.join(targetDirI, d_variant['jobName']+'.inp'))
+
+    print('%d variants written in %.2f s' % (len(variants), time.time()-t0))
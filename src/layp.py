@@ -0,0 +1,182 @@
+# Python 2/3 with NumPy, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Layout-checking script for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import numpy as np
+import sys
+import os
+
+###################################################################################################
+###################################################################################################
+#Sweep rows
+sweepFileL = "" # CSV file of sweep rows, the same as sweepFile in prepp.py, "" - sweepFile of prepp.py
+
+#Clearance
+layoutClearance = 0.0 # minimum clear distance between washers, holes and sheet edges
+
+#Result file
+resultFileL = "layout_check.csv" # clearances and violated rules of every row
+
+###################################################################################################
+###################################################################################################
+
+#Clearance rules, in the order of the report
+layoutRules = ['arrangement', 'holeOverlap', 'washerOverlap', 'holeEdge', 'washerEdge', 'washerEnd', 'partition']
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def sweepColumns(rows):
+
+    "Columns of sweep rows as arrays."
+
+    d_columns = {}
+
+    for key in ['mdbNumber', 'sheetP_Adj', 'sheetP_Nonadj', 'screwP', 'screwA_T1', 'screwA_T2', 'screwGD_L', 'screwGD_T']:
+        d_columns[key] = np.array([d_row[key] for d_row in rows], dtype=int)
+
+    for key in ['sheetL', 'sheetW', 'screwED']:
+        d_columns[key] = np.array([d_row[key] for d_row in rows], dtype=float)
+
+    return d_columns
+
+def arrangementTemplates(screwA):
+
+    "Row and column indices of the holes of every screw arrangement, padded to the most holes."
+
+    arrangements = []
+    for T1 in range(len(screwA['type'])):
+        for T2 in range(len(screwA[screwA['type'][T1]])):
+            arrangements.append((T1, T2, screwA[screwA['type'][T1]][T2]))
+
+    holeNumber = max([sum(arr) if T1 < 6 else len(arr) for T1, T2, arr in arrangements])
+
+    #Index of the template by arrangement types, -1 for missing ones
+    index = -np.ones((len(screwA['type']), max([len(screwA[t]) for t in screwA['type']])), dtype=int)
+
+    I = np.zeros((len(arrangements), holeNumber), dtype=int)
+    J = np.zeros((len(arrangements), holeNumber), dtype=int)
+    N = np.ones((len(arrangements), holeNumber), dtype=int)
+    valid = np.zeros((len(arrangements), holeNumber), dtype=bool)
+
+    for k in range(len(arrangements)):
+
+        T1, T2, arr = arrangements[k]
+        index[T1, T2] = k
+
+        #The same holes as sheet() and SCS(), one hole per row in a zigzag for type VI
+        holes = []
+        for i in range(len(arr)):
+            for j in range(arr[i] if T1 < 6 else 1):
+                holes.append((i, j, arr[i]))
+
+        for h in range(len(holes)):
+            I[k, h], J[k, h], N[k, h] = holes[h]
+            valid[k, h] = True
+
+    return index, I, J, N, valid
+
+def holeCentres(d_columns, screwC, screwA):
+
+    "Hole centres of every row, as arrays padded to the most holes, with the mask of the real holes."
+
+    index, I, J, N, valid = arrangementTemplates(screwA)
+
+    T1 = d_columns['screwA_T1']
+    T2 = d_columns['screwA_T2']
+
+    #Unknown arrangements take the first template and are rejected by the arrangement rule
+    known = (T1 >= 0) & (T1 < index.shape[0]) & (T2 >= 0) & (T2 < index.shape[1])
+    k = np.where(known, index[np.clip(T1, 0, index.shape[0]-1), np.clip(T2, 0, index.shape[1]-1)], -1)
+    known = known & (k >= 0)
+    k = np.maximum(k, 0)
+
+    dn = np.array(screwC['dn'])[d_columns['screwP']]
+    lgd = (d_columns['screwGD_L']*dn)[:, None]
+    tgd = (d_columns['screwGD_T']*dn)[:, None]
+    W = d_columns['sheetW'][:, None]
+
+    x = np.where((T1 < 6)[:, None], -W/2.0+(W-(N[k]-1)*tgd)/2.0+J[k]*tgd, -W/2.0+(W-tgd)/2.0+(I[k] % 2)*tgd)
+    y = I[k]*lgd
+
+    return x, y, valid[k], known
+
+def layoutCheck(rows, screwC, screwA, clearance=0.0):
+
+    "Check the screw layouts of all sweep rows at once against the clearance rules."
+
+    d_columns = sweepColumns(rows)
+
+    x, y, valid, known = holeCentres(d_columns, screwC, screwA)
+
+    td1 = np.array(screwC['td1'])[d_columns['screwP']]
+    dc = np.array(screwC['dc'])[d_columns['screwP']]
+    lgd = d_columns['screwGD_L']*np.array(screwC['dn'])[d_columns['screwP']]
+    ed = d_columns['screwED']
+
+    #Clear distances between hole centres, between the centres and the sheet edges, and to the sheet ends
+    distance = np.sqrt((x[:, :, None]-x[:, None, :])**2+(y[:, :, None]-y[:, None, :])**2)
+    pair = valid[:, :, None] & valid[:, None, :] & ~np.eye(x.shape[1], dtype=bool)[None, :, :]
+    minSpacing = np.where(pair, distance, np.inf).min(axis=(1, 2))
+    minEdge = np.where(valid, d_columns['sheetW'][:, None]/2.0-np.abs(x), np.inf).min(axis=1)
+
+    d_check = {}
+    d_check['holes'] = valid.sum(axis=1)
+    d_check['minSpacing'] = minSpacing
+    d_check['minEdge'] = minEdge
+    d_check['minEnd'] = ed
+
+    d_check['arrangement'] = ~known
+    d_check['holeOverlap'] = minSpacing < td1+clearance
+    d_check['washerOverlap'] = minSpacing < dc+clearance
+    d_check['holeEdge'] = minEdge < td1/2.0+clearance
+    d_check['washerEdge'] = minEdge < dc/2.0+clearance
+    d_check['washerEnd'] = ed < dc/2.0+clearance
+    ##The partitions of sheet() half a longitudinal spacing beyond the end rows must cut the sheet
+    d_check['partition'] = lgd/2.0 >= ed
+
+    d_check['feasible'] = np.ones(len(rows), dtype=bool)
+    for rule in layoutRules:
+        d_check['feasible'] = d_check['feasible'] & ~d_check[rule]
+
+    return d_check
+
+def layoutViolations(d_check, i):
+
+    "Rules violated by a row."
+
+    return [rule for rule in layoutRules if d_check[rule][i]]
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Checking
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    #Parameter database of prepp.py, imported against the stand-in of Abaqus/CAE
+    layDir = os.path.dirname(os.path.abspath("layp.py"))
+    sys.path.insert(0, layDir)
+
+    from dryp import standInInstall
+    standInInstall(layDir)
+    import prepp
+
+    rows = prepp.sweepRows(sweepFileL or prepp.sweepFile)
+    d_check = layoutCheck(rows, prepp.screwC, prepp.screwA, layoutClearance)
+
+    f = open(resultFileL, 'w')
+    f.write(','.join(['mdbNumber', 'feasible', 'holes', 'minSpacing', 'minEdge', 'minEnd', 'violations'])+'\n')
+    for i in range(len(rows)):
+        f.write('%d,%d,%d,%.4g,%.4g,%.4g,%s\n' % (rows[i]['mdbNumber'], d_check['feasible'][i], d_check['holes'][i], d_check['minSpacing'][i], d_check['minEdge'][i], d_check['minEnd'][i], ' '.join(layoutViolations(d_check, i))))
+    f.close()
+
+    for i in np.nonzero(~d_check['feasible'])[0]:
+        print('Infeasible: mdbNumber %d, %s' % (rows[i]['mdbNumber'], ', '.join(layoutViolations(d_check, i))))
+
+    print('%d of %d rows feasible' % (d_check['feasible'].sum(), len(rows)))
@@ -0,0 +1,269 @@
+# Python 2 in Abaqus, run by abaqus python
+# -*- coding: utf-8 -*-
+#
+# Exporting script from .odb files to compact files of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+from abaqusConstants import *
+from odbAccess import *
+
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath("odbp.py")))
+
+from archp import compactAppend, compactWrite
+
+###################################################################################################
+###################################################################################################
+#Directories
+sourceDirO = ".\\" # directory of the .odb files
+targetDirO = ".\\compact\\" # directory of the compact files, <odb name>.bin and <odb name>.json
+
+#Frame selection
+framePeak = 1 # 1 - export the frame of the peak load | 0 - not export
+frameFinal = 1 # 1 - export the final frame | 0 - not export
+frameEvery = 0 # export every Nth frame, 0 - not export
+
+#Region selection
+instanceSelection = ['SHEETADJPART', 'SHEETNONADJPART'] # instances to be exported, [] - all instances with elements
+cropRadius = 0.0 # keep the sheet elements within this radius around each hole, 0.0 - no cropping
+
+###################################################################################################
+###################################################################################################
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def loadHistory(o3):
+
+    "Frame times, and loads and deformations at the loading point, one frame at a time."
+
+    step = o3.steps['Step-1']
+    nodeSet = o3.rootAssembly.nodeSets['SHEETADJ_RP']
+
+    times = np.zeros(len(step.frames))
+    loads = np.zeros(len(step.frames))
+    deformations = np.zeros(len(step.frames))
+
+    for i in range(len(step.frames)):
+
+        frame = step.frames[i]
+        times[i] = frame.frameValue
+
+        if 'RF' in frame.fieldOutputs.keys():
+            loads[i] = abs(frame.fieldOutputs['RF'].getSubset(region=nodeSet).values[0].data[1])
+            deformations[i] = abs(frame.fieldOutputs['U'].getSubset(region=nodeSet).values[0].data[1])
+
+    #History output of the output-budget mode, interpolated at the frame times
+    if loads.max() == 0.0:
+        for regionName in step.historyRegions.keys():
+            if 'RF2' in step.historyRegions[regionName].historyOutputs.keys():
+                data = np.array(step.historyRegions[regionName].historyOutputs['RF2'].data)
+                loads = np.interp(times, data[:, 0], np.abs(data[:, 1]))
+            if 'U2' in step.historyRegions[regionName].historyOutputs.keys():
+                data = np.array(step.historyRegions[regionName].historyOutputs['U2'].data)
+                deformations = np.interp(times, data[:, 0], np.abs(data[:, 1]))
+
+    return times, loads, deformations
+
+def frameSelect(o3):
+
+    "Indices of the frames to be exported."
+
+    times, loads, deformations = loadHistory(o3)
+
+    d_frames = {}
+
+    if frameEvery > 0:
+        for i in range(0, len(times), frameEvery):
+            d_frames[i] = 'every'
+
+    if framePeak == 1:
+        d_frames[int(np.argmax(loads))] = 'peak'
+
+    if frameFinal == 1:
+        d_frames[len(times)-1] = 'final'
+
+    return [(i, d_frames[i], times[i], loads[i], deformations[i]) for i in sorted(d_frames.keys())]
+
+def holeCentres(o3):
+
+    "Hole centres in the x-y plane, taken as the centres of the undeformed screws."
+
+    centres = []
+
+    for instanceName in o3.rootAssembly.instances.keys():
+        if instanceName.startswith('SCREWPART-'):
+            coordinates = np.array([node.coordinates for node in o3.rootAssembly.instances[instanceName].nodes])
+            centres.append(coordinates[:, :2].mean(axis=0))
+
+    return np.array(centres).reshape(-1, 2)
+
+def meshExtract(o3):
+
+    "Nodes and elements of the selected instances, cropped around the holes."
+
+    d_mesh = {}
+    d_mesh['instances'] = []
+    d_mesh['nodeLabels'], d_mesh['coordinates'], d_mesh['elementLabels'], d_mesh['connectivity'], d_mesh['elementInstance'] = [], [], [], [], []
+    d_mesh['nodeMap'], d_mesh['elementMap'] = {}, {}
+
+    centres = holeCentres(o3)
+    nodeOffset = 0
+
+    for instanceName in sorted(o3.rootAssembly.instances.keys()):
+
+        instance = o3.rootAssembly.instances[instanceName]
+
+        if len(instance.elements) == 0 or (len(instanceSelection) > 0 and instanceName not in instanceSelection):
+            continue
+
+        labels = np.array([node.label for node in instance.nodes])
+        coordinates = np.array([node.coordinates for node in instance.nodes], dtype=np.float32)
+        nodeIndex = -np.ones(labels.max()+1, dtype=np.int64)
+        nodeIndex[labels] = np.arange(len(labels))
+
+        elementLabels = np.array([element.label for element in instance.elements])
+        connectivity = -np.ones((len(elementLabels), 8), dtype=np.int64)
+        for i in range(len(instance.elements)):
+            connectivity[i, :len(instance.elements[i].connectivity)] = nodeIndex[np.array(instance.elements[i].connectivity)]
+
+        #Crop the sheets around the holes
+        keep = np.ones(len(elementLabels), dtype=bool)
+        if cropRadius > 0.0 and len(centres) > 0 and instanceName.startswith('SHEET'):
+            centroid = np.where((connectivity >= 0)[:, :, None], coordinates[connectivity], 0.0).sum(axis=1)/(connectivity >= 0).sum(axis=1)[:, None]
+            distance = np.sqrt(((centroid[:, None, :2]-centres[None, :, :])**2).sum(axis=2))
+            keep = (distance <= cropRadius).any(axis=1)
+
+        elementLabels = elementLabels[keep]
+        connectivity = connectivity[keep]
+
+        #Keep the nodes of the kept elements
+        used = np.zeros(len(labels), dtype=bool)
+        used[connectivity[connectivity >= 0]] = True
+        renumber = -np.ones(len(labels), dtype=np.int64)
+        renumber[used] = np.arange(used.sum())+nodeOffset
+        connectivity = np.where(connectivity >= 0, renumber[np.maximum(connectivity, 0)], -1)
+
+        #Maps from labels to rows of the exported arrays, -1 for cropped entities
+        nodeMap = -np.ones(labels.max()+1, dtype=np.int64)
+        nodeMap[labels[used]] = renumber[used]
+        elementMap = -np.ones(np.max([element.label for element in instance.elements])+1, dtype=np.int64)
+        elementMap[elementLabels] = np.arange(len(elementLabels))+sum([len(e) for e in d_mesh['elementLabels']])
+
+        d_mesh['instances'].append(instanceName)
+        d_mesh['nodeLabels'].append(labels[used])
+        d_mesh['coordinates'].append(coordinates[used])
+        d_mesh['elementLabels'].append(elementLabels)
+        d_mesh['connectivity'].append(connectivity)
+        d_mesh['elementInstance'].append(np.zeros(len(elementLabels), dtype=np.int32)+len(d_mesh['instances'])-1)
+        d_mesh['nodeMap'][instanceName] = nodeMap
+        d_mesh['elementMap'][instanceName] = elementMap
+
+        nodeOffset = nodeOffset + used.sum()
+
+    d_mesh['centres'] = centres
+
+    return d_mesh
+
+def frameExtract(frame, d_mesh, nodeNumber, elementNumber):
+
+    "Displacement, Mises stress and status of a frame on the exported mesh."
+
+    U = np.zeros((nodeNumber, 3), dtype=np.float32)
+    mises = np.zeros(elementNumber)
+    count = np.zeros(elementNumber)
+    status = np.ones(elementNumber, dtype=np.float32)
+
+    for block in frame.fieldOutputs['U'].bulkDataBlocks:
+        if block.instance is not None and block.instance.name in d_mesh['nodeMap']:
+            index = d_mesh['nodeMap'][block.instance.name][np.array(block.nodeLabels)]
+            U[index[index >= 0]] = np.array(block.data, dtype=np.float32)[index >= 0, :3]
+
+    for block in frame.fieldOutputs['S'].getScalarField(invariant=MISES).bulkDataBlocks:
+        if block.instance is not None and block.instance.name in d_mesh['elementMap']:
+            index = d_mesh['elementMap'][block.instance.name][np.array(block.elementLabels)]
+            mises += np.bincount(index[index >= 0], weights=np.array(block.data, dtype=float)[index >= 0, 0], minlength=elementNumber)
+            count += np.bincount(index[index >= 0], minlength=elementNumber)
+
+    if 'STATUS' in frame.fieldOutputs.keys():
+        for block in frame.fieldOutputs['STATUS'].bulkDataBlocks:
+            if block.instance is not None and block.instance.name in d_mesh['elementMap']:
+                index = d_mesh['elementMap'][block.instance.name][np.array(block.elementLabels)]
+                status[index[index >= 0]] = np.array(block.data, dtype=np.float32)[index >= 0, 0]
+
+    return U, (mises/np.maximum(count, 1.0)).astype(np.float32), status
+
+def compactExport(odbName, targetDir):
+
+    "Stream the mesh and the selected frames of an .odb file into a compact file."
+
+    o3 = openOdb(path=odbName+'.odb', readOnly=True)
+
+    fileName = os.path.join(targetDir, os.path.basename(odbName))
+    f = open(fileName+'.bin', 'wb')
+
+    d_header = {}
+    d_header['odb'] = os.path.basename(odbName)
+    d_header['arrays'] = {}
+    d_header['frames'] = []
+    d_header['cropRadius'] = cropRadius
+
+    #Mesh
+    d_mesh = meshExtract(o3)
+    d_header['instances'] = d_mesh['instances']
+
+    compactAppend(f, d_header, 'nodeLabels', np.concatenate(d_mesh['nodeLabels']).astype(np.int32))
+    compactAppend(f, d_header, 'coordinates', np.concatenate(d_mesh['coordinates']).astype(np.float32))
+    compactAppend(f, d_header, 'elementLabels', np.concatenate(d_mesh['elementLabels']).astype(np.int32))
+    compactAppend(f, d_header, 'connectivity', np.concatenate(d_mesh['connectivity']).astype(np.int32))
+    compactAppend(f, d_header, 'elementInstance', np.concatenate(d_mesh['elementInstance']))
+    compactAppend(f, d_header, 'holeCentres', d_mesh['centres'].astype(np.float32))
+
+    nodeNumber = d_header['arrays']['coordinates'][2][0]
+    elementNumber = d_header['arrays']['connectivity'][2][0]
+
+    #Frames, one at a time
+    for i, kind, time, load, deformation in frameSelect(o3):
+
+        U, mises, status = frameExtract(o3.steps['Step-1'].frames[i], d_mesh, nodeNumber, elementNumber)
+
+        key = 'frame%04d' % i
+        compactAppend(f, d_header, key+'/U', U)
+        compactAppend(f, d_header, key+'/mises', mises)
+        compactAppend(f, d_header, key+'/status', status)
+        d_header['frames'].append({'key': key, 'index': i, 'kind': kind, 'time': float(time), 'load': float(load), 'deformation': float(deformation)})
+
+    f.close()
+    o3.close()
+
+    compactWrite(fileName, d_header)
+
+    return fileName
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Exporting
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    if not os.path.exists(targetDirO):
+        os.makedirs(targetDirO)
+
+    for f in sorted(os.listdir(sourceDirO)):
+
+        if f.endswith('.odb'):
+
+            odbName = os.path.join(sourceDirO, f[:-len('.odb')])
+            headerFile = os.path.join(targetDirO, f[:-len('.odb')]+'.json')
+
+            #Export the .odb files that are not exported yet or have changed since
+            if not os.path.exists(headerFile) or os.path.getmtime(headerFile) < os.path.getmtime(odbName+'.odb'):
+                compactExport(odbName=odbName, targetDir=targetDirO)
+                print('%s exported' % f)
@@ -16,17 +16,54 @@ from visualization import *
 
 from multiprocessing import cpu_count
 from math import *
+import threading
+import traceback
+import time
+import sys
 import os
 
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
 ###################################################################################################
 ###################################################################################################
 #Change processing mode
 switchMode = 3 # 1 - Submit job | 2 - Export result | 3 - Submit job & Export result
 
+#Pipelining
+pipelineOrNot = 0 # 1 - with switchMode = 3, submit the next job as soon as the previous one is solved and export the previous one meanwhile, while a worker thread caches and copies the exported jobs | 0 - one job after another
+
 #Copy files
 copyOrNot  = 0 # 1 - copy resulting files | 0 - not copy resulting files
 targetDirM = "E:\\sync\\" # target directory for copying files
 
+#Export contours
+contourMode = 1 # 1 - print contours in the viewport | 2 - no contours in the export, rendered by rendp.py from the compact files of odbp.py
+
+#Incremental export
+exportArtifacts = ['energy', 'curve', 'contour'] # artifacts exported from each .odb file: 'energy' - ALLKE/ALLIE curve | 'curve' - U2-RF2 curve | 'contour' - Mises contour
+exportIncremental = 1 # 1 - export only the artifacts missing or older than the .odb file | 0 - export every artifact again
+
+#Profiling
+profileOrNot = 0 # 1 - time the import, submission, waiting, export and copying of each job, summarized by profp.py | 0 - not profile
+profileFile = "profile.jsonl" # profile records, one per job
+
+#Result cache
+cacheOrNot = 0 # 1 - reuse the results of physically identical jobs from cacheDirM and store new ones there, see cachep.py | 0 - no cache
+cacheDirM = "E:\\cache\\" # cache shared across campaigns
+cacheOdb = 0 # 1 - also cache .odb files | 0 - cache the exported curves and contours only
+
+#Admission control
+admissionOrNot = 0 # 1 - give each job the memory predicted from its .inp file by inpp.py, and submit it only when its memory and disk fit the free resources of the node | 0 - 90 percent of the memory for every job
+admissionMargin = 1.5 # safety factor on the predicted memory and disk
+admissionTimeout = 3600 # time waited for free resources before the job is put at the end of the queue, and skipped at its second timeout, s
+
+#Restart
+restartOrNot = 0 # 1 - resume interrupted jobs from their last restart point, written with restartIntervals > 0 in prepp.py | 0 - solve every job from the start
+restartStale = 1800 # time without any write to the .sta and .lck files of a job before it counts as interrupted rather than still solved, longer than the longest increment report interval, s
+
 ###################################################################################################
 ###################################################################################################
 
@@ -68,193 +105,507 @@ def copyFiles(sourceDir, targetDir):
                 if os.path.isdir(sourceF):
                     copyFiles(sourceF, targetF)
 
+def inputAppend(jobNames, sourceDir):
+
+    "Append the names of .inp files added to the folder meanwhile."
+
+    for f in os.listdir(sourceDir):
+
+        fSplit = f.split('.')
+
+        if len(fSplit) == 2 and fSplit[1] == 'inp' and fSplit[0] not in jobNames:
+            jobNames.append(fSplit[0])
+
 currentPath = os.path.abspath("postp.py")
 sourceDirM = os.path.abspath(os.path.dirname(currentPath) + os.path.sep + ".")
 pathSplit = sourceDirM.split('\\')
 caeNameM = pathSplit[-1]+".cae"
 
+#Import the profiling script from the same folder
+sys.path.insert(0, sourceDirM)
+from profp import profileStart, profileMark, profileWrite, inputCounts
+from cachep import cacheSuffixes, cacheLookup, cacheStore, cacheRestore
+from inpp import inputAnalyze, resourceEstimate, resourceFree
+
 #Set the working directory
-mkdir(sourceDirM)
-mdb.saveAs(pathName=sourceDirM+"\\"+caeNameM) 
+if __name__ == '__main__':
+    mkdir(sourceDirM)
+    mdb.saveAs(pathName=sourceDirM+"\\"+caeNameM) 
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Functions
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def jobSubmit(jobName, numberOfUsedCores):
+def jobInterrupted(jobName):
+
+    "Whether a job stopped without finishing or failing, e.g. killed by a reboot, after writing restart data."
+
+    if not os.path.isfile(jobName+'.sta') or not os.path.isfile(jobName+'.res'):
+        return False
+
+    #A job still solved, e.g. by another campaign on the node, keeps its status and lock files fresh
+    for suffix in ['.sta', '.lck']:
+        if os.path.isfile(jobName+suffix) and time.time()-os.path.getmtime(jobName+suffix) < restartStale:
+            return False
+
+    #A job ended by an error would only fail again
+    f = open(jobName+'.sta', 'r')
+    sta = f.read()
+    f.close()
+
+    return 'HAS COMPLETED SUCCESSFULLY' not in sta and 'HAS NOT BEEN COMPLETED' not in sta
+
+def jobAdmit(jobName, d_profile=None):
+
+    "Wait until the memory and disk predicted for a job are free on the node, returning its memory settings, or None after admissionTimeout."
+
+    d_estimate = resourceEstimate(inputAnalyze(jobName+'.inp'))
+    memory = d_estimate['memory']*admissionMargin
+    disk = d_estimate['disk']*admissionMargin
+
+    t0 = time.time()
+    memoryFree, diskFree = resourceFree(sourceDirM)
+
+    #Jobs of other campaigns on the node release their resources when they finish
+    while (memoryFree < memory or diskFree < disk) and time.time()-t0 < admissionTimeout:
+        print('Wait for %s: %.0f/%.0f MB of memory and %.0f/%.0f MB of disk free' % (jobName, memoryFree, memory, diskFree, disk))
+        time.sleep(60)
+        memoryFree, diskFree = resourceFree(sourceDirM)
+
+    profileMark(d_profile, 'admit')
+
+    if memoryFree < memory or diskFree < disk:
+        return None
 
-    "Submit job."
+    return int(ceil(memory)), MEGA_BYTES
 
-    #Import inp file
-    mdb.ModelFromInputFile(name=jobName, inputFileName=jobName+'.inp')
+def jobSubmit(jobName, numberOfUsedCores, d_profile=None, wait=True):
 
-    #Recreate job
-    mdb.Job(name=jobName, model=jobName, description='', type=ANALYSIS, atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=90, memoryUnits=PERCENTAGE, getMemoryFromAnalysis=True, explicitPrecision=SINGLE, nodalOutputPrecision=SINGLE, echoPrint=OFF, modelPrint=OFF, contactPrint=OFF, historyPrint=OFF, userSubroutine='', scratch='', multiprocessingMode=DEFAULT, numCpus=numberOfUsedCores, numDomains=numberOfUsedCores, numGPUs=0) 
+    "Submit job, returning whether it was admitted."
+
+    #Memory of the solver
+    memory, memoryUnits = 90, PERCENTAGE
+    if admissionOrNot == 1:
+        admitted = jobAdmit(jobName, d_profile)
+        if admitted is None:
+            return False
+        memory, memoryUnits = admitted
+
+    if restartOrNot == 1 and jobInterrupted(jobName):
+
+        #Resume from the last restart point, so that only the lost portion is recomputed
+        print('Resume %s from its restart data' % jobName)
+
+        ##Lock file left by the interrupted analysis, stale as checked by jobInterrupted()
+        if os.path.isfile(jobName+'.lck'):
+            os.remove(jobName+'.lck')
+
+        mdb.JobFromInputFile(name=jobName, inputFileName=jobName+'.inp', type=RECOVER, atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=memory, memoryUnits=memoryUnits, getMemoryFromAnalysis=True, explicitPrecision=SINGLE, nodalOutputPrecision=SINGLE, userSubroutine='', scratch='', multiprocessingMode=DEFAULT, numCpus=numberOfUsedCores, numDomains=numberOfUsedCores, numGPUs=0)
+        profileMark(d_profile, 'job')
+
+    else:
+
+        #Import inp file
+        mdb.ModelFromInputFile(name=jobName, inputFileName=jobName+'.inp')
+        profileMark(d_profile, 'import')
+
+        #Recreate job
+        mdb.Job(name=jobName, model=jobName, description='', type=ANALYSIS, atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=memory, memoryUnits=memoryUnits, getMemoryFromAnalysis=True, explicitPrecision=SINGLE, nodalOutputPrecision=SINGLE, echoPrint=OFF, modelPrint=OFF, contactPrint=OFF, historyPrint=OFF, userSubroutine='', scratch='', multiprocessingMode=DEFAULT, numCpus=numberOfUsedCores, numDomains=numberOfUsedCores, numGPUs=0) 
+        profileMark(d_profile, 'job')
         
     #Submit job
     mdb.jobs[jobName].submit()
+    profileMark(d_profile, 'submit')
+
+    ##The solver runs in its own process, waited for later when pipelined
+    if not wait:
+        return True
+
     mdb.jobs[jobName].waitForCompletion()
+    profileMark(d_profile, 'wait')
+
+    return True
+
+def jobRequeue(jobNames, i, skipped):
+
+    "Put a job not admitted at the end of the queue, or skip it if it was not admitted before either, so that the jobs behind it go on."
+
+    if jobNames[i] in jobNames[:i]:
+        print('Skip %s, not fitting the free resources of the node after %d s twice' % (jobNames[i], admissionTimeout))
+        skipped.append(jobNames[i])
+        return
+
+    print('Requeue %s, not fitting the free resources of the node after %d s' % (jobNames[i], admissionTimeout))
+    jobNames.append(jobNames[i])
+
+def artifactStale(odbName):
+
+    "Artifacts of exportArtifacts missing or older than the .odb file."
+
+    d_artifacts = {}
+    d_artifacts['energy'] = '_ALLKE-ALLIE.rpt'
+    d_artifacts['curve'] = '_U2-RF2.rpt'
+    d_artifacts['contour'] = '_Mises.png'
+
+    #Contours of contourMode = 2 are rendered outside the export
+    artifacts = [artifact for artifact in exportArtifacts if artifact != 'contour' or contourMode != 2]
+
+    if exportIncremental != 1:
+        return artifacts
+
+    odbTime = os.path.getmtime(odbName+'.odb')
+
+    return [artifact for artifact in artifacts if not os.path.isfile(odbName+d_artifacts[artifact]) or os.path.getmtime(odbName+d_artifacts[artifact]) < odbTime]
+
+def cacheReuse(jobName, required=[], d_profile=None):
+
+    "Restore the results of a physically identical job from the cache, returning whether they were found with the required files."
+
+    if cacheOrNot != 1 or not os.path.isfile(jobName+'.inp'):
+        return False
+
+    d_entry = cacheLookup(jobName+'.inp', cacheDirM)
+
+    if d_entry is None or len([suffix for suffix in required if suffix not in d_entry['files']]) > 0:
+        return False
+
+    cacheRestore(d_entry, jobName, sourceDirM, cacheDirM)
+    profileMark(d_profile, 'cache')
 
-def resultExport(odbName):
+    return True
+
+def cacheSave(jobName, d_profile=None):
+
+    "Store the results of a job in the cache."
+
+    if cacheOrNot != 1 or not os.path.isfile(jobName+'.inp'):
+        return
+
+    cacheStore(jobName, sourceDirM, cacheDirM, [suffix for suffix in cacheSuffixes if cacheOdb == 1 or suffix != '.odb'])
+    profileMark(d_profile, 'cache')
+
+def resultExport(odbName, d_profile=None, artifacts=None):
 
     "Export result."
 
+    if artifacts is None:
+        artifacts = list(exportArtifacts)
+
     #Open odb file
     o3 = session.openOdb(name=odbName, path=odbName+'.odb', readOnly=True)
 
     #Export ALLKE/ALLIE versus step curve
-    ##Export variables
-    session.viewports['Viewport: 1'].setValues(displayedObject=o3)
-    session.XYDataFromHistory(name='ALLIE', odb=session.odbs[odbName+'.odb'], outputVariableName='Internal energy: ALLIE for Whole Model', steps=('Step-1', ), )
-    session.XYDataFromHistory(name='ALLKE', odb=session.odbs[odbName+'.odb'], outputVariableName='Kinetic energy: ALLKE for Whole Model', steps=('Step-1', ), )
-
-    ##Generate curve
-    xy0 = session.xyDataObjects['ALLKE']/session.xyDataObjects['ALLIE']
-    xy0.setValues(sourceDescription='"ALLKE" / "ALLIE"')
-    session.xyDataObjects.changeKey(xy0.name, odbName+'_ALLKE-ALLIE')
+    if 'energy' in artifacts:
+
+        ##Export variables
+        session.viewports['Viewport: 1'].setValues(displayedObject=o3)
+        session.XYDataFromHistory(name='ALLIE', odb=session.odbs[odbName+'.odb'], outputVariableName='Internal energy: ALLIE for Whole Model', steps=('Step-1', ), )
+        session.XYDataFromHistory(name='ALLKE', odb=session.odbs[odbName+'.odb'], outputVariableName='Kinetic energy: ALLKE for Whole Model', steps=('Step-1', ), )
+
+        ##Generate curve
+        xy0 = session.xyDataObjects['ALLKE']/session.xyDataObjects['ALLIE']
+        xy0.setValues(sourceDescription='"ALLKE" / "ALLIE"')
+        session.xyDataObjects.changeKey(xy0.name, odbName+'_ALLKE-ALLIE')
     
-    ##Export curve
-    x0 = session.xyDataObjects[odbName+'_ALLKE-ALLIE']
-    session.xyReportOptions.setValues(numberFormat=SCIENTIFIC, minMax=ON, layout=SEPARATE_TABLES)
-    session.writeXYReport(fileName=odbName+'_ALLKE-ALLIE.rpt', xyData=(x0, ))
-
-    ##Clear data
-    del session.xyDataObjects['XYData-1']
-    del session.xyDataObjects['XYData-2']
-    del session.xyDataObjects[odbName+'_ALLKE-ALLIE']
+        ##Export curve
+        x0 = session.xyDataObjects[odbName+'_ALLKE-ALLIE']
+        session.xyReportOptions.setValues(numberFormat=SCIENTIFIC, minMax=ON, layout=SEPARATE_TABLES)
+        session.writeXYReport(fileName=odbName+'_ALLKE-ALLIE.rpt', xyData=(x0, ))
+
+        ##Clear data
+        del session.xyDataObjects['XYData-1']
+        del session.xyDataObjects['XYData-2']
+        del session.xyDataObjects[odbName+'_ALLKE-ALLIE']
+        profileMark(d_profile, 'energy')
     
     #Export RF2 versus U2 curves
-    ##Export variables
-    session.viewports['Viewport: 1'].setValues(displayedObject=o3)
-    session.xyDataListFromField(odb=session.odbs[odbName+'.odb'], outputPosition=NODAL, variable=(('RF', NODAL, ((COMPONENT, 'RF2'), )), ('U', NODAL, ((COMPONENT, 'U2'), )), ), nodeSets=('SHEETADJ_RP', ))
-
-    ##Generate curve
-    xy0 = combine(session.xyDataObjects['U:U2 PI: SHEETADJPART N: 1'], session.xyDataObjects['RF:RF2 PI: SHEETADJPART N: 1'])
-    xy0.setValues(sourceDescription='combine ( "U:U2 PI: SHEETADJPART N: 1", "RF:RF2 PI: SHEETADJPART N: 1" )')
-    session.xyDataObjects.changeKey(xy0.name, odbName+'_U2-RF2')
-
-    ##Export curve
-    x0 = session.xyDataObjects[odbName+'_U2-RF2']
-    session.xyReportOptions.setValues(numberFormat=SCIENTIFIC, minMax=ON, layout=SEPARATE_TABLES)
-    session.writeXYReport(fileName=odbName+'_U2-RF2.rpt', xyData=(x0, ))
-
-    ##Clear data
-    del session.xyDataObjects['U:U2 PI: SHEETADJPART N: 1']
-    del session.xyDataObjects['RF:RF2 PI: SHEETADJPART N: 1']
-    del session.xyDataObjects[odbName+'_U2-RF2']
-
-    #Set options
-    session.View(name='User-1', nearPlane=950.0, farPlane=1050.0, width=70.0, height=30.0, projection=PERSPECTIVE, cameraPosition=(1000.0, 0.0, 0.0), cameraUpVector=(0.0, 0.0, 1.0), cameraTarget=(0.0, 0.0, 0.0), viewOffsetX=-1.0, viewOffsetY=-6.0, autoFit=OFF)
-    session.viewports['Viewport: 1'].view.setValues(session.views['User-1'])
-    session.viewports['Viewport: 1'].odbDisplay.setValues(viewCut=ON)    
-    session.viewports['Viewport: 1'].odbDisplay.display.setValues(plotState=(CONTOURS_ON_DEF, ))
-    session.viewports['Viewport: 1'].odbDisplay.commonOptions.setValues(visibleEdges=FEATURE)
-    session.viewports['Viewport: 1'].viewportAnnotationOptions.setValues(triadFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*', legendFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*', titleFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*', stateFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*')
+    if 'curve' in artifacts:
+
+        ##History output at the loading point, requested by prepp.py with outputBudget = 1
+        historyRP = None
+        for regionName in o3.steps['Step-1'].historyRegions.keys():
+            if 'U2' in o3.steps['Step-1'].historyRegions[regionName].historyOutputs.keys() and 'RF2' in o3.steps['Step-1'].historyRegions[regionName].historyOutputs.keys():
+                historyRP = o3.steps['Step-1'].historyRegions[regionName].historyOutputs
+
+        if historyRP is not None:
+
+            ##Generate curve
+            data = []
+            for i in range(min(len(historyRP['U2'].data), len(historyRP['RF2'].data))):
+                data.append((historyRP['U2'].data[i][1], historyRP['RF2'].data[i][1]))
+            xy0 = session.XYData(name=odbName+'_U2-RF2', data=data, sourceDescription='history output U2 and RF2 at SHEETADJ_RP')
+
+            ##Export curve
+            x0 = session.xyDataObjects[odbName+'_U2-RF2']
+            session.xyReportOptions.setValues(numberFormat=SCIENTIFIC, minMax=ON, layout=SEPARATE_TABLES)
+            session.writeXYReport(fileName=odbName+'_U2-RF2.rpt', xyData=(x0, ))
+
+            ##Clear data
+            del session.xyDataObjects[odbName+'_U2-RF2']
+
+        else:
+
+            ##Export variables
+            session.viewports['Viewport: 1'].setValues(displayedObject=o3)
+            session.xyDataListFromField(odb=session.odbs[odbName+'.odb'], outputPosition=NODAL, variable=(('RF', NODAL, ((COMPONENT, 'RF2'), )), ('U', NODAL, ((COMPONENT, 'U2'), )), ), nodeSets=('SHEETADJ_RP', ))
+
+            ##Generate curve
+            xy0 = combine(session.xyDataObjects['U:U2 PI: SHEETADJPART N: 1'], session.xyDataObjects['RF:RF2 PI: SHEETADJPART N: 1'])
+            xy0.setValues(sourceDescription='combine ( "U:U2 PI: SHEETADJPART N: 1", "RF:RF2 PI: SHEETADJPART N: 1" )')
+            session.xyDataObjects.changeKey(xy0.name, odbName+'_U2-RF2')
+
+            ##Export curve
+            x0 = session.xyDataObjects[odbName+'_U2-RF2']
+            session.xyReportOptions.setValues(numberFormat=SCIENTIFIC, minMax=ON, layout=SEPARATE_TABLES)
+            session.writeXYReport(fileName=odbName+'_U2-RF2.rpt', xyData=(x0, ))
+
+            ##Clear data
+            del session.xyDataObjects['U:U2 PI: SHEETADJPART N: 1']
+            del session.xyDataObjects['RF:RF2 PI: SHEETADJPART N: 1']
+            del session.xyDataObjects[odbName+'_U2-RF2']
+
+        profileMark(d_profile, 'curve')
 
     #Export contour
-    session.printToFile(fileName=odbName+'_Mises', format=PNG, canvasObjects=(session.viewports['Viewport: 1'], ))
+    if 'contour' in artifacts and contourMode != 2:
+
+        ##Set options
+        session.View(name='User-1', nearPlane=950.0, farPlane=1050.0, width=70.0, height=30.0, projection=PERSPECTIVE, cameraPosition=(1000.0, 0.0, 0.0), cameraUpVector=(0.0, 0.0, 1.0), cameraTarget=(0.0, 0.0, 0.0), viewOffsetX=-1.0, viewOffsetY=-6.0, autoFit=OFF)
+        session.viewports['Viewport: 1'].view.setValues(session.views['User-1'])
+        session.viewports['Viewport: 1'].odbDisplay.setValues(viewCut=ON)    
+        session.viewports['Viewport: 1'].odbDisplay.display.setValues(plotState=(CONTOURS_ON_DEF, ))
+        session.viewports['Viewport: 1'].odbDisplay.commonOptions.setValues(visibleEdges=FEATURE)
+        session.viewports['Viewport: 1'].viewportAnnotationOptions.setValues(triadFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*', legendFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*', titleFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*', stateFont='-*-times new roman-medium-r-normal-*-*-180-*-*-p-*-*-*')
+
+        ##Export contour
+        session.printToFile(fileName=odbName+'_Mises', format=PNG, canvasObjects=(session.viewports['Viewport: 1'], ))
+        profileMark(d_profile, 'contour')
 
     #Close odb file
     o3.close()
 
+def storeWorker(tasks):
+
+    "Cache and copy the exported jobs of a queue in order, until None is queued."
+
+    while True:
+
+        task = tasks.get()
+        if task is None:
+            break
+
+        jobName, d_profile, exported = task
+
+        #Only files are handled here, as the session and mdb objects are not thread-safe
+        try:
+            if exported:
+                cacheSave(jobName=jobName, d_profile=d_profile)
+
+            if copyOrNot == 1:
+                copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+                profileMark(d_profile, 'copy')
+
+            if d_profile is not None:
+                profileWrite(d_profile, os.path.join(sourceDirM, profileFile), jobName, inputCounts(jobName+'.inp'))
+
+        except Exception:
+            print('Storing %s failed' % jobName)
+            traceback.print_exc()
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Computation and Analysis
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-d_jobs = {}
-d_jobs['inp'] = []
-d_jobs['odb'] = []
-filesName = os.listdir(sourceDirM)
+if __name__ == '__main__':
 
-for i in range(len(filesName)):
+    d_jobs = {}
+    d_jobs['inp'] = []
+    d_jobs['odb'] = []
+    d_jobs['skipped'] = []
+    filesName = os.listdir(sourceDirM)
+
+    for i in range(len(filesName)):
     
-    filesNameSplit = filesName[i].split('.')
+        filesNameSplit = filesName[i].split('.')
 
-    if len(filesNameSplit) == 2:
-        #Access inp files' name
-        if filesNameSplit[1] == 'inp':
-            d_jobs['inp'].append(filesNameSplit[0])
-        if filesNameSplit[1] == 'odb':
-            d_jobs['odb'].append(filesNameSplit[0])
+        if len(filesNameSplit) == 2:
+            #Access inp files' name
+            if filesNameSplit[1] == 'inp':
+                d_jobs['inp'].append(filesNameSplit[0])
+            if filesNameSplit[1] == 'odb':
+                d_jobs['odb'].append(filesNameSplit[0])
 
 
-if switchMode == 1:
+    if switchMode == 1:
     
-    i = 0
-    while len(d_jobs['inp']) >= i+1:
+        i = 0
+        while len(d_jobs['inp']) >= i+1:
 
-        #Submit jobs
-        jobSubmit(jobName=d_jobs['inp'][i], numberOfUsedCores=cpu_count()-1)
+            d_profile = profileStart('postp') if profileOrNot == 1 else None
 
-        #Copy files
-        if copyOrNot == 1:
-            copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+            #Submit jobs, unless solved by another campaign
+            if not cacheReuse(jobName=d_jobs['inp'][i], d_profile=d_profile):
+                if jobSubmit(jobName=d_jobs['inp'][i], numberOfUsedCores=cpu_count()-1, d_profile=d_profile):
+                    cacheSave(jobName=d_jobs['inp'][i], d_profile=d_profile)
+                else:
+                    jobRequeue(d_jobs['inp'], i, d_jobs['skipped'])
 
-        i = i + 1
+            #Copy files
+            if copyOrNot == 1:
+                copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+                profileMark(d_profile, 'copy')
 
-        filesName = os.listdir(sourceDirM)
+            if d_profile is not None:
+                profileWrite(d_profile, os.path.join(sourceDirM, profileFile), d_jobs['inp'][i], inputCounts(d_jobs['inp'][i]+'.inp'))
 
-        for j in range(len(filesName)):
+            i = i + 1
 
-            filesNameSplit = filesName[j].split('.')
+            filesName = os.listdir(sourceDirM)
 
-            if len(filesNameSplit) == 2:
-                #Access inp files' name
-                if filesNameSplit[1] == 'inp':
+            for j in range(len(filesName)):
+
+                filesNameSplit = filesName[j].split('.')
+
+                if len(filesNameSplit) == 2:
+                    #Access inp files' name
+                    if filesNameSplit[1] == 'inp':
                     
-                    signal = 0
+                        signal = 0
                     
-                    for k in range(len(d_jobs['inp'])):
-                        if d_jobs['inp'][k] == filesNameSplit[0]:
-                            signal = signal+1
+                        for k in range(len(d_jobs['inp'])):
+                            if d_jobs['inp'][k] == filesNameSplit[0]:
+                                signal = signal+1
+
+                        if signal == 0:
+                            d_jobs['inp'].append(filesNameSplit[0])
+
+    if switchMode == 2:
+        for i in range(len(d_jobs['odb'])):
+
+            d_profile = profileStart('postp') if profileOrNot == 1 else None
+
+            #Export the missing or stale results only
+            artifacts = artifactStale(odbName=d_jobs['odb'][i])
+
+            if len(artifacts) == 0:
+                continue
+
+            print('Export %s: %s' % (d_jobs['odb'][i], ', '.join(artifacts)))
+            resultExport(odbName=d_jobs['odb'][i], d_profile=d_profile, artifacts=artifacts)
+            cacheSave(jobName=d_jobs['odb'][i], d_profile=d_profile)
+
+            #Copy files
+            if copyOrNot == 1:
+                copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+                profileMark(d_profile, 'copy')
+
+            if d_profile is not None:
+                profileWrite(d_profile, os.path.join(sourceDirM, profileFile), d_jobs['odb'][i], inputCounts(d_jobs['odb'][i]+'.inp'))
 
-                    if signal == 0:
-                        d_jobs['inp'].append(filesNameSplit[0])
+    if switchMode == 3 and pipelineOrNot == 1:
 
-if switchMode == 2:
-    for i in range(len(d_jobs['odb'])):
+        #Solved jobs exported in the kernel thread while the next one is solved, then cached and copied by a worker thread
+        tasks = Queue()
+        worker = threading.Thread(target=storeWorker, args=(tasks, ))
+        worker.start()
 
-        #Export results
-        resultExport(odbName=d_jobs['odb'][i])
+        #The worker finishes the queued jobs even if the loop stops on an error
+        try:
+            #Job being solved, with its profile
+            solving = None
 
-        #Copy files
-        if copyOrNot == 1:
-            copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+            i = 0
+            while len(d_jobs['inp']) >= i+1 or solving is not None:
 
-if switchMode == 3:
+                ##Wait for the job being solved
+                finished = solving
+                solving = None
 
-    i = 0
-    while len(d_jobs['inp']) >= i+1:
+                if finished is not None:
+                    mdb.jobs[finished[0]].waitForCompletion()
+                    profileMark(finished[1], 'wait')
 
-        #Submit jobs
-        jobSubmit(jobName=d_jobs['inp'][i], numberOfUsedCores=cpu_count()-1) 
+                inputAppend(d_jobs['inp'], sourceDirM)
 
-        #Export results
-        resultExport(odbName=d_jobs['inp'][i])
+                ##Submit the next job before exporting the finished one, so that the solver never waits for post-processing, the jobs restored from the cache only copied by the worker
+                while len(d_jobs['inp']) >= i+1 and solving is None:
 
-        #Copy files
-        if copyOrNot == 1:
-            copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+                    d_profile = profileStart('postp') if profileOrNot == 1 else None
 
-        i = i + 1
+                    if not cacheReuse(jobName=d_jobs['inp'][i], required=['_U2-RF2.rpt'], d_profile=d_profile):
+                        if jobSubmit(jobName=d_jobs['inp'][i], numberOfUsedCores=cpu_count()-1, d_profile=d_profile, wait=False):
+                            solving = (d_jobs['inp'][i], d_profile)
+                        else:
+                            jobRequeue(d_jobs['inp'], i, d_jobs['skipped'])
+                    else:
+                        tasks.put((d_jobs['inp'][i], d_profile, False))
 
-        filesName = os.listdir(sourceDirM)
+                    i = i + 1
 
-        for j in range(len(filesName)):
+                ##Export the finished job while the next one is solved, a failed export reported and not cached
+                if finished is not None:
 
-            filesNameSplit = filesName[j].split('.')
+                    ###The submission of the next job is not part of the export time
+                    profileMark(finished[1], 'wait', t0=time.time())
 
-            if len(filesNameSplit) == 2:
-                #Access inp files' name
-                if filesNameSplit[1] == 'inp':
+                    try:
+                        resultExport(odbName=finished[0], d_profile=finished[1], artifacts=artifactStale(odbName=finished[0]))
+                        tasks.put((finished[0], finished[1], True))
+                    except Exception:
+                        print('Export of %s failed' % finished[0])
+                        traceback.print_exc()
+                        tasks.put((finished[0], finished[1], False))
+
+        finally:
+            tasks.put(None)
+            worker.join()
+
+    if switchMode == 3 and pipelineOrNot != 1:
+
+        i = 0
+        while len(d_jobs['inp']) >= i+1:
+
+            d_profile = profileStart('postp') if profileOrNot == 1 else None
+
+            #Submit jobs and export results, unless solved and exported by another campaign
+            if not cacheReuse(jobName=d_jobs['inp'][i], required=['_U2-RF2.rpt'], d_profile=d_profile):
+                if jobSubmit(jobName=d_jobs['inp'][i], numberOfUsedCores=cpu_count()-1, d_profile=d_profile):
+                    resultExport(odbName=d_jobs['inp'][i], d_profile=d_profile, artifacts=artifactStale(odbName=d_jobs['inp'][i]))
+                    cacheSave(jobName=d_jobs['inp'][i], d_profile=d_profile)
+                else:
+                    jobRequeue(d_jobs['inp'], i, d_jobs['skipped'])
+
+            #Copy files
+            if copyOrNot == 1:
+                copyFiles(sourceDir=sourceDirM, targetDir=targetDirM+pathSplit[-1])
+                profileMark(d_profile, 'copy')
+
+            if d_profile is not None:
+                profileWrite(d_profile, os.path.join(sourceDirM, profileFile), d_jobs['inp'][i], inputCounts(d_jobs['inp'][i]+'.inp'))
+
+            i = i + 1
+
+            filesName = os.listdir(sourceDirM)
+
+            for j in range(len(filesName)):
+
+                filesNameSplit = filesName[j].split('.')
+
+                if len(filesNameSplit) == 2:
+                    #Access inp files' name
+                    if filesNameSplit[1] == 'inp':
                     
-                    signal = 0
+                        signal = 0
                     
-                    for k in range(len(d_jobs['inp'])):
-                        if d_jobs['inp'][k] == filesNameSplit[0]:
-                            signal = signal+1
+                        for k in range(len(d_jobs['inp'])):
+                            if d_jobs['inp'][k] == filesNameSplit[0]:
+                                signal = signal+1
+
+                        if signal == 0:
+                            d_jobs['inp'].append(filesNameSplit[0])
 
-                    if signal == 0:
-                        d_jobs['inp'].append(filesNameSplit[0])
+    #Jobs never fitting the node, to be solved on a larger one
+    if len(d_jobs['skipped']) > 0:
+        print('Skipped jobs: %s' % ', '.join(d_jobs['skipped']))
 
-mdb.save()
\ No newline at end of file
+    mdb.save()
\ No newline at end of file
@@ -10,6 +10,10 @@
 #Import modules
 from math import *
 import numpy as np
+import traceback
+import json
+import time
+import sys
 import os
 
 from abaqus import *
@@ -63,9 +67,14 @@ path = os.path.abspath(os.path.dirname(currentPath) + os.path.sep + ".")
 pathSplit = path.split('\\')
 caeName = pathSplit[-1]+".cae"
 
+#Import the profiling script from the same folder
+sys.path.insert(0, path)
+from profp import profileStart, profileMark, profileWrite, inputCounts
+from layp import layoutCheck, layoutViolations
+
 #Set the working path
-mkdir(path)
-mdb.saveAs(pathName=path+"\\"+caeName)
+if __name__ == '__main__':
+    mkdir(path)
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Parameter database
@@ -129,12 +138,50 @@ screwA['endDistance'] = [30.0] # screw end distance
 #Basic control
 bCF1 = 0.001 # boundary control factor, used in adds or subtracts
 
+#Assembly control
+instancePattern = 0 # 1 - place all screw and thread instances in one pass and pattern their surfaces from the first screw | 0 - place and query every screw separately
+contactRadius = 0.0 # > 0 - limit the eroding sheet surfaces to this radius around each hole, multiply by dn, at least half the washer diameter plus contactMargin, and the general contact domain to the screws, the sheet faces around them and the faces between the sheets | 0.0 - whole sheets and all exterior faces
+contactMargin = 1.0 # clearance of the eroding sheet surfaces beyond the washer edge, at least the seed size around holes, mm
+
+#Output control
+outputBudget = 0 # 1 - history output at the loading point and field output of a few frames | 0 - field output of the whole model at every interval
+outputIntervals = 250 # number of output intervals of the whole model
+historyIntervals = 1000 # number of history output intervals at the loading point, used when outputBudget = 1
+fieldIntervals = 4 # number of field output intervals of the whole model, used when outputBudget = 1
+peakFrames = 5 # number of extra field frames of the whole model around the load peak, at time points within peakWindow of the time at failure of calibrationFile, used when outputBudget = 1 | 0 - none
+peakWindow = [0.5, 1.0] # fractions of the time at failure spanned by the peak frames, the load peaking before failure
+
+#Loading control
+calibrationFile = "" # loading_calibration.csv written by calip.py, with the velocity and step time period of every configuration, "" - 200 mm/s over 0.06 s for all
+velocityDefault = 200.0 # velocity of the loading point, mm/s, used for configurations not in calibrationFile
+rampTimeDefault = 0.02 # time of the smooth step up to the velocity, s
+timePeriodDefault = 0.06 # step time period, s
+
+#Restart control
+restartIntervals = 0 # number of restart intervals of Step-1, overlaid, so that postp.py can resume an interrupted job | 0 - no restart data
+
+#Model lifecycle
+streamMode = 0 # 1 - write the .inp file right after each model and delete the model from the session | 0 - keep all models in the .cae file
+manifestFile = "manifest.jsonl" # manifest of the models written in streamMode = 1, "" - no manifest
+
+#Sweep rows
+sweepFile = "" # CSV file with a column per argument of SCS() and a row per model, "" - the specimens of testGroup1
+layoutCheckMode = 1 # 1 - skip the sweep rows failing the clearance rules of layp.py, recorded in the manifest | 2 - only report them | 0 - no check
+layoutClearance = 0.0 # minimum clear distance between washers, holes and sheet edges
+
+#Profiling
+profileOrNot = 0 # 1 - time the phases of each model and write them in profileFile, summarized by profp.py | 0 - not profile
+profileFile = "profile.jsonl" # profile records, one per model
+
+#Calibrated loading, read once from calibrationFile
+d_calibration = {}
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Part-Functions
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #Define part-creation functions.
 
-def sheet(modelName='SCS', partName='sheetPart',    sheetProfile=3, sheetPosition=0, sheetLength=250.0, sheetWidth=50.0,    screwProfile=1, arrangementType1=4, arrangementType2=0, spacingDistanceLongitudinal=4, spacingTransversalDistance=3, endDistance=30.0):
+def sheet(modelName='SCS', partName='sheetPart',    sheetProfile=3, sheetPosition=0, sheetLength=250.0, sheetWidth=50.0,    screwProfile=1, arrangementType1=4, arrangementType2=0, spacingDistanceLongitudinal=4, spacingTransversalDistance=3, endDistance=30.0,    d_profile=None):
     
     "Create a steel sheet."
 
@@ -229,6 +276,8 @@ def sheet(modelName='SCS', partName='sheetPart',    sheetProfile=3, sheetPositio
             x = -sheetWidth/2.0+(sheetWidth-tgd)/2.0+(i+0.5)*tgd
             pa.PartitionCellByPlaneThreePoints(point1=(x, 0.0, 0.0), point2=(x, 1.0, 0.0), point3=(x, 0.0, 1.0), cells=pa.cells)
 
+    profileMark(d_profile, 'part')
+
     #Seed parts
     ##Sheet seed size
     sheetS = {}
@@ -307,10 +356,12 @@ def sheet(modelName='SCS', partName='sheetPart',    sheetProfile=3, sheetPositio
     #Mesh part
     pa.setMeshControls(regions=pa.cells, elemShape=HEX, technique=STRUCTURED)
     pa.generateMesh()
+
+    profileMark(d_profile, 'mesh')
     
     return pa
 
-def screw(modelName='SCS', partName='screwPart',    sheetProfile_Adj=3, sheetProfile_Nonadj=4,    screwProfile=1):
+def screw(modelName='SCS', partName='screwPart',    sheetProfile_Adj=3, sheetProfile_Nonadj=4,    screwProfile=1,    d_profile=None):
     
     "Create a self-drilling screw."
 
@@ -401,6 +452,8 @@ def screw(modelName='SCS', partName='screwPart',    sheetProfile_Adj=3, sheetPro
 
     pa.PartitionCellByPlaneThreePoints(point1=(0.0, 0.0, 0.0), point2=(1.0, 0.0, 0.0), point3=(0.0, 1.0, 0.0), cells=pa.cells)
 
+    profileMark(d_profile, 'part')
+
     #Seed parts
     ##Seed on the screw thread
     edge1 = pa.edges.getByBoundingCylinder(center1=(-(( st_Adj+st_Nonadj)//tp+4)*tp, 0.0, 0.0), center2=(0.0, 0.0, 0.0), radius=td1/2.0+bCF1)
@@ -412,10 +465,12 @@ def screw(modelName='SCS', partName='screwPart',    sheetProfile_Adj=3, sheetPro
     #Mesh part
     pa.setMeshControls(regions=pa.cells, elemShape=HEX, technique=SWEEP, algorithm=MEDIAL_AXIS)
     pa.generateMesh()
+
+    profileMark(d_profile, 'mesh')
     
     return pa
 
-def thread(modelName='SCS', partName='threadPart',    sheetProfile_Adj=3, sheetProfile_Nonadj=4,    screwProfile=1):
+def thread(modelName='SCS', partName='threadPart',    sheetProfile_Adj=3, sheetProfile_Nonadj=4,    screwProfile=1,    d_profile=None):
     
     "Create the thread of a self-drilling screw."
 
@@ -452,12 +507,16 @@ def thread(modelName='SCS', partName='threadPart',    sheetProfile_Adj=3, sheetP
     pa = mdb.models[modelName].Part(name=partName, dimensionality=THREE_D, type=DEFORMABLE_BODY)
     pa.BaseSolidRevolve(sketch=sk, angle=((st_Adj+st_Nonadj)//tp+3)*360.0, flipRevolveDirection=ON, pitch=tp, flipPitchDirection=ON, moveSketchNormalToPath=OFF)
 
+    profileMark(d_profile, 'part')
+
     #Seed the part
     pa.seedPart(size=0.5, deviationFactor=0.1, minSizeFactor=0.1)
 
     #Mesh the part
     pa.setMeshControls(regions=pa.cells, elemShape=HEX, technique=SWEEP, algorithm=ADVANCING_FRONT)
     pa.generateMesh()
+
+    profileMark(d_profile, 'mesh')
     
     return pa
 
@@ -466,7 +525,7 @@ def thread(modelName='SCS', partName='threadPart',    sheetProfile_Adj=3, sheetP
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #Define the model-creation function.
 
-def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0,    screwP=1, screwA_T1=4, screwA_T2=0, screwGD_L=4, screwGD_T=3, screwED=30.0):
+def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0,    screwP=1, screwA_T1=4, screwA_T2=0, screwGD_L=4, screwGD_T=3, screwED=30.0,    d_profile=None):
 
     "Create a finite element model of self-drilling screw connections."
 
@@ -483,6 +542,10 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     k = screwC['k'][screwP]
     lg = screwC['lg'][screwP]
 
+    #Eroding surfaces covering the sheets under the washers
+    if contactRadius > 0.0 and contactRadius*dn < dc/2.0+contactMargin:
+        raise ValueError('contactRadius = %g gives %g mm around the holes, less than %g mm of the washer radius and contactMargin' % (contactRadius, contactRadius*dn, dc/2.0+contactMargin))
+
     #Sheet characteristic parameters
     st_Adj = sheetC['t'][sheetP_Adj]
     st_Nonadj = sheetC['t'][sheetP_Nonadj]
@@ -522,13 +585,13 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
 
     d_parts['partName'] = ['sheetAdjPart', 'sheetNonadjPart', 'screwPart','threadPart']
 
-    sheetAdjPart = sheet(modelName=modelName, partName=d_parts['partName'][0], sheetPosition=0, sheetProfile=sheetP_Adj, sheetLength=sheetL, sheetWidth=sheetW, screwProfile=screwP, arrangementType1=screwA_T1, arrangementType2=screwA_T2, spacingDistanceLongitudinal=screwGD_L, spacingTransversalDistance=screwGD_T, endDistance=ed)
+    sheetAdjPart = sheet(modelName=modelName, partName=d_parts['partName'][0], sheetPosition=0, sheetProfile=sheetP_Adj, sheetLength=sheetL, sheetWidth=sheetW, screwProfile=screwP, arrangementType1=screwA_T1, arrangementType2=screwA_T2, spacingDistanceLongitudinal=screwGD_L, spacingTransversalDistance=screwGD_T, endDistance=ed, d_profile=d_profile)
 
-    sheetNonadjPart = sheet(modelName=modelName, partName=d_parts['partName'][1], sheetPosition=1, sheetProfile=sheetP_Nonadj, sheetLength=sheetL, sheetWidth=sheetW, screwProfile=screwP, arrangementType1=screwA_T1, arrangementType2=screwA_T2, spacingDistanceLongitudinal=screwGD_L, spacingTransversalDistance=screwGD_T, endDistance=ed)
+    sheetNonadjPart = sheet(modelName=modelName, partName=d_parts['partName'][1], sheetPosition=1, sheetProfile=sheetP_Nonadj, sheetLength=sheetL, sheetWidth=sheetW, screwProfile=screwP, arrangementType1=screwA_T1, arrangementType2=screwA_T2, spacingDistanceLongitudinal=screwGD_L, spacingTransversalDistance=screwGD_T, endDistance=ed, d_profile=d_profile)
 
-    screwPart = screw(modelName=modelName, partName=d_parts['partName'][2], sheetProfile_Adj=sheetP_Adj, sheetProfile_Nonadj=sheetP_Nonadj, screwProfile=screwP)
+    screwPart = screw(modelName=modelName, partName=d_parts['partName'][2], sheetProfile_Adj=sheetP_Adj, sheetProfile_Nonadj=sheetP_Nonadj, screwProfile=screwP, d_profile=d_profile)
     
-    threadPart = thread(modelName=modelName, partName=d_parts['partName'][3], sheetProfile_Adj=sheetP_Adj, sheetProfile_Nonadj=sheetP_Nonadj, screwProfile=screwP)
+    threadPart = thread(modelName=modelName, partName=d_parts['partName'][3], sheetProfile_Adj=sheetP_Adj, sheetProfile_Nonadj=sheetP_Nonadj, screwProfile=screwP, d_profile=d_profile)
 
     d_parts['part'] = [sheetAdjPart, sheetNonadjPart, screwPart, threadPart]
 
@@ -544,6 +607,8 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
         region1 =(mdb.models[modelName].parts[d_parts['partName'][i]].cells, )
         mdb.models[modelName].parts[d_parts['partName'][i]].setElementType(regions=region1, elemTypes=(elemType1, elemType2, elemType3))
 
+    profileMark(d_profile, 'mesh')
+
     #----------------------------
     # Property
     #----------------------------
@@ -636,6 +701,8 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
         region0 = regionToolset.Region(cells=d_parts['part'][i].cells)
         d_parts['part'][i].SectionAssignment(offset=0.0, offsetField='', offsetType=MIDDLE_SURFACE, region=region0, sectionName=d_parts['sectionName'][i], thicknessAssignment=FROM_SECTION)
 
+    profileMark(d_profile, 'property')
+
     #----------------------------
     # Assembly
     #----------------------------
@@ -659,46 +726,52 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     #roAs.rotate(instanceList=(d_parts['partName'][1], ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 0.0, 1.0), angle=180.0)
     roAs.translate(instanceList=(d_parts['partName'][1], ), vector=(0.0, 0.0, -(st_Adj+st_Nonadj)))
     
-    ##Create the screw and thread instances
+    ##Hole centres, the same as the sketch of sheet()
+    holes = []
     for i in range(len(arr)):
         if screwA_T1 < 6:
             for j in range(arr[i]):
-                x = -sheetW/2.0+(sheetW-(arr[i]-1)*tgd)/2.0+j*tgd
-                y = i*lgd
-
-                ###Screw
-                d_instances['instanceName'].append(d_parts['partName'][2]+'-'+str(i)+'_'+str(j))
-                d_instances['instance'].append(roAs.Instance(name=d_parts['partName'][2]+'-'+str(i)+'_'+str(j), part=d_parts['part'][2], dependent=ON))
-                roAs.rotate(instanceList=(d_parts['partName'][2]+'-'+str(i)+'_'+str(j), ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
-                roAs.translate(instanceList=(d_parts['partName'][2]+'-'+str(i)+'_'+str(j), ), vector=(x, y, 0.0))
-
-                ###Thread
-                rotateAngle = 270.0
-                d_instances['instanceName'].append(d_parts['partName'][3]+'-'+str(i)+'_'+str(j))
-                d_instances['instance'].append(roAs.Instance(name=d_parts['partName'][3]+'-'+str(i)+'_'+str(j), part=d_parts['part'][3], dependent=ON))
-                roAs.rotate(instanceList=(d_parts['partName'][3]+'-'+str(i)+'_'+str(j), ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
-                roAs.rotate(instanceList=(d_parts['partName'][3]+'-'+str(i)+'_'+str(j), ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 0.0, 1.0), angle=rotateAngle)
-                roAs.translate(instanceList=(d_parts['partName'][3]+'-'+str(i)+'_'+str(j), ), vector=(x, y, 0.0))
-                
+                holes.append((i, j, -sheetW/2.0+(sheetW-(arr[i]-1)*tgd)/2.0+j*tgd, i*lgd))
         else:
-            for j in range(1):
-                x = -sheetW/2.0+(sheetW-tgd)/2.0+i%2*tgd
-                y = i*lgd
+            holes.append((i, 0, -sheetW/2.0+(sheetW-tgd)/2.0+i%2*tgd, i*lgd))
 
-                ###Screw
-                d_instances['instanceName'].append(d_parts['partName'][2]+'-'+str(i)+'_'+str(j))
-                d_instances['instance'].append(roAs.Instance(name=d_parts['partName'][2]+'-'+str(i)+'_'+str(j), part=d_parts['part'][2], dependent=ON))
-                roAs.rotate(instanceList=(d_parts['partName'][2]+'-'+str(i)+'_'+str(j), ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
-                roAs.translate(instanceList=(d_parts['partName'][2]+'-'+str(i)+'_'+str(j), ), vector=(x, y, 0.0))
-
-                ###Thread
-                rotateAngle = 90.0
-                d_instances['instanceName'].append(d_parts['partName'][3]+'-'+str(i)+'_'+str(j))
-                d_instances['instance'].append(roAs.Instance(name=d_parts['partName'][3]+'-'+str(i)+'_'+str(j), part=d_parts['part'][3], dependent=ON))
-                roAs.rotate(instanceList=(d_parts['partName'][3]+'-'+str(i)+'_'+str(j), ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
-                roAs.rotate(instanceList=(d_parts['partName'][3]+'-'+str(i)+'_'+str(j), ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 0.0, 1.0), angle=rotateAngle)
-                roAs.translate(instanceList=(d_parts['partName'][3]+'-'+str(i)+'_'+str(j), ), vector=(x, y, 0.0))
+    screwNames = [d_parts['partName'][2]+'-'+str(i)+'_'+str(j) for i, j, x, y in holes]
+    threadNames = [d_parts['partName'][3]+'-'+str(i)+'_'+str(j) for i, j, x, y in holes]
+
+    ##Create the screw and thread instances
+    for k in range(len(holes)):
+        d_instances['instanceName'].append(screwNames[k])
+        d_instances['instance'].append(roAs.Instance(name=screwNames[k], part=d_parts['part'][2], dependent=ON))
+        d_instances['instanceName'].append(threadNames[k])
+        d_instances['instance'].append(roAs.Instance(name=threadNames[k], part=d_parts['part'][3], dependent=ON))
+
+    ###Threads turned by 270 degrees about z in arrangements O to V, by 90 degrees in VI
+    rotateAngle = 270.0 if screwA_T1 < 6 else 90.0
+
+    if instancePattern == 1:
+
+        ###All screws and threads turned at once about the axes through the origin, then moved to their holes in pairs
+        roAs.rotate(instanceList=tuple(screwNames+threadNames), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
+        roAs.rotate(instanceList=tuple(threadNames), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 0.0, 1.0), angle=rotateAngle)
+
+        for k in range(len(holes)):
+            roAs.translate(instanceList=(screwNames[k], threadNames[k]), vector=(holes[k][2], holes[k][3], 0.0))
+
+    else:
+        for k in range(len(holes)):
+            i, j, x, y = holes[k]
+
+            ###Screw
+            roAs.rotate(instanceList=(screwNames[k], ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
+            roAs.translate(instanceList=(screwNames[k], ), vector=(x, y, 0.0))
+
+            ###Thread
+            roAs.rotate(instanceList=(threadNames[k], ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 1.0, 0.0), angle=270.0)
+            roAs.rotate(instanceList=(threadNames[k], ), axisPoint=(0.0, 0.0, 0.0), axisDirection=(0.0, 0.0, 1.0), angle=rotateAngle)
+            roAs.translate(instanceList=(threadNames[k], ), vector=(x, y, 0.0))
     
+    profileMark(d_profile, 'instance')
+
     #Create reference points and corresponding sets
     referencePoint1 = roAs.ReferencePoint(point=(0.0, (len(arr)-1)*lgd+ed+bCF1, -st_Adj/2.0), instanceName=d_parts['partName'][0])
     roAs.Set(referencePoints=(roAs.referencePoints[referencePoint1.id], ), name='sheetAdj_RP') #! referencePoint.id
@@ -713,15 +786,28 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     d_surfaces['surface'] = []
 
     #Create surfaces
-    ##Surface of sheetAdj elments
-    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-surfErode')
-    surfE = roAs.instances[d_parts['partName'][0]].elements.getByBoundingBox(xMin=-sheetW/2.0-bCF1, yMin=-ed-bCF1, zMin=-st_Adj-bCF1, xMax=sheetW/2.0+bCF1, yMax=(len(arr)-1)*lgd+ed+bCF1, zMax=0.0+bCF1)
-    d_surfaces['surface'].append(roAs.Surface(face1Elements=surfE, face2Elements=surfE, face3Elements=surfE, face4Elements=surfE, face5Elements=surfE, face6Elements=surfE, name=d_parts['partName'][0]+'-surfErode'))
+    if contactRadius > 0.0:
+
+        ##Surfaces of sheet elements within contactRadius around the holes, where the sheets erode
+        for sheetName, zTop, zBot in [(d_parts['partName'][0], 0.0, -st_Adj), (d_parts['partName'][1], -st_Adj, -st_Adj-st_Nonadj)]:
+            labels = set()
+            for i, j, x, y in holes:
+                labels.update([e.label for e in roAs.instances[sheetName].elements.getByBoundingCylinder(center1=(x, y, zTop+bCF1), center2=(x, y, zBot-bCF1), radius=contactRadius*dn)])
 
-    ##Surface of sheetNonadj elments
-    d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-surfErode')
-    surfE = roAs.instances[d_parts['partName'][1]].elements.getByBoundingBox(xMin=-sheetW/2.0-bCF1, yMin=-ed-bCF1, zMin=-st_Adj-st_Nonadj-bCF1, xMax=sheetW/2.0+bCF1, yMax=(len(arr)-1)*lgd+ed+bCF1, zMax=-st_Adj+bCF1)
-    d_surfaces['surface'].append(roAs.Surface(face1Elements=surfE, face2Elements=surfE, face3Elements=surfE, face4Elements=surfE, face5Elements=surfE, face6Elements=surfE, name=d_parts['partName'][1]+'-surfErode'))
+            d_surfaces['surfaceName'].append(sheetName+'-surfErode')
+            surfE = roAs.instances[sheetName].elements.sequenceFromLabels(sorted(labels))
+            d_surfaces['surface'].append(roAs.Surface(face1Elements=surfE, face2Elements=surfE, face3Elements=surfE, face4Elements=surfE, face5Elements=surfE, face6Elements=surfE, name=sheetName+'-surfErode'))
+
+    else:
+        ##Surface of sheetAdj elments
+        d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-surfErode')
+        surfE = roAs.instances[d_parts['partName'][0]].elements.getByBoundingBox(xMin=-sheetW/2.0-bCF1, yMin=-ed-bCF1, zMin=-st_Adj-bCF1, xMax=sheetW/2.0+bCF1, yMax=(len(arr)-1)*lgd+ed+bCF1, zMax=0.0+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(face1Elements=surfE, face2Elements=surfE, face3Elements=surfE, face4Elements=surfE, face5Elements=surfE, face6Elements=surfE, name=d_parts['partName'][0]+'-surfErode'))
+
+        ##Surface of sheetNonadj elments
+        d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-surfErode')
+        surfE = roAs.instances[d_parts['partName'][1]].elements.getByBoundingBox(xMin=-sheetW/2.0-bCF1, yMin=-ed-bCF1, zMin=-st_Adj-st_Nonadj-bCF1, xMax=sheetW/2.0+bCF1, yMax=(len(arr)-1)*lgd+ed+bCF1, zMax=-st_Adj+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(face1Elements=surfE, face2Elements=surfE, face3Elements=surfE, face4Elements=surfE, face5Elements=surfE, face6Elements=surfE, name=d_parts['partName'][1]+'-surfErode'))
 
     ##Surface of sheetAdj loading end
     d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-E')
@@ -753,121 +839,111 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     surface2 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingBox(xMin=-sheetW/2.0-bCF1, yMin=-ed-bCF1, zMin=-st_Adj-bCF1, xMax=sheetW/2.0+bCF1, yMax=(len(arr)-1)*lgd+ed+bCF1, zMax=-st_Adj+bCF1)
     d_surfaces['surface'].append(roAs.Surface(side1Faces=surface2, name=d_parts['partName'][1]+'-A'))
 
-    for i in range(len(arr)):
-            if screwA_T1 < 6:
-                for j in range(arr[i]):
-                    x = -sheetW/2.0+(sheetW-(arr[i]-1)*tgd)/2.0+j*tgd
-                    y = i*lgd
-
-                    ##Surface of sheetAdj above around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA')
-                    surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=0.0-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=0.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'))
-                    
-                    ##Surface of sheetAdj middle around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA')
-                    surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -st_Adj-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'))
-
-                    ##Surface of sheetAdj below around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA')
-                    surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=-st_Adj-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=-st_Adj+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'))
-
-                    ##Surface of sheetNonadj middle around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA')
-                    surface3 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingCylinder(center1=(x, y, -st_Adj+bCF1), center2=(x, y, -st_Adj-st_Nonadj-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'))
-
-                    ##Surface of sheetNonadj below around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA')
-                    surface3 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=-st_Adj-st_Nonadj-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=-st_Adj-st_Nonadj+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'))
-
-                    ##Surface of screw washer
-                    d_surfaces['surfaceName'].append(d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-c')
-                    surface3 = roAs.instances[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, c/2.0+bCF1), center2=(x, y, 0.0-bCF1), radius=dc/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-c'))
-
-                    ##Surface of screw shank
-                    d_surfaces['surfaceName'].append(d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b')
-                    surface3 = roAs.instances[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, 0.0), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'))
-
-                    ##Surface of thread outer
-                    d_surfaces['surfaceName'].append(d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O')
-                    surface3 = roAs.instances[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'))
-                    
-                    ##Surface of thread inner
-                    d_surfaces['surfaceName'].append(d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-I')
-                    surface3 = roAs.instances[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td2/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-I'))
-
-            else:
-                for j in range(1):
-                    x = -sheetW/2.0+(sheetW-tgd)/2.0+i%2*tgd
-                    y = i*lgd
-
-                    ##Surface of sheetAdj above around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA')
-                    surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=0.0-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=0.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'))
-                    
-                    ##Surface of sheetAdj middle around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA')
-                    surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -st_Adj-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'))
-
-                    ##Surface of sheetAdj below around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA')
-                    surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=-st_Adj-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=-st_Adj+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'))
-
-                    ##Surface of sheetNonadj middle around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA')
-                    surface3 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingCylinder(center1=(x, y, -st_Adj+bCF1), center2=(x, y, -st_Adj-st_Nonadj-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'))
-
-                    ##Surface of sheetNonadj below around screw
-                    d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA')
-                    surface3 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=-st_Adj-st_Nonadj-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=-st_Adj-st_Nonadj+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'))
-
-                    ##Surface of screw washer
-                    d_surfaces['surfaceName'].append(d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-c')
-                    surface3 = roAs.instances[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, c/2.0+bCF1), center2=(x, y, 0.0-bCF1), radius=dc/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-c'))
-
-                    ##Surface of screw shank
-                    d_surfaces['surfaceName'].append(d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b')
-                    surface3 = roAs.instances[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, 0.0), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'))
-
-                    ##Surface of thread outer
-                    d_surfaces['surfaceName'].append(d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O')
-                    surface3 = roAs.instances[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'))
-                    
-                    ##Surface of thread inner
-                    d_surfaces['surfaceName'].append(d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-I')
-                    surface3 = roAs.instances[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td2/2.0+bCF1)
-                    d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-I'))
+    #Screw and thread surfaces queried at the first hole only, the other holes take the same faces of their instances by mask
+    if instancePattern == 1:
+        d_masks = {}
+        d_masks['-c'] = roAs.instances[screwNames[0]].faces.getByBoundingCylinder(center1=(holes[0][2], holes[0][3], c/2.0+bCF1), center2=(holes[0][2], holes[0][3], 0.0-bCF1), radius=dc/2.0+bCF1).getMask()
+        d_masks['-b'] = roAs.instances[screwNames[0]].faces.getByBoundingCylinder(center1=(holes[0][2], holes[0][3], 0.0), center2=(holes[0][2], holes[0][3], -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1).getMask()
+        d_masks['-O'] = roAs.instances[threadNames[0]].faces.getByBoundingCylinder(center1=(holes[0][2], holes[0][3], 0.0+bCF1), center2=(holes[0][2], holes[0][3], -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1).getMask()
+        d_masks['-I'] = roAs.instances[threadNames[0]].faces.getByBoundingCylinder(center1=(holes[0][2], holes[0][3], 0.0+bCF1), center2=(holes[0][2], holes[0][3], -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td2/2.0+bCF1).getMask()
+
+    for k in range(len(holes)):
+        i, j, x, y = holes[k]
+
+        ##Surface of sheetAdj above around screw
+        d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA')
+        surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=0.0-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=0.0+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'))
+
+        ##Surface of sheetAdj middle around screw
+        d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA')
+        surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -st_Adj-bCF1), radius=td1/2.0+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'))
+
+        ##Surface of sheetAdj below around screw
+        d_surfaces['surfaceName'].append(d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA')
+        surface3 = roAs.instances[d_parts['partName'][0]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=-st_Adj-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=-st_Adj+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'))
+
+        ##Surface of sheetNonadj middle around screw
+        d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA')
+        surface3 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingCylinder(center1=(x, y, -st_Adj+bCF1), center2=(x, y, -st_Adj-st_Nonadj-bCF1), radius=td1/2.0+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'))
+
+        ##Surface of sheetNonadj below around screw
+        d_surfaces['surfaceName'].append(d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA')
+        surface3 = roAs.instances[d_parts['partName'][1]].faces.getByBoundingBox(xMin=x-tgd/2.0-bCF1, yMin=y-lgd/2.0-bCF1, zMin=-st_Adj-st_Nonadj-bCF1, xMax=x+tgd/2.0+bCF1, yMax=y+lgd/2.0+bCF1, zMax=-st_Adj-st_Nonadj+bCF1)
+        d_surfaces['surface'].append(roAs.Surface(side1Faces=surface3, name=d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'))
+
+        ##Surfaces of screw washer and shank, and of thread outer and inner
+        d_faces = {}
+        if instancePattern == 1:
+            for instanceName, suffix in [(screwNames[k], '-c'), (screwNames[k], '-b'), (threadNames[k], '-O'), (threadNames[k], '-I')]:
+                d_faces[suffix] = roAs.instances[instanceName].faces.getSequenceFromMask(mask=d_masks[suffix])
+        else:
+            d_faces['-c'] = roAs.instances[screwNames[k]].faces.getByBoundingCylinder(center1=(x, y, c/2.0+bCF1), center2=(x, y, 0.0-bCF1), radius=dc/2.0+bCF1)
+            d_faces['-b'] = roAs.instances[screwNames[k]].faces.getByBoundingCylinder(center1=(x, y, 0.0), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1)
+            d_faces['-O'] = roAs.instances[threadNames[k]].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td1/2.0+bCF1)
+            d_faces['-I'] = roAs.instances[threadNames[k]].faces.getByBoundingCylinder(center1=(x, y, 0.0+bCF1), center2=(x, y, -((st_Adj+st_Nonadj)//tp+4)*tp-bCF1), radius=td2/2.0+bCF1)
+
+        for instanceName, suffix in [(screwNames[k], '-c'), (screwNames[k], '-b'), (threadNames[k], '-O'), (threadNames[k], '-I')]:
+            d_surfaces['surfaceName'].append(instanceName+suffix)
+            d_surfaces['surface'].append(roAs.Surface(side1Faces=d_faces[suffix], name=instanceName+suffix))
+
+    #Surfaces of the reduced contact domain
+    if contactRadius > 0.0:
+
+        ##Surface of screw washers, screw shanks and thread outers
+        surfaces4 = []
+        for k in range(len(holes)):
+            surfaces4 = surfaces4+[roAs.surfaces[screwNames[k]+'-c'], roAs.surfaces[screwNames[k]+'-b'], roAs.surfaces[threadNames[k]+'-O']]
+        d_surfaces['surfaceName'].append('screws-surfContact')
+        d_surfaces['surface'].append(roAs.SurfaceByBoolean(name='screws-surfContact', surfaces=tuple(surfaces4)))
+
+        ##Surface of sheetAdj above, middle and below around screws and sheetNonadj middle and below around screws
+        surfaces4 = []
+        for i, j, x, y in holes:
+            surfaces4 = surfaces4+[roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+suffix] for suffix in ['-AA', '-MA', '-BA']]
+            surfaces4 = surfaces4+[roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+suffix] for suffix in ['-MA', '-BA']]
+        d_surfaces['surfaceName'].append('sheets-surfContact')
+        d_surfaces['surface'].append(roAs.SurfaceByBoolean(name='sheets-surfContact', surfaces=tuple(surfaces4)))
+
+    profileMark(d_profile, 'surface')
 
     #----------------------------
     # Step
     #----------------------------
     #Quasi-Static analysis
     ##Create steps
-    mdb.models[modelName].ExplicitDynamicsStep(name='Step-1', previous='Initial', timePeriod=0.06)
+    velocity, rampTime, timePeriod, deformationFailure = loadingRate(sheetP_Adj, sheetP_Nonadj, screwP, screwA_T1, screwA_T2, screwGD_L, screwGD_T)
+    mdb.models[modelName].ExplicitDynamicsStep(name='Step-1', previous='Initial', timePeriod=timePeriod)
     
     ##Set output requests
     mdb.models[modelName].fieldOutputRequests['F-Output-1'].suppress()
     ##'S', 'PEEQ', 'LE', 'U', 'RF', 'STATUS'
-    mdb.models[modelName].FieldOutputRequest(name='F-Output-loadStep', createStepName='Step-1', variables=('S', 'U', 'RF', 'STATUS'), numIntervals=250)
+    if outputBudget == 1:
+        mdb.models[modelName].FieldOutputRequest(name='F-Output-loadStep', createStepName='Step-1', variables=('S', 'U', 'STATUS'), numIntervals=fieldIntervals)
+    else:
+        mdb.models[modelName].FieldOutputRequest(name='F-Output-loadStep', createStepName='Step-1', variables=('S', 'U', 'RF', 'STATUS'), numIntervals=outputIntervals)
     
     mdb.models[modelName].historyOutputRequests['H-Output-1'].suppress()
-    mdb.models[modelName].HistoryOutputRequest(name='H-Output-loadStep', createStepName='Step-1', variables=('ALLIE', 'ALLKE'), numIntervals=250)
+    mdb.models[modelName].HistoryOutputRequest(name='H-Output-loadStep', createStepName='Step-1', variables=('ALLIE', 'ALLKE'), numIntervals=outputIntervals)
+
+    ##Frames around the load peak, before the time at failure of the smooth step to the velocity
+    if outputBudget == 1 and peakFrames > 0 and deformationFailure > 0.0:
+        timeFailure = min(deformationFailure/velocity+rampTime/2.0, timePeriod)
+        mdb.models[modelName].TimePoint(name='TimePoints-peak', points=tuple([(float(t), ) for t in np.linspace(peakWindow[0]*timeFailure, peakWindow[1]*timeFailure, peakFrames)]))
+        mdb.models[modelName].FieldOutputRequest(name='F-Output-peak', createStepName='Step-1', variables=('S', 'U', 'STATUS'), timePoint='TimePoints-peak')
+
+    ##Load versus deformation at the loading point
+    if outputBudget == 1:
+        mdb.models[modelName].HistoryOutputRequest(name='H-Output-loadPoint', createStepName='Step-1', variables=('U2', 'RF2'), region=roAs.sets['sheetAdj_RP'], sectionPoints=DEFAULT, rebar=EXCLUDE, numIntervals=historyIntervals)
+
+    ##Restart data, only the latest interval kept
+    if restartIntervals > 0:
+        mdb.models[modelName].steps['Step-1'].Restart(numberIntervals=restartIntervals, overlay=ON, timeMarks=OFF)
+
+    profileMark(d_profile, 'step')
 
     #----------------------------
     # Interaction
@@ -894,14 +970,30 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     #Create interactions
     mdb.models[modelName].ContactExp(name='generalContact', createStepName='Initial')
     
-    ##All - self; All - sheetAdj elments; sheetAdj elments - self
-    mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=ON)
-    
-    if sheetP_Adj < 3:
-        mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=OFF, addPairs=((ALLSTAR, SELF), (ALLSTAR, roAs.surfaces[d_parts['partName'][0]+'-surfErode']), (roAs.surfaces[d_parts['partName'][0]+'-surfErode'], SELF)))
-    
-    if sheetP_Nonadj < 3:
-        mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=OFF, addPairs=((ALLSTAR, SELF), (ALLSTAR, roAs.surfaces[d_parts['partName'][1]+'-surfErode']), (roAs.surfaces[d_parts['partName'][1]+'-surfErode'], SELF)))
+    if contactRadius > 0.0:
+
+        ##Screws - self; screws - sheet faces around screws; sheetAdj below - sheetNonadj above
+        surfScrews = roAs.surfaces['screws-surfContact']
+        surfSheets = roAs.surfaces['sheets-surfContact']
+        pairs = [(surfScrews, SELF), (surfScrews, surfSheets), (roAs.surfaces[d_parts['partName'][0]+'-B'], roAs.surfaces[d_parts['partName'][1]+'-A'])]
+
+        ##Sheet elments around holes - self, screws, sheet faces around screws and the other sheet, for the eroding sheets only as with all exterior faces
+        for sheetP, sheetName, otherName in [(sheetP_Adj, d_parts['partName'][0], d_parts['partName'][1]+'-A'), (sheetP_Nonadj, d_parts['partName'][1], d_parts['partName'][0]+'-B')]:
+            if sheetP < 3:
+                surfErode = roAs.surfaces[sheetName+'-surfErode']
+                pairs = pairs+[(surfErode, SELF), (surfScrews, surfErode), (surfSheets, surfErode), (roAs.surfaces[otherName], surfErode)]
+
+        mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=OFF, addPairs=tuple(pairs))
+
+    else:
+        ##All - self; All - sheetAdj elments; sheetAdj elments - self
+        mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=ON)
+
+        if sheetP_Adj < 3:
+            mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=OFF, addPairs=((ALLSTAR, SELF), (ALLSTAR, roAs.surfaces[d_parts['partName'][0]+'-surfErode']), (roAs.surfaces[d_parts['partName'][0]+'-surfErode'], SELF)))
+
+        if sheetP_Nonadj < 3:
+            mdb.models[modelName].interactions['generalContact'].includedPairs.setValuesInStep(stepName='Initial', useAllstar=OFF, addPairs=((ALLSTAR, SELF), (ALLSTAR, roAs.surfaces[d_parts['partName'][1]+'-surfErode']), (roAs.surfaces[d_parts['partName'][1]+'-surfErode'], SELF)))
 
     mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((GLOBAL, SELF, 'default'), ))
 
@@ -923,81 +1015,19 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-B'], roAs.surfaces[d_parts['partName'][1]+'-A'], 'friction-25'), ))
 
     ##around screw
-    for i in range(len(arr)):
-            if screwA_T1 < 6:
-                for j in range(arr[i]):
-                    x = -sheetW/2.0+(sheetW-(arr[i]-1)*tgd)/2.0+j*tgd
-                    y = i*lgd
-
-                    ##sheetAdj above around screw - screw washer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-c'], 'friction-25'), ))
-
-                    ##sheetAdj above around screw - screw shank
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], 'friction-25'), ))
-
-                    ##sheetAdj above around screw - thread outer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'], roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], 'friction-25'), ))
-
-                    ##sheetAdj middle around screw - screw shank
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], 'friction-25'), ))
-
-                    ##sheetAdj middle around screw - thread outer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'], roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], 'friction-25'), ))
-
-                    ##sheetAdj below around screw - screw shank
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], 'friction-25'), ))
-
-                    ##sheetAdj below around screw - thread outer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'], roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], 'friction-25'), ))
-
-                    ##screw shank - sheetNonadj middle around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'], 'friction-25'), ))
-
-                    ##thread outer - sheetNonadj middle around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'], 'friction-25'), ))
-
-                    ##screw shank - sheetNonadj below around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'], 'friction-25'), ))
-
-                    ##thread outer - sheetNonadj below around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'], 'friction-25'), ))
-            else:
-                for j in range(1):
-                    x = -sheetW/2.0+(sheetW-tgd)/2.0+i%2*tgd
-                    y = i*lgd
-
-                    ##sheetAdj above around screw - screw washer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-c'], 'friction-25'), ))
-
-                    ##sheetAdj above around screw - screw shank
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], 'friction-25'), ))
-
-                    ##sheetAdj above around screw - thread outer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-AA'], roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], 'friction-25'), ))
-
-                    ##sheetAdj middle around screw - screw shank
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], 'friction-25'), ))
-
-                    ##sheetAdj middle around screw - thread outer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-MA'], roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], 'friction-25'), ))
-
-                    ##sheetAdj below around screw - screw shank
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'], roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], 'friction-25'), ))
-
-                    ##sheetAdj below around screw - thread outer
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][0]+'-'+str(i)+'_'+str(j)+'-BA'], roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], 'friction-25'), ))
-
-                    ##screw shank - sheetNonadj middle around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'], 'friction-25'), ))
-
-                    ##thread outer - sheetNonadj middle around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-MA'], 'friction-25'), ))
-
-                    ##screw shank - sheetNonadj below around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][2]+'-'+str(i)+'_'+str(j)+'-b'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'], 'friction-25'), ))
-
-                    ##thread outer - sheetNonadj below around screw
-                    mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[d_parts['partName'][3]+'-'+str(i)+'_'+str(j)+'-O'], roAs.surfaces[d_parts['partName'][1]+'-'+str(i)+'_'+str(j)+'-BA'], 'friction-25'), ))
+    for k in range(len(holes)):
+        i, j, x, y = holes[k]
+        sheetAdjName = d_parts['partName'][0]+'-'+str(i)+'_'+str(j)
+        sheetNonadjName = d_parts['partName'][1]+'-'+str(i)+'_'+str(j)
+
+        ###sheetAdj above around screw - screw washer, screw shank and thread outer; sheetAdj middle and below around screw - screw shank and thread outer
+        ###screw shank and thread outer - sheetNonadj middle and below around screw
+        for surfaceName1, surfaceName2 in [(sheetAdjName+'-AA', screwNames[k]+'-c'), (sheetAdjName+'-AA', screwNames[k]+'-b'), (sheetAdjName+'-AA', threadNames[k]+'-O'), 
+                                           (sheetAdjName+'-MA', screwNames[k]+'-b'), (sheetAdjName+'-MA', threadNames[k]+'-O'), 
+                                           (sheetAdjName+'-BA', screwNames[k]+'-b'), (sheetAdjName+'-BA', threadNames[k]+'-O'), 
+                                           (screwNames[k]+'-b', sheetNonadjName+'-MA'), (threadNames[k]+'-O', sheetNonadjName+'-MA'), 
+                                           (screwNames[k]+'-b', sheetNonadjName+'-BA'), (threadNames[k]+'-O', sheetNonadjName+'-BA')]:
+            mdb.models[modelName].interactions['generalContact'].contactPropertyAssignments.appendInStep(stepName='Initial', assignments=((roAs.surfaces[surfaceName1], roAs.surfaces[surfaceName2], 'friction-25'), ))
     
     #Create Tie constraints
     for i in range(len(arr)):
@@ -1015,6 +1045,8 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     ##Fixed point
     mdb.models[modelName].Coupling(name='fixPoint', controlPoint=roAs.sets['sheetNonadj_RP'], surface=roAs.surfaces[d_parts['partName'][1]+'-E'], influenceRadius=WHOLE_SURFACE, couplingType=KINEMATIC, localCsys=None, u1=ON, u2=ON, u3=ON, ur1=ON, ur2=ON, ur3=ON)
 
+    profileMark(d_profile, 'interaction')
+
     #----------------------------
     # Load
     #----------------------------
@@ -1027,11 +1059,13 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     
     ##Amplitude
     ###Smooth
-    mdb.models[modelName].SmoothStepAmplitude(name='velocityAmp', timeSpan=STEP, data=((0.0, 0.0), (0.02, 200.0), (1.0, 200.0)))
+    mdb.models[modelName].SmoothStepAmplitude(name='velocityAmp', timeSpan=STEP, data=((0.0, 0.0), (rampTime, velocity), (max(1.0, timePeriod), velocity)))
     
     ##Velocity
     mdb.models[modelName].VelocityBC(name='sheetAdj_velocity', createStepName='Step-1', region=roAs.sets['sheetAdj_RP'], v1=UNSET, v2=1.0, v3=UNSET, vr1=UNSET, vr2=UNSET, vr3=UNSET, amplitude='velocityAmp', localCsys=None, distributionType=UNIFORM, fieldName='')
 
+    profileMark(d_profile, 'load')
+
     #----------------------------
     # Job
     #----------------------------
@@ -1039,7 +1073,121 @@ def SCS(mdbNumber=1,    sheetP_Adj=3, sheetP_Nonadj=4, sheetL=250.0, sheetW=50.0
     d_jobs['name'].append('J'+modelName)
     mdb.Job(name='J'+modelName, model=modelName, description='', type=ANALYSIS, atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=90, memoryUnits=PERCENTAGE, getMemoryFromAnalysis=True, explicitPrecision=SINGLE, nodalOutputPrecision=SINGLE, echoPrint=OFF, modelPrint=OFF, contactPrint=OFF, historyPrint=OFF, userSubroutine='', scratch='', multiprocessingMode=DEFAULT, numCpus=4, numDomains=4, numGPUs=0)
 
-    return
+    profileMark(d_profile, 'job')
+
+    return modelName
+
+def loadingRate(sheetP_Adj, sheetP_Nonadj, screwP, screwA_T1, screwA_T2, screwGD_L, screwGD_T):
+
+    "Velocity, ramp time, step time period and deformation at failure of a configuration, calibrated by calip.py or the defaults, the deformation 0.0 if unknown."
+
+    if calibrationFile != "" and len(d_calibration) == 0:
+        lines = [line.strip() for line in open(os.path.join(path, calibrationFile), 'r') if line.strip()]
+        keys = lines[0].split(',')
+        for line in lines[1:]:
+            d_row = dict(zip(keys, line.split(',')))
+            d_calibration[tuple([int(d_row[key]) for key in ['sheetP_Adj', 'sheetP_Nonadj', 'screwP', 'screwA_T1', 'screwA_T2', 'screwGD_L', 'screwGD_T']])] = (float(d_row['velocity']), float(d_row['rampTime']), float(d_row['timePeriod']), float(d_row.get('deformationFailure', 0.0)))
+
+    return d_calibration.get((sheetP_Adj, sheetP_Nonadj, screwP, screwA_T1, screwA_T2, screwGD_L, screwGD_T), (velocityDefault, rampTimeDefault, timePeriodDefault, 0.0))
+
+def manifestWrite(d_record):
+
+    "Append a record to the manifest."
+
+    if manifestFile != "":
+        d_record['date'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        f = open(os.path.join(path, manifestFile), 'a')
+        f.write(json.dumps(d_record, sort_keys=True)+'\n')
+        f.close()
+
+def modelRelease(modelName, generationTime=0.0, d_profile=None, d_row={}):
+
+    "Write the input file of a model, then delete the job and the model, with its parts and sketches, from the session."
+
+    jobName = 'J'+modelName
+
+    t0 = time.time()
+    mdb.jobs[jobName].writeInput(consistencyChecking=OFF)
+    inputTime = time.time()-t0
+
+    if d_profile is not None:
+        profileMark(d_profile, 'input', t0)
+        profileWrite(d_profile, os.path.join(path, profileFile), jobName, inputCounts(jobName+'.inp'))
+
+    del mdb.jobs[jobName]
+    del mdb.models[modelName]
+
+    #Manifest, one record per model with its arguments of SCS() instead of the .cae file
+    d_record = {}
+    d_record.update(d_row)
+    d_record['modelName'] = modelName
+    d_record['jobName'] = jobName
+    d_record['inputFile'] = jobName+'.inp'
+    d_record['generationTime'] = generationTime
+    d_record['inputTime'] = inputTime
+    manifestWrite(d_record)
+
+    return jobName
+
+def modelDiscard(d_row, generationTime=0.0):
+
+    "Delete what a failed model left in the session and record the failure."
+
+    for jobName in mdb.jobs.keys():
+        del mdb.jobs[jobName]
+
+    for modelName in mdb.models.keys():
+        if modelName != 'Model-1':
+            del mdb.models[modelName]
+
+    d_record = {}
+    d_record.update(d_row)
+    d_record['error'] = traceback.format_exc()
+    d_record['generationTime'] = generationTime
+    manifestWrite(d_record)
+
+def sweepRows(fileName='', group=None):
+
+    "Arguments of SCS() per model, read from a CSV file of sweep rows or taken from the specimens of a test group, testGroup1 by default."
+
+    rows = []
+
+    #Sheet dimensions and end distance of the test specimens, unless given in the sweep rows
+    d_default = {}
+    d_default['sheetL'] = 250.0
+    d_default['sheetW'] = 50.0
+    d_default['screwED'] = 30.0
+
+    if fileName == '':
+        for i in (group or testGroup1):
+            d_row = dict(d_default)
+            for key in ['mdbNumber', 'sheetP_Adj', 'sheetP_Nonadj', 'screwP', 'screwA_T1', 'screwA_T2', 'screwGD_L', 'screwGD_T']:
+                d_row[key] = shearT[key][i-1]
+            rows.append(d_row)
+
+    else:
+        lines = [line.strip() for line in open(fileName, 'r') if line.strip() and not line.startswith('#')]
+        keys = [key.strip() for key in lines[0].split(',')]
+        for line in lines[1:]:
+            d_row = dict(d_default)
+            for key, value in zip(keys, line.split(',')):
+                if key in ['sheetL', 'sheetW', 'screwED']:
+                    d_row[key] = float(value)
+                else:
+                    d_row[key] = int(value)
+            rows.append(d_row)
+
+    return rows
+
+def workerSlice():
+
+    "Index and number of generation workers, passed as abaqus cae noGUI=prepp.py -- index number."
+
+    if '--' in sys.argv and len(sys.argv) > sys.argv.index('--')+2:
+        return int(sys.argv[sys.argv.index('--')+1]), int(sys.argv[sys.argv.index('--')+2])
+
+    return 0, 1
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Verification of shear tests
@@ -1054,6 +1202,7 @@ shearT['screwA_T1'    ] = [ 0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
 shearT['screwA_T2'    ] = [ 0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0]
 shearT['screwGD_L'    ] = [ 4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  5,  6,  4,  4,  4]
 shearT['screwGD_T'    ] = [ 4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4,  5,  6]
+shearT['label'        ] = ['CE1X0S', 'BE1X0S', 'AE1X0S', 'AF1X0S', 'FF1Y0S', 'EF1Y0S', 'EE1Y0S', 'FF1X0S', 'EF1X0S', 'DF1X0S', 'EE1X0S', 'DE1X0S', 'DD1X0S', 'EE2X4L', 'EE2X5L', 'EE2X6L', 'EE2X4T', 'EE2X5T', 'EE2X6T'] # specimen labels, see bench/benchmarks.md
 
 #Test groups
 testGroup1 = [ 1,  2,  3,  4]
@@ -1062,25 +1211,68 @@ testGroup3 = [ 14, 15, 16, 17, 18, 19]
 
 d_jobs = {}
 d_jobs['name'] = []
+d_jobs['profile'] = {}
+
+if __name__ == '__main__':
+
+    #Generation workers, launched by prepw.py, write their own manifests and never share a .cae file
+    workerIndex, workerNumber = workerSlice()
+    if workerNumber > 1:
+        streamMode = 1
+        manifestFile = 'manifest_%d.jsonl' % workerIndex
+
+    if streamMode == 0:
+        mdb.saveAs(pathName=path+"\\"+caeName)
+
+    rows = sweepRows(sweepFile)[workerIndex::workerNumber]
+
+    #Screw layouts are checked all at once, before any model is generated
+    if layoutCheckMode > 0 and len(rows) > 0:
+        d_check = layoutCheck(rows, screwC, screwA, layoutClearance)
+        for i in range(len(rows)):
+            if not d_check['feasible'][i]:
+                print('Infeasible layout: mdbNumber %d, %s' % (rows[i]['mdbNumber'], ', '.join(layoutViolations(d_check, i))))
+                if layoutCheckMode == 1:
+                    d_record = {}
+                    d_record.update(rows[i])
+                    d_record['error'] = 'Infeasible layout: %s' % ', '.join(layoutViolations(d_check, i))
+                    d_record['generationTime'] = 0.0
+                    manifestWrite(d_record)
+        if layoutCheckMode == 1:
+            rows = [rows[i] for i in range(len(rows)) if d_check['feasible'][i]]
+
+    for d_row in rows:
+
+        t0 = time.time()
+        d_profile = profileStart('prepp') if profileOrNot == 1 else None
+        try:
+            modelName = SCS(mdbNumber     =  d_row['mdbNumber'], 
+                            sheetP_Adj    =  d_row['sheetP_Adj'], 
+                            sheetP_Nonadj =  d_row['sheetP_Nonadj'], 
+                            sheetL        =  d_row['sheetL'], 
+                            sheetW        =  d_row['sheetW'], 
+                            screwP        =  d_row['screwP'], 
+                            screwA_T1     =  d_row['screwA_T1'], 
+                            screwA_T2     =  d_row['screwA_T2'], 
+                            screwGD_L     =  d_row['screwGD_L'], 
+                            screwGD_T     =  d_row['screwGD_T'], 
+                            screwED       =  d_row['screwED'], 
+                            d_profile     =  d_profile)
+
+            #Keep the session flat over large sweeps
+            if streamMode == 1:
+                modelRelease(modelName, generationTime=time.time()-t0, d_profile=d_profile, d_row=d_row)
+            else:
+                d_jobs['profile']['J'+modelName] = d_profile
 
-mdbIndex = 0
-for i in testGroup1:
-
-    mdbIndex = shearT['mdbNumber'][i-1]
-
-    SCS(mdbNumber     =  mdbIndex, 
-        sheetP_Adj    =  shearT['sheetP_Adj'][i-1], 
-        sheetP_Nonadj =  shearT['sheetP_Nonadj'][i-1], 
-        sheetL        =  250.0, 
-        sheetW        =  50.0, 
-        screwP        =  shearT['screwP'][i-1], 
-        screwA_T1     =  shearT['screwA_T1'][i-1], 
-        screwA_T2     =  shearT['screwA_T2'][i-1], 
-        screwGD_L     =  shearT['screwGD_L'][i-1], 
-        screwGD_T     =  shearT['screwGD_T'][i-1], 
-        screwED       =  30.0)
+        except Exception:
+            #A failed model stops a single session, but only skips its row in a worker
+            if workerNumber == 1:
+                raise
+            modelDiscard(d_row, generationTime=time.time()-t0)
 
-mdb.save()
+    if streamMode == 0:
+        mdb.save()
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # parametric analysis
@@ -1148,39 +1340,51 @@ mdb.save()
 
 #                             mdbIndex += 1
 
-#                             SCS(mdbNumber     =  mdbIndex, 
-#                                 sheetP_Adj    =  sheetC['type'][j1], 
-#                                 sheetP_Nonadj =  sheetC['type'][j2], 
-#                                 sheetL        =  sheetC['length'][0], 
-#                                 sheetW        =  sheetC['width'][0], 
-#                                 screwP        =  screwC['type'][i1], 
-#                                 screwA_T1     =  i2, 
-#                                 screwA_T2     =  i3, 
-#                                 screwGD_L     =  screwA['spacingDistanceL'][i4], 
-#                                 screwGD_T     =  screwA['spacingDistanceT'][i5], 
-#                                 screwED       =  screwA['endDistance'][0])
-
-# mdb.save()
+#                             t0 = time.time()
+#                             modelName = SCS(mdbNumber     =  mdbIndex, 
+#                                             sheetP_Adj    =  sheetC['type'][j1], 
+#                                             sheetP_Nonadj =  sheetC['type'][j2], 
+#                                             sheetL        =  sheetC['length'][0], 
+#                                             sheetW        =  sheetC['width'][0], 
+#                                             screwP        =  screwC['type'][i1], 
+#                                             screwA_T1     =  i2, 
+#                                             screwA_T2     =  i3, 
+#                                             screwGD_L     =  screwA['spacingDistanceL'][i4], 
+#                                             screwGD_T     =  screwA['spacingDistanceT'][i5], 
+#                                             screwED       =  screwA['endDistance'][0])
+
+#                             if streamMode == 1:
+#                                 modelRelease(modelName, generationTime=time.time()-t0)
+
+# if streamMode == 0:
+#     mdb.save()
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Computation
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-for i in range(len(d_jobs['name'])):
+if __name__ == '__main__' and streamMode == 0:
+
+    for i in range(len(d_jobs['name'])):
+
+        #Write input file
+        t0 = time.time()
+        mdb.jobs[d_jobs['name'][i]].writeInput(consistencyChecking=OFF)
 
-    #Write input file
-    mdb.jobs[d_jobs['name'][i]].writeInput(consistencyChecking=OFF)
+        if d_jobs['profile'].get(d_jobs['name'][i]) is not None:
+            profileMark(d_jobs['profile'][d_jobs['name'][i]], 'input', t0)
+            profileWrite(d_jobs['profile'][d_jobs['name'][i]], os.path.join(path, profileFile), d_jobs['name'][i], inputCounts(d_jobs['name'][i]+'.inp'))
     
-    # #Check job
-    # mdb.jobs[d_jobs['name'][i]].submit(consistencyChecking=OFF, datacheckJob=True)
-    # mdb.jobs[d_jobs['name'][i]].waitForCompletion()
+        # #Check job
+        # mdb.jobs[d_jobs['name'][i]].submit(consistencyChecking=OFF, datacheckJob=True)
+        # mdb.jobs[d_jobs['name'][i]].waitForCompletion()
 
-    # #Submit job
-    # mdb.jobs[d_jobs['name'][i]].submit()
-    # mdb.jobs[d_jobs['name'][i]].waitForCompletion()
+        # #Submit job
+        # mdb.jobs[d_jobs['name'][i]].submit()
+        # mdb.jobs[d_jobs['name'][i]].waitForCompletion()
 
-    # #Delete job.
-    # del mdb.jobs[d_jobs['name'][i]]
+        # #Delete job.
+        # del mdb.jobs[d_jobs['name'][i]]
 
-# #Copy result files
-# copyFiles(sourceDir=path,targetDir="G:\\SIMULIA\\"+pathSplit[-1])
\ No newline at end of file
+    # #Copy result files
+    # copyFiles(sourceDir=path,targetDir="G:\\SIMULIA\\"+pathSplit[-1])
\ No newline at end of file
@@ -0,0 +1,122 @@
+# Python 2/3, outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Driving script of parallel generation workers for finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+from multiprocessing import cpu_count
+import subprocess
+import datetime
+import json
+import time
+import os
+
+###################################################################################################
+###################################################################################################
+#Workers
+numberOfWorkers = 0 # number of headless Abaqus/CAE sessions, 0 - all cores but one
+abaqusCommand = "abaqus" # command to start Abaqus
+
+#Files
+manifestFileW = "manifest.jsonl" # manifest collecting the worker manifests, the same as manifestFile in prepp.py
+resultFileW = "prepw_results.json" # timings and failures of the workers
+
+###################################################################################################
+###################################################################################################
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def workerStart(workerIndex, workerNumber):
+
+    "Start a generation worker on its slice of the sweep rows."
+
+    log = open('prepw_%d.log' % workerIndex, 'w')
+    command = '%s cae noGUI=prepp.py -- %d %d' % (abaqusCommand, workerIndex, workerNumber)
+
+    return subprocess.Popen(command, shell=True, stdout=log, stderr=subprocess.STDOUT), log
+
+def manifestRead(fileName):
+
+    "Read the records of a manifest."
+
+    records = []
+
+    if os.path.isfile(fileName):
+        for line in open(fileName, 'r'):
+            if line.strip():
+                records.append(json.loads(line))
+
+    return records
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Generation
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    workerNumber = numberOfWorkers or max(cpu_count()-1, 1)
+
+    #Manifests left by earlier runs would be collected twice
+    for k in range(workerNumber):
+        if os.path.isfile('manifest_%d.jsonl' % k):
+            os.remove('manifest_%d.jsonl' % k)
+
+    t0 = time.time()
+    workers = [workerStart(k, workerNumber) for k in range(workerNumber)]
+
+    #Wait for the workers, recording when each one finishes
+    d_workers = {}
+    while len(d_workers) < workerNumber:
+        for k in range(workerNumber):
+            if k not in d_workers and workers[k][0].poll() is not None:
+                workers[k][1].close()
+                d_workers[k] = {'returnCode': workers[k][0].returncode, 'wallTime': time.time()-t0}
+        time.sleep(1.0)
+
+    #Collect the worker manifests
+    records = []
+    for k in range(workerNumber):
+        d_workers[k]['models'] = 0
+        d_workers[k]['failures'] = 0
+        for d_record in manifestRead('manifest_%d.jsonl' % k):
+            d_record['worker'] = k
+            records.append(d_record)
+            if 'error' in d_record:
+                d_workers[k]['failures'] += 1
+            else:
+                d_workers[k]['models'] += 1
+
+    f = open(manifestFileW, 'a')
+    for d_record in records:
+        f.write(json.dumps(d_record, sort_keys=True)+'\n')
+    f.close()
+
+    for k in range(workerNumber):
+        if os.path.isfile('manifest_%d.jsonl' % k):
+            os.remove('manifest_%d.jsonl' % k)
+
+    #Timings and failures
+    succeeded = [d_record for d_record in records if 'error' not in d_record]
+
+    d_results = {}
+    d_results['date'] = datetime.datetime.now().isoformat()
+    d_results['numberOfWorkers'] = workerNumber
+    d_results['wallTime'] = time.time()-t0
+    d_results['models'] = len(succeeded)
+    d_results['generationTime'] = sum([d_record['generationTime'] for d_record in succeeded])
+    d_results['inputTime'] = sum([d_record['inputTime'] for d_record in succeeded])
+    d_results['workers'] = [d_workers[k] for k in range(workerNumber)]
+    d_results['failures'] = [d_record for d_record in records if 'error' in d_record]
+
+    f = open(resultFileW, 'w')
+    json.dump(d_results, f, indent=1, sort_keys=True)
+    f.close()
+
+    print('%d models written by %d workers in %.1f s, %d failed' % (d_results['models'], workerNumber, d_results['wallTime'], len(d_results['failures'])))
+    for d_record in d_results['failures']:
+        print('Failed: mdbNumber %d by worker %d, %s' % (d_record['mdbNumber'], d_record['worker'], d_record['error'].strip().split('\n')[-1]))
@@ -0,0 +1,213 @@
+# Python 2/3, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Profiling script for pre- and post-processing of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import json
+import time
+import os
+
+###################################################################################################
+###################################################################################################
+#Files
+profileFileP = "profile.jsonl" # profile records written by prepp.py and postp.py with profileOrNot = 1
+summaryFileP = "profile_summary.csv" # summary report of the phases
+
+###################################################################################################
+###################################################################################################
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def profileStart(kind):
+
+    "Start a profile, timing its phases from now."
+
+    d_profile = {}
+    d_profile['kind'] = kind
+    d_profile['phases'] = {}
+    d_profile['order'] = []
+    d_profile['start'] = time.time()
+    d_profile['last'] = d_profile['start']
+
+    return d_profile
+
+def profileMark(d_profile, phaseName, t0=None):
+
+    "Record the time since the last mark, or since t0, as a phase. A profile of None records nothing."
+
+    if d_profile is None:
+        return
+
+    now = time.time()
+
+    if phaseName not in d_profile['phases']:
+        d_profile['phases'][phaseName] = 0.0
+        d_profile['order'].append(phaseName)
+
+    d_profile['phases'][phaseName] += now-(d_profile['last'] if t0 is None else t0)
+    d_profile['last'] = now
+
+def profileWrite(d_profile, fileName, name, d_counts={}):
+
+    "Append a profile as a JSON line. A profile of None writes nothing."
+
+    if d_profile is None:
+        return
+
+    d_record = {}
+    d_record['name'] = name
+    d_record['kind'] = d_profile['kind']
+    d_record['date'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    d_record['phases'] = [[phaseName, d_profile['phases'][phaseName]] for phaseName in d_profile['order']]
+    d_record['total'] = sum(d_profile['phases'].values())
+    d_record['counts'] = d_counts
+
+    f = open(fileName, 'a')
+    f.write(json.dumps(d_record, sort_keys=True)+'\n')
+    f.close()
+
+def inputCounts(inputFile):
+
+    "Count the elements, nodes, instances, surfaces and contact property assignments of an .inp file, line by line."
+
+    d_counts = {}
+    for key in ['elements', 'nodes', 'instances', 'surfaces', 'contactAssignments']:
+        d_counts[key] = 0
+
+    if not os.path.isfile(inputFile):
+        return d_counts
+
+    #Elements and nodes of parts, counted once per instance
+    d_partElements = {}
+    d_partNodes = {}
+    instanceParts = []
+
+    part = None
+    keyword = ''
+    continued = False
+
+    for line in open(inputFile, 'r'):
+
+        if line.startswith('**'):
+            continue
+
+        if line.startswith('*'):
+            lineSplit = line[1:].split(',')
+            keyword = lineSplit[0].strip().lower()
+
+            d_params = {}
+            for param in lineSplit[1:]:
+                if '=' in param:
+                    d_params[param.split('=')[0].strip().lower()] = param.split('=')[1].strip()
+
+            if keyword == 'part':
+                part = d_params.get('name')
+                d_partElements[part] = 0
+                d_partNodes[part] = 0
+            elif keyword == 'end part':
+                part = None
+            elif keyword == 'instance':
+                instanceParts.append(d_params.get('part'))
+            elif keyword == 'surface':
+                d_counts['surfaces'] += 1
+
+            continued = False
+            continue
+
+        #Data lines, an element may continue on the next line
+        if keyword == 'element' and not continued:
+            if part is None:
+                d_counts['elements'] += 1
+            else:
+                d_partElements[part] += 1
+        elif keyword == 'node':
+            if part is None:
+                d_counts['nodes'] += 1
+            else:
+                d_partNodes[part] += 1
+        elif keyword == 'contact property assignment':
+            d_counts['contactAssignments'] += 1
+
+        continued = line.rstrip().endswith(',')
+
+    for part in instanceParts:
+        d_counts['instances'] += 1
+        d_counts['elements'] += d_partElements.get(part, 0)
+        d_counts['nodes'] += d_partNodes.get(part, 0)
+
+    return d_counts
+
+def profileRead(fileName):
+
+    "Read the profile records."
+
+    records = []
+
+    if os.path.isfile(fileName):
+        for line in open(fileName, 'r'):
+            if line.strip():
+                records.append(json.loads(line))
+
+    return records
+
+def profileSummary(records):
+
+    "Summarize the phases by kind of profile: number of models, total, mean and maximum times, and share of the kind."
+
+    d_summary = {}
+    order = []
+
+    for d_record in records:
+        for phaseName, seconds in d_record['phases']:
+
+            key = (d_record['kind'], phaseName)
+            if key not in d_summary:
+                d_summary[key] = {'models': 0, 'total': 0.0, 'max': 0.0}
+                order.append(key)
+
+            d_summary[key]['models'] += 1
+            d_summary[key]['total'] += seconds
+            d_summary[key]['max'] = max(d_summary[key]['max'], seconds)
+
+    d_kinds = {}
+    for key in order:
+        d_kinds[key[0]] = d_kinds.get(key[0], 0.0)+d_summary[key]['total']
+
+    rows = []
+    for key in order:
+        rows.append([key[0], key[1], d_summary[key]['models'], d_summary[key]['total'], d_summary[key]['total']/d_summary[key]['models'], d_summary[key]['max'], d_summary[key]['total']/max(d_kinds[key[0]], 1.0e-12)])
+
+    #Hot spots first within each kind
+    rows.sort(key=lambda row: (row[0], -row[3]))
+
+    return rows
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Summary
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    records = profileRead(profileFileP)
+    rows = profileSummary(records)
+
+    f = open(summaryFileP, 'w')
+    f.write('kind,phase,models,total,mean,max,share\n')
+    for row in rows:
+        f.write('%s,%s,%d,%.6g,%.6g,%.6g,%.4f\n' % tuple(row))
+    f.close()
+
+    print('%-6s %-12s %6s %10s %10s %10s %6s' % ('kind', 'phase', 'models', 'total [s]', 'mean [s]', 'max [s]', 'share'))
+    for row in rows:
+        print('%-6s %-12s %6d %10.2f %10.3f %10.3f %5.1f%%' % (row[0], row[1], row[2], row[3], row[4], row[5], 100.0*row[6]))
+
+    #Object counts against the total times
+    for d_record in records:
+        if d_record['counts']:
+            print('%s %s: %.2f s, %d elements, %d surfaces, %d contact assignments' % (d_record['kind'], d_record['name'], d_record['total'], d_record['counts'].get('elements', 0), d_record['counts'].get('surfaces', 0), d_record['counts'].get('contactAssignments', 0)))
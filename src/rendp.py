@@ -0,0 +1,155 @@
+# Python 2/3 with NumPy and Matplotlib, outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Rendering script for contours of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+from multiprocessing import Pool, cpu_count
+import numpy as np
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import BoundaryNorm
+
+from archp import compactOpen
+
+###################################################################################################
+###################################################################################################
+#Directory
+sourceDirR = ".\\compact\\" # directory of the compact files written by odbp.py with the final frame
+targetDirR = ".\\" # directory of the .odb files, where the contours are rendered as <compact name>_Mises.png to be copied and cached by postp.py
+
+#Rendering control
+numberOfProcesses = 0 # 0 - all cores
+cutPosition = 0.0 # x coordinate of the view cut plane
+contourIntervals = 12 # number of contour intervals
+imageSize = [8.0, 4.0] # image width and height in inches
+imageDpi = 150 # image resolution
+
+#Window of the section, the width, height and offsets of session.View in postp.py: looking along -x, with y to the right and z upwards
+viewWidth = 70.0
+viewHeight = 30.0
+viewOffset = [-1.0, -6.0] # viewOffsetX and viewOffsetY
+
+###################################################################################################
+###################################################################################################
+
+#Element edges by number of nodes, in the Abaqus node ordering
+elementEdges = {}
+elementEdges[8] = [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)] # C3D8R
+elementEdges[6] = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)] # C3D6
+elementEdges[4] = [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)] # C3D4
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def sectionPolygons(coordinates, connectivity, values, cut=0.0):
+
+    "Cut the elements by the plane x = cut, returning the section polygons in the y-z plane and their values."
+
+    polygons = []
+    polygonValues = []
+
+    nodeNumber = (connectivity >= 0).sum(axis=1)
+
+    for n in elementEdges.keys():
+
+        group = np.nonzero(nodeNumber == n)[0]
+        if len(group) == 0:
+            continue
+
+        P = coordinates[connectivity[group, :n]] # (elements, nodes, 3)
+        a = np.array([edge[0] for edge in elementEdges[n]])
+        b = np.array([edge[1] for edge in elementEdges[n]])
+
+        #Intersection of every edge with the plane
+        xa = P[:, a, 0]
+        xb = P[:, b, 0]
+        dx = np.where(xb != xa, xb-xa, 1.0)
+        t = (cut-xa)/dx
+        valid = (xb != xa) & (t >= 0.0) & (t <= 1.0)
+        points = P[:, a, 1:]+t[:, :, None]*(P[:, b, 1:]-P[:, a, 1:]) # (elements, edges, 2)
+
+        #Order the intersection points around their centroid
+        count = valid.sum(axis=1)
+        centroid = np.where(valid[:, :, None], points, 0.0).sum(axis=1)/np.maximum(count, 1)[:, None]
+        angle = np.arctan2(points[:, :, 1]-centroid[:, None, 1], points[:, :, 0]-centroid[:, None, 0])
+        angle = np.where(valid, angle, np.inf)
+        order = np.argsort(angle, axis=1)
+
+        for i in np.nonzero(count >= 3)[0]:
+            polygons.append(points[i, order[i, :count[i]]])
+            polygonValues.append(values[group[i]])
+
+    return polygons, np.array(polygonValues)
+
+def contourRender(fileName):
+
+    "Render the Mises contour of the view cut from the final frame of a compact file."
+
+    d_header, d_arrays = compactOpen(fileName)
+
+    frames = [d_frame for d_frame in d_header['frames'] if d_frame['kind'] == 'final']
+    d_frame = frames[0] if len(frames) > 0 else d_header['frames'][-1]
+
+    #Deformed mesh, eroded elements are not displayed
+    coordinates = d_arrays['coordinates']+d_arrays[d_frame['key']+'/U']
+    alive = d_arrays[d_frame['key']+'/status'] > 0.0
+    polygons, values = sectionPolygons(coordinates, np.asarray(d_arrays['connectivity'])[alive], np.asarray(d_arrays[d_frame['key']+'/mises'])[alive], cutPosition)
+
+    fig = plt.figure(figsize=imageSize, dpi=imageDpi)
+    ax = fig.add_axes([0.02, 0.02, 0.78, 0.96])
+
+    if len(polygons) > 0:
+        levels = np.linspace(values.min(), max(values.max(), values.min()+1.0e-6), contourIntervals+1)
+        collection = PolyCollection(polygons, cmap=plt.get_cmap('jet', contourIntervals), norm=BoundaryNorm(levels, contourIntervals), edgecolors='face', linewidths=0.1)
+        collection.set_array(values)
+        ax.add_collection(collection)
+
+        colorbar = fig.colorbar(collection, ax=ax, fraction=0.05, pad=0.02, ticks=levels, format='%+.3e')
+        colorbar.ax.set_title('S, Mises', fontsize=8, family='serif')
+        colorbar.ax.tick_params(labelsize=7)
+
+    ax.set_xlim(viewOffset[0]-viewWidth/2.0, viewOffset[0]+viewWidth/2.0)
+    ax.set_ylim(viewOffset[1]-viewHeight/2.0, viewOffset[1]+viewHeight/2.0)
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+    imageName = os.path.join(targetDirR, os.path.basename(fileName)+'_Mises.png')
+    fig.savefig(imageName, dpi=imageDpi)
+    plt.close(fig)
+
+    return imageName
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Rendering
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    fileNames = []
+
+    for f in sorted(os.listdir(sourceDirR)):
+
+        if f.endswith('.json'):
+
+            fileName = os.path.join(sourceDirR, f[:-len('.json')])
+            imageName = os.path.join(targetDirR, f[:-len('.json')]+'_Mises.png')
+
+            #Render the contours that are missing or older than their data
+            if not os.path.exists(imageName) or os.path.getmtime(imageName) < os.path.getmtime(fileName+'.json'):
+                fileNames.append(fileName)
+
+    pool = Pool(processes=numberOfProcesses or cpu_count())
+    imageNames = pool.map(contourRender, fileNames)
+    pool.close()
+    pool.join()
+
+    print('%d contours rendered' % len(imageNames))
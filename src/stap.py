@@ -0,0 +1,285 @@
+# Python 2/3, inside or outside Abaqus
+# -*- coding: utf-8 -*-
+#
+# Monitoring script of running jobs of finite element modeling of self-drilling screw connections between thin steel sheets
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Initialization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#Import modules
+import threading
+import json
+import time
+import os
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+###################################################################################################
+###################################################################################################
+#Directory
+sourceDirS = ".\\" # directory of the running jobs, the same as the folder of postp.py
+
+#Monitoring control
+pollInterval = 10.0 # seconds between two reads of the .sta files
+stallTime = 600.0 # a running job without a new increment for this time is stalled
+timePeriodS = 0.06 # step time period, used when it is not found in the .inp file
+
+#Publishing
+metricsFileS = "sta_metrics.json" # metrics of every job and of the whole campaign
+httpPort = 0 # port of the local HTTP endpoint serving the metrics, e.g. 8765 | 0 - no HTTP endpoint
+
+###################################################################################################
+###################################################################################################
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def timePeriod(inputFile):
+
+    "Time period of the explicit step in an .inp file."
+
+    if os.path.isfile(inputFile):
+
+        dynamic = False
+
+        for line in open(inputFile, 'r'):
+
+            if line.startswith('**'):
+                continue
+
+            if line.startswith('*'):
+                dynamic = line.lower().replace(' ', '').startswith('*dynamic,explicit')
+                continue
+
+            #The data line of *Dynamic, Explicit starts with an empty field, followed by the time period
+            if dynamic:
+                try:
+                    return float(line.split(',')[1])
+                except (IndexError, ValueError):
+                    return timePeriodS
+
+    return timePeriodS
+
+def cpuSeconds(value):
+
+    "CPU time of a .sta line in seconds, written as hh:mm:ss or as a number."
+
+    if ':' in value:
+        seconds = 0.0
+        for part in value.split(':'):
+            seconds = seconds*60.0+float(part)
+        return seconds
+
+    return float(value)
+
+def staParse(line):
+
+    "Increment, step time, total time, CPU time and stable time increment of a .sta line, or None."
+
+    lineSplit = line.split()
+
+    if len(lineSplit) < 5:
+        return None
+
+    try:
+        return int(lineSplit[0]), float(lineSplit[1]), float(lineSplit[2]), cpuSeconds(lineSplit[3]), float(lineSplit[4])
+    except ValueError:
+        return None
+
+def staTail(d_job):
+
+    "Read the lines appended to the .sta file of a job since the last read."
+
+    f = open(d_job['staFile'], 'rb')
+    f.seek(d_job['offset'])
+    data = f.read()
+    f.close()
+
+    now = time.time()
+    d_job['read'] = now
+
+    #Keep an unfinished last line for the next read
+    end = data.rfind(b'\n')+1
+    d_job['offset'] += end
+
+    for line in data[:end].decode('utf-8', 'replace').split('\n'):
+
+        d_values = staParse(line)
+
+        if d_values is not None:
+            d_job['increment'], d_job['stepTime'], d_job['totalTime'], d_job['cpuTime'], d_job['stableIncrement'] = d_values
+            d_job['updated'] = now
+
+            ##Start of the job, as seen by the first increment read
+            if d_job['started'] is None:
+                d_job['started'] = now
+
+        if 'HAS COMPLETED SUCCESSFULLY' in line:
+            d_job['state'] = 'completed'
+        elif 'HAS NOT BEEN COMPLETED' in line:
+            d_job['state'] = 'aborted'
+
+def jobMetrics(d_job, now):
+
+    "Percent complete, increments per second and ETA of a job, from the two latest samples."
+
+    d_metrics = {}
+    for key in ['state', 'increment', 'stepTime', 'timePeriod', 'cpuTime', 'stableIncrement']:
+        d_metrics[key] = d_job[key]
+
+    d_metrics['percent'] = 100.0*min(d_job['stepTime']/d_job['timePeriod'], 1.0)
+
+    #Rates between the previous and the current samples
+    d_metrics['incrementsPerSecond'] = 0.0
+    d_metrics['eta'] = None
+
+    if d_job['previous'] is not None and d_job['updated'] > d_job['previous'][0]:
+        dt = d_job['updated']-d_job['previous'][0]
+        d_metrics['incrementsPerSecond'] = (d_job['increment']-d_job['previous'][1])/dt
+        stepRate = (d_job['stepTime']-d_job['previous'][2])/dt
+        if stepRate > 0.0:
+            d_metrics['eta'] = (d_job['timePeriod']-d_job['stepTime'])/stepRate
+
+    if d_job['state'] == 'running' and d_job['updated'] is not None and now-d_job['updated'] > stallTime:
+        d_metrics['state'] = 'stalled'
+
+    if d_metrics['state'] == 'completed':
+        d_metrics['percent'] = 100.0
+        d_metrics['eta'] = 0.0
+
+    return d_metrics
+
+def staReset(d_job, inputFile):
+
+    "Forget what was read from the .sta file of a job, e.g. when the job is solved again."
+
+    d_job['offset'] = 0
+    d_job['state'] = 'running'
+    d_job['timePeriod'] = timePeriod(inputFile)
+    d_job['increment'] = 0
+    d_job['stepTime'] = 0.0
+    d_job['totalTime'] = 0.0
+    d_job['cpuTime'] = 0.0
+    d_job['stableIncrement'] = 0.0
+    d_job['started'] = None
+    d_job['updated'] = None
+    d_job['read'] = None
+    d_job['previous'] = None
+
+def staScan(sourceDir, d_jobs):
+
+    "Update the jobs from the .sta files of a directory."
+
+    for f in sorted(os.listdir(sourceDir)):
+
+        if f.endswith('.sta'):
+
+            jobName = f[:-len('.sta')]
+
+            if jobName not in d_jobs:
+                d_jobs[jobName] = {}
+                d_jobs[jobName]['staFile'] = os.path.join(sourceDir, f)
+                staReset(d_jobs[jobName], os.path.join(sourceDir, jobName+'.inp'))
+
+            d_job = d_jobs[jobName]
+            size = os.path.getsize(d_job['staFile'])
+
+            #A job solved again in the same directory, e.g. requeued or resumed, rewrites its .sta file or writes to it after it ended
+            if size < d_job['offset'] or (d_job['state'] != 'running' and d_job['read'] is not None and os.path.getmtime(d_job['staFile']) > d_job['read']):
+                staReset(d_job, os.path.join(sourceDir, jobName+'.inp'))
+
+            if d_job['state'] == 'running' and size > d_job['offset']:
+                if d_job['updated'] is not None:
+                    d_job['previous'] = (d_job['updated'], d_job['increment'], d_job['stepTime'])
+                staTail(d_job)
+
+def campaignMetrics(sourceDir, d_jobs):
+
+    "Metrics of every job and of the whole campaign."
+
+    now = time.time()
+
+    d_metrics = {}
+    d_metrics['date'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    d_metrics['jobs'] = {}
+
+    for jobName in sorted(d_jobs.keys()):
+        d_metrics['jobs'][jobName] = jobMetrics(d_jobs[jobName], now)
+
+    d_campaign = {}
+    for state in ['running', 'stalled', 'completed', 'aborted']:
+        d_campaign[state] = len([1 for d_job in d_metrics['jobs'].values() if d_job['state'] == state])
+
+    #Jobs waiting for submission are the .inp files without any .sta file yet
+    d_campaign['waiting'] = len([f for f in os.listdir(sourceDir) if f.endswith('.inp') and f[:-len('.inp')] not in d_jobs])
+    d_campaign['incrementsPerSecond'] = sum([d_job['incrementsPerSecond'] for d_job in d_metrics['jobs'].values() if d_job['state'] == 'running'])
+
+    #Campaign ETA, running jobs and waiting ones at the mean duration of the completed ones, seen over more than one read
+    durations = [d_jobs[jobName]['updated']-d_jobs[jobName]['started'] for jobName in d_jobs.keys() if d_jobs[jobName]['state'] == 'completed' and d_jobs[jobName]['updated'] is not None and d_jobs[jobName]['updated'] > d_jobs[jobName]['started']]
+    d_campaign['eta'] = sum([d_job['eta'] or 0.0 for d_job in d_metrics['jobs'].values() if d_job['state'] == 'running'])
+    if len(durations) > 0:
+        d_campaign['eta'] += d_campaign['waiting']*sum(durations)/len(durations)
+
+    d_metrics['campaign'] = d_campaign
+
+    return d_metrics
+
+def metricsServe(port, d_latest):
+
+    "Serve the latest metrics as JSON on a local HTTP endpoint, in a daemon thread."
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            body = json.dumps(d_latest.get('metrics', {}), indent=1, sort_keys=True).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    return server
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Monitoring
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+
+    d_jobs = {}
+    d_latest = {}
+
+    if httpPort > 0:
+        metricsServe(httpPort, d_latest)
+
+    #Until interrupted
+    while True:
+
+        staScan(sourceDirS, d_jobs)
+        d_latest['metrics'] = campaignMetrics(sourceDirS, d_jobs)
+
+        f = open(metricsFileS+'.tmp', 'w')
+        json.dump(d_latest['metrics'], f, indent=1, sort_keys=True)
+        f.close()
+        if os.path.exists(metricsFileS):
+            os.remove(metricsFileS)
+        os.rename(metricsFileS+'.tmp', metricsFileS)
+
+        for jobName in sorted(d_latest['metrics']['jobs'].keys()):
+            d_job = d_latest['metrics']['jobs'][jobName]
+            if d_job['state'] in ['running', 'stalled']:
+                print('%s %-9s %5.1f%%  increment %d  %.1f inc/s  ETA %s' % (jobName, d_job['state'], d_job['percent'], d_job['increment'], d_job['incrementsPerSecond'], '-' if d_job['eta'] is None else '%.0f s' % d_job['eta']))
+
+        time.sleep(pollInterval)